@@ -0,0 +1,317 @@
+"""
+Chart Formats
+Chart payloads built from the DataFrame's NumPy columns, as JSON or as
+binary column buffers (Arrow IPC stream or raw little-endian float64)
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from fastapi import HTTPException
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+
+try:
+    import pyarrow as pa
+except ImportError:  # Optional: only needed for Arrow responses
+    pa = None
+
+# Payload field -> DataFrame column, in payload order
+CHART_FIELDS = {
+    'open': 'Open',
+    'high': 'High',
+    'low': 'Low',
+    'close': 'Close',
+    'volume': 'Volume',
+    'rsi': 'RSI',
+    'sma_20': 'SMA_20',
+    'sma_50': 'SMA_50',
+    'sma_200': 'SMA_200',
+    'macd': 'MACD',
+    'macd_signal': 'Signal',
+    'bb_upper': 'BB_Upper',
+    'bb_middle': 'BB_Middle',
+    'bb_lower': 'BB_Lower',
+    'volatility': 'Volatility',
+}
+
+# Fields sent as integers rather than floats
+INTEGER_FIELDS = {'volume'}
+
+# Fields read straight from the bars; the others are indicators
+PRICE_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+# Binary media types a client can ask for with Accept
+ARROW_MEDIA_TYPE = 'application/vnd.apache.arrow.stream'
+F64_MEDIA_TYPE = 'application/vnd.crypto-viewer.f64-columns'
+
+
+def _field_values(data: pd.DataFrame, field: str) -> List[Optional[Any]]:
+    """One field as a list of Python numbers, with None for missing values"""
+    column = CHART_FIELDS[field]
+    if column not in data.columns:
+        return [None] * len(data)
+
+    values = data[column].to_numpy(dtype=np.float64, na_value=np.nan)
+    missing = np.isnan(values)
+    if field in INTEGER_FIELDS:
+        values = np.where(missing, 0, values).astype(np.int64)
+    if not missing.any():
+        return values.tolist()
+    values = values.astype(object)
+    values[missing] = None
+    return values.tolist()
+
+
+def parse_fields(fields: Optional[str]) -> List[str]:
+    """
+    Fields named in a comma-separated `fields` parameter, in payload order
+
+    None or empty selects every field; 'date' is always sent and may be
+    omitted. Raises 400 on an unknown field.
+    """
+    if not fields:
+        return list(CHART_FIELDS)
+    names = {name.strip().lower() for name in fields.split(',') if name.strip()} - {'date'}
+    unknown = sorted(names - CHART_FIELDS.keys())
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)} "
+                                                    f"(available: date, {', '.join(CHART_FIELDS)})")
+    return [field for field in CHART_FIELDS if field in names]
+
+
+def field_indicators(fields: Iterable[str]) -> List[str]:
+    """Indicator columns the given fields need computed (none for price-only fields)"""
+    return [CHART_FIELDS[field] for field in fields if field not in PRICE_FIELDS]
+
+
+def chart_columns(data: pd.DataFrame, fields: Optional[Iterable[str]] = None) -> Dict[str, List[Optional[Any]]]:
+    """
+    Columnar chart payload: one array per field, aligned on 'date'
+
+    Built from whole columns (NaN -> None in bulk), with no per-bar Python
+    work beyond the final tolist().
+
+    Args:
+        fields: Fields to include (None = all, see parse_fields())
+    """
+    columns: Dict[str, List[Optional[Any]]] = {'date': data.index.strftime('%Y-%m-%d').tolist()}
+    for field in CHART_FIELDS if fields is None else fields:
+        columns[field] = _field_values(data, field)
+    return columns
+
+
+def chart_rows(data: pd.DataFrame, fields: Optional[Iterable[str]] = None) -> List[Dict[str, Optional[Any]]]:
+    """Row-oriented chart payload: one dict per bar, same fields as chart_columns()"""
+    columns = chart_columns(data, fields)
+    names = list(columns)
+    return [dict(zip(names, values)) for values in zip(*columns.values())]
+
+
+def bars_since(data: Union[pd.DataFrame, pd.Series], since: Optional[str]) -> Union[pd.DataFrame, pd.Series]:
+    """
+    Bars dated on or after the `since` cursor (a date, as in next_cursor())
+
+    The cursor's own bar is included: it is the last bar the client has,
+    which may have been revised since. Raises 400 on an unparseable cursor.
+    """
+    if not since:
+        return data
+    try:
+        cursor = pd.Timestamp(since)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid since cursor: {since!r} (expected a date)")
+    tz = getattr(data.index, 'tz', None)
+    if cursor.tzinfo is None and tz is not None:
+        cursor = cursor.tz_localize(tz)
+    elif cursor.tzinfo is not None and tz is None:
+        cursor = cursor.tz_convert('UTC').tz_localize(None)
+    return data.iloc[data.index.searchsorted(cursor, side='left'):]
+
+
+def next_cursor(data: Union[pd.DataFrame, pd.Series], since: Optional[str] = None) -> Optional[str]:
+    """
+    Cursor for the next delta request: the date of the last bar sent
+
+    Dates rather than bar positions, since positions shift as the period
+    window slides forward. With no bars sent the previous cursor stands.
+    """
+    if len(data) == 0:
+        return since
+    return data.index[-1].strftime('%Y-%m-%d')
+
+
+def lttb_indices(values: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Positions of the bars kept by Largest-Triangle-Three-Buckets
+
+    The first and last bars are always kept; the ones between are split
+    into max_points - 2 buckets and each bucket keeps the bar forming the
+    largest triangle with the bar kept before it and the mean of the next
+    bucket. Bucket means are computed for all buckets at once; only the
+    choice of the kept bar (one argmax per bucket) is sequential, so the
+    cost is bounded by max_points, not by the number of bars.
+    """
+    n = len(values)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+
+    # Gaps take the nearest value so they neither win nor poison a bucket
+    y = pd.Series(values, dtype=np.float64).ffill().bfill().to_numpy()
+    x = np.arange(n, dtype=np.float64)
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    starts, ends = edges[:-1], edges[1:]
+    counts = ends - starts
+    mean_x = np.add.reduceat(x[:n - 1], starts) / counts
+    mean_y = np.add.reduceat(y[:n - 1], starts) / counts
+    # Third corner of each bucket's triangles: the next bucket's mean (the last bar for the last bucket)
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+
+    kept = np.empty(max_points, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    previous = 0
+    for bucket, (start, end) in enumerate(zip(starts.tolist(), ends.tolist())):
+        px, py = x[previous], y[previous]
+        area = np.abs((px - next_x[bucket]) * (y[start:end] - py) - (px - x[start:end]) * (next_y[bucket] - py))
+        previous = start + int(area.argmax())
+        kept[bucket + 1] = previous
+    return kept
+
+
+def downsample_ohlc(data: pd.DataFrame, max_points: int) -> pd.DataFrame:
+    """
+    Aggregate bars into at most max_points consecutive buckets
+
+    Each bucket is dated by its first bar and keeps the candle it spans:
+    first Open, highest High, lowest Low, last Close and total Volume.
+    Other columns (indicators) take their value at the bucket's last bar.
+    """
+    n = len(data)
+    if max_points >= n or max_points < 1:
+        return data
+
+    starts = np.unique(np.linspace(0, n, max_points, endpoint=False).astype(np.int64))
+    lasts = np.append(starts[1:], n) - 1
+    columns = {}
+    for column in data.columns:
+        values = data[column].to_numpy(dtype=np.float64, na_value=np.nan)
+        if column == 'Open':
+            columns[column] = values[starts]
+        elif column == 'High':
+            columns[column] = np.fmax.reduceat(values, starts)
+        elif column == 'Low':
+            columns[column] = np.fmin.reduceat(values, starts)
+        elif column == 'Volume':
+            columns[column] = np.add.reduceat(np.nan_to_num(values), starts)
+        else:
+            columns[column] = values[lasts]
+    return pd.DataFrame(columns, index=data.index[starts])
+
+
+def chart_frame(data: pd.DataFrame, fields: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """Chart fields as float64 columns named like the JSON payload (missing columns are NaN)"""
+    fields = CHART_FIELDS if fields is None else fields
+    return pd.DataFrame(
+        {field: data[CHART_FIELDS[field]] if CHART_FIELDS[field] in data.columns else np.nan for field in fields},
+        index=data.index, dtype=np.float64,
+    )
+
+
+def _quality(params: List[str]) -> float:
+    """q-value of an Accept entry's parameters (1 when absent or malformed)"""
+    for param in params:
+        name, _, value = param.partition('=')
+        if name.strip().lower() == 'q':
+            try:
+                return float(value.strip())
+            except ValueError:
+                return 1.0
+    return 1.0
+
+
+def negotiate_binary(request: Request) -> Optional[str]:
+    """
+    Binary media type the client accepts, or None to answer with JSON
+
+    Arrow is preferred when both are accepted. Raises 406 when only Arrow
+    is acceptable and pyarrow is not installed.
+    """
+    accepted = set()
+    for part in request.headers.get('accept', '').split(','):
+        media_type, *params = [item.strip() for item in part.split(';')]
+        if _quality(params) > 0:
+            accepted.add(media_type.lower())
+
+    if ARROW_MEDIA_TYPE in accepted and pa is not None:
+        return ARROW_MEDIA_TYPE
+    if F64_MEDIA_TYPE in accepted:
+        return F64_MEDIA_TYPE
+    if ARROW_MEDIA_TYPE in accepted and not accepted & {'application/json', 'application/*', '*/*'}:
+        raise HTTPException(status_code=406, detail="Arrow output needs pyarrow; accept "
+                                                    f"{F64_MEDIA_TYPE} or application/json instead")
+    return None
+
+
+def binary_response(frame: pd.DataFrame, media_type: str, metadata: Dict[str, Any]) -> Response:
+    """
+    Stream a frame's columns as binary buffers, with no per-value formatting
+
+    The first column is 'date' (int64 milliseconds since the epoch, UTC),
+    followed by the frame's columns as float64. metadata holds the
+    endpoint's scalar fields (JSON-encoded).
+    """
+    dates = _epoch_ms(frame.index)
+    columns = {name: frame[name].to_numpy(dtype='<f8', na_value=np.nan) for name in frame.columns}
+    if media_type == ARROW_MEDIA_TYPE:
+        return Response(_arrow_stream(dates, columns, metadata), media_type=ARROW_MEDIA_TYPE)
+    return StreamingResponse(_f64_chunks(dates, columns, metadata), media_type=F64_MEDIA_TYPE)
+
+
+def _epoch_ms(index: pd.Index) -> np.ndarray:
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    return np.ascontiguousarray(index.as_unit('ms').asi8, dtype='<i8')
+
+
+def _arrow_stream(dates: np.ndarray, columns: Dict[str, np.ndarray], metadata: Dict[str, Any]) -> bytes:
+    """Arrow IPC stream with one record batch; NaN becomes null"""
+    arrays = [pa.array(dates, type=pa.timestamp('ms', tz='UTC'))]
+    arrays += [pa.array(values, from_pandas=True) for values in columns.values()]
+    schema = pa.schema(
+        [pa.field('date', arrays[0].type)] + [pa.field(name, pa.float64()) for name in columns],
+        metadata={'metadata': json.dumps(metadata)},
+    )
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        writer.write_batch(pa.record_batch(arrays, schema=schema))
+    return sink.getvalue().to_pybytes()
+
+
+def _f64_chunks(dates: np.ndarray, columns: Dict[str, np.ndarray], metadata: Dict[str, Any]) -> Iterator[bytes]:
+    """
+    Raw column buffers, for clients without an Arrow reader
+
+    Layout: uint32 LE header length, UTF-8 JSON header padded with spaces
+    to a multiple of 8 bytes, then each column's buffer in header order
+    (rows x 8 bytes). The header is {"rows": n, "columns": [{"name":
+    "date", "dtype": "<i8"}, {"name": ..., "dtype": "<f8"}, ...],
+    "metadata": {...}}; missing values are NaN. In JavaScript:
+    new Float64Array(body, offset, rows).
+    """
+    header = json.dumps({
+        'rows': len(dates),
+        'columns': [{'name': 'date', 'dtype': '<i8'}] + [{'name': name, 'dtype': '<f8'} for name in columns],
+        'metadata': metadata,
+    }).encode('utf-8')
+    header += b' ' * (-(len(header) + 4) % 8)
+    yield struct.pack('<I', len(header)) + header
+    yield dates.tobytes()
+    for values in columns.values():
+        yield values.tobytes()
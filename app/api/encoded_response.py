@@ -0,0 +1,84 @@
+"""
+Encoded Response
+JSON responses encoded once and cached as bytes, with ETag and gzip variants
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from starlette.requests import Request
+from starlette.responses import Response
+
+# Bodies smaller than this are not worth compressing
+GZIP_MIN_BYTES = 1024
+
+
+@dataclass(frozen=True)
+class EncodedResponse:
+    """
+    A JSON payload rendered to its final bytes
+
+    The body is byte-for-byte what FastAPI would send for the payload, so
+    caching an EncodedResponse instead of the payload skips
+    jsonable_encoder and json.dumps on every hit. The gzip variant and the
+    ETag are computed once, with the body.
+    """
+    body: bytes
+    etag: str
+    gzip_body: Optional[bytes] = None
+
+    def to_response(self, request: Request, extra: Optional[Dict[str, Any]] = None) -> Response:
+        """
+        Response for this request: 304 when the client already has the
+        body (If-None-Match), gzip when accepted, plain JSON otherwise
+
+        Args:
+            extra: Per-request fields appended to the (object) payload, such
+                   as a data age; they are left out of the ETag, which is
+                   weak, and disable the precompressed variant
+        """
+        headers = {'ETag': self.etag, 'Vary': 'Accept-Encoding'}
+        if _etag_matches(request.headers.get('if-none-match'), self.etag):
+            return Response(status_code=304, headers=headers)
+
+        if extra and self.body.startswith(b'{'):
+            fields = json.dumps(jsonable_encoder(extra), ensure_ascii=False, allow_nan=False,
+                                separators=(",", ":")).encode('utf-8')
+            body = self.body[:-1] + (b',' if len(self.body) > 2 else b'') + fields[1:]
+            return Response(body, media_type='application/json', headers=headers)
+
+        if self.gzip_body is not None and 'gzip' in request.headers.get('accept-encoding', ''):
+            return Response(self.gzip_body, media_type='application/json',
+                            headers={**headers, 'Content-Encoding': 'gzip'})
+        return Response(self.body, media_type='application/json', headers=headers)
+
+
+def encode_response(payload: Any) -> EncodedResponse:
+    """Render a handler's return value the way FastAPI would, once"""
+    body = JSONResponse(content=jsonable_encoder(payload)).body
+    etag = 'W/"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+    gzip_body = gzip.compress(body, compresslevel=6, mtime=0) if len(body) >= GZIP_MIN_BYTES else None
+    return EncodedResponse(body, etag, gzip_body)
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    for candidate in header.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
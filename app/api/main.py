@@ -6,16 +6,36 @@ Advanced Cryptocurrency Visualization System
 from __future__ import annotations
 
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any
+from typing import Any, Callable, Dict, Optional, Tuple
 
-from fastapi import FastAPI, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 import pandas as pd
 from app.services.paper_trading_service import paper_trading_service
+from app.api.chart_formats import (bars_since, binary_response, chart_columns, chart_frame, chart_rows,
+                                   downsample_ohlc, field_indicators, lttb_indices, negotiate_binary,
+                                   next_cursor, parse_fields)
+from app.api.encoded_response import encode_response
+from app.api.route_cache import cached_route
 
 logger = logging.getLogger(__name__)
 
+# Indicator columns read by the technical score (the chart payload derives
+# its own from the requested fields, see chart_formats.field_indicators())
+SCORE_INDICATORS = ['RSI', 'MACD', 'Signal', 'SMA_20', 'SMA_50']
+
+# How long market snapshots (ranking, categories, main assets, fast movers)
+# are still served after their TTL while a background refresh runs
+SNAPSHOT_STALE_SECONDS = 900
+
+# Threads running the analyses of a bundle endpoint when parallel=true
+BUNDLE_WORKERS = 4
+
 app = FastAPI(
     title="Crypto Viewer API",
     description="Advanced Cryptocurrency Visualization System",
@@ -35,10 +55,19 @@ app.add_middleware(
 @app.on_event("startup")
 async def startup_event():
     """Start application."""
+    from app.services.cache_service import cache_service
+    cache_service.start_sweeper()
     logger.info("🚀 Crypto Viewer API started")
     logger.info("📊 Server ready to receive requests")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background workers."""
+    from app.services.cache_service import cache_service
+    cache_service.stop_sweeper()
+
+
 @app.get("/")
 def root():
     return {
@@ -59,96 +88,224 @@ def health_check():
     }
 
 
+@app.get("/api/cache/stats")
+def get_cache_stats():
+    """Cache size plus hit/miss/eviction/expiry counters and compute times per key family,
+    and how many history fetches were coalesced into one in flight."""
+    from ..services.cache_service import cache_service
+    from ..services.crypto_data_service import crypto_service
+    
+    return {
+        **cache_service.stats(),
+        "fetch_coalescing": crypto_service.get_fetch_stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+# Prometheus name, type and help of each per-family cache metric
+CACHE_FAMILY_METRICS = [
+    ("hits", "cache_hits_total", "counter", "Fresh values served"),
+    ("stale_hits", "cache_stale_hits_total", "counter", "Values served past their TTL or while being refreshed"),
+    ("shared_hits", "cache_shared_hits_total", "counter", "Entries promoted from the shared tier"),
+    ("misses", "cache_misses_total", "counter", "Lookups with nothing servable"),
+    ("sets", "cache_sets_total", "counter", "Values stored"),
+    ("evictions", "cache_evictions_total", "counter", "Entries evicted by the size limits"),
+    ("expirations", "cache_expirations_total", "counter", "Entries removed after expiring"),
+    ("invalidations", "cache_invalidations_total", "counter", "Entries removed by tag invalidation"),
+    ("computes", "cache_compute_seconds_count", "counter", "Values computed by get_or_compute"),
+    ("compute_seconds", "cache_compute_seconds_sum", "counter", "Seconds spent computing values"),
+    ("entries", "cache_entries", "gauge", "Entries held in memory"),
+    ("bytes", "cache_bytes", "gauge", "Approximate bytes held in memory"),
+    ("oldest_age_seconds", "cache_oldest_entry_age_seconds", "gauge", "Age of the oldest entry in memory"),
+]
+
+
+# Single-flight history fetches (crypto_service.get_fetch_stats())
+FETCH_METRICS = [
+    ("fetches", "history_fetches_total", "counter", "History fetches executed"),
+    ("coalesced", "history_fetches_coalesced_total", "counter", "History requests served by a fetch already in flight"),
+    ("in_flight", "history_fetches_in_flight", "gauge", "History fetches running right now"),
+]
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """Cache and history fetch metrics in the Prometheus text exposition format."""
+    from ..services.cache_service import cache_service
+    from ..services.crypto_data_service import crypto_service
+    
+    stats = cache_service.stats()
+    lines = []
+    for field, name, kind, help_text in CACHE_FAMILY_METRICS:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for family, metrics in stats['families'].items():
+            label = family.replace('\\', '\\\\').replace('"', '\\"')
+            lines.append(f'{name}{{family="{label}"}} {metrics[field]}')
+    
+    for field, name, help_text in [
+        ("entries", "cache_memory_entries", "Entries held in memory"),
+        ("bytes", "cache_memory_bytes", "Approximate bytes held in memory"),
+        ("max_entries", "cache_max_entries", "Memory entry limit"),
+        ("max_bytes", "cache_max_bytes", "Memory byte limit"),
+        ("shared_entries", "cache_shared_entries", "Entries in the shared tier"),
+    ]:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {stats[field]}")
+    
+    fetch_stats = crypto_service.get_fetch_stats()
+    for field, name, kind, help_text in FETCH_METRICS:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.append(f"{name} {fetch_stats[field]}")
+    
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
+
+
 # ============= Cryptocurrency Specific Endpoints =============
 
 @app.get("/api/crypto/assets/main")
 @app.get("/api/sp500/stocks/main")  # Keep for backwards compatibility
-def get_main_cryptos():
+def get_main_cryptos(request: Request):
     """Returns main cryptocurrencies with real-time data."""
     from ..services.crypto_data_service import crypto_service
     from ..services.cache_service import cache_service
     
-    # Cache for 3 minutes
-    cache_key = "main_cryptos"
-    cached = cache_service.get(cache_key)
-    if cached:
-        return cached
-    
-    cryptos = crypto_service.get_main_cryptos()
-    result = {
-        "stocks": cryptos,  # Keep "stocks" key for compatibility
-        "total": len(cryptos),
-        "market": "Cryptocurrency",
-        "timestamp": datetime.now().isoformat(),
-    }
+    def compute():
+        cryptos = crypto_service.get_main_cryptos()
+        return {
+            "stocks": cryptos,  # Keep "stocks" key for compatibility
+            "total": len(cryptos),
+            "market": "Cryptocurrency",
+            "timestamp": datetime.now().isoformat(),
+        }
     
-    cache_service.set(cache_key, result, ttl_seconds=180)
-    return result
+    # Cache for 3 minutes (encoded), then serve stale while refreshing
+    encoded, age = cache_service.get_or_compute("main_cryptos_response", lambda: encode_response(compute()), ttl_seconds=180,
+                                                tags={'family': 'assets'}, stale_seconds=SNAPSHOT_STALE_SECONDS,
+                                                with_age=True)
+    return encoded.to_response(request, extra={"data_age_seconds": round(age, 1)})
 
 
 @app.get("/api/crypto/asset/{ticker}")
 @app.get("/api/sp500/stock/{ticker}")  # Keep for backwards compatibility
 def get_crypto_data(
+    request: Request,
     ticker: str,
-    period: str = Query(default="1y", regex="^(1d|5d|1mo|3mo|6mo|1y|2y|5y|max)$")
+    period: str = Query(default="1y", pattern="^(1d|5d|1mo|3mo|6mo|1y|2y|5y|max)$"),
+    format: str = Query(default="rows", pattern="^(rows|columnar)$",
+                        description="rows: one object per bar; columnar: one array per field"),
+    max_points: Optional[int] = Query(default=None, ge=1,
+                                      description="Aggregate into at most this many OHLC bars"),
+    since: Optional[str] = Query(default=None, description="Only bars from this date on (the next_cursor of a previous response)"),
+    fields: Optional[str] = Query(default=None, description="Comma-separated fields to send (default: all), e.g. close,volume"),
 ):
-    """Returns complete historical data for a cryptocurrency."""
+    """
+    Returns complete historical data for a cryptocurrency.
+    
+    Clients sending Accept: application/vnd.apache.arrow.stream (or
+    application/vnd.crypto-viewer.f64-columns) get the columns as binary
+    buffers instead of JSON. Only the indicators behind the requested
+    fields are computed; price-only fields compute none.
+    """
     from ..services.crypto_data_service import crypto_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    media_type = negotiate_binary(request)
+    selected = parse_fields(fields)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=field_indicators(selected))
     info = crypto_service.fetch_crypto_info(ticker)
     
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Stock {ticker} not found")
     
-    # Convert to JSON format
-    data_json = []
-    for idx, row in data.iterrows():
-        data_json.append({
-            "date": idx.strftime("%Y-%m-%d"),
-            "open": float(row['Open']) if pd.notna(row['Open']) else None,
-            "high": float(row['High']) if pd.notna(row['High']) else None,
-            "low": float(row['Low']) if pd.notna(row['Low']) else None,
-            "close": float(row['Close']) if pd.notna(row['Close']) else None,
-            "volume": int(row['Volume']) if pd.notna(row['Volume']) else None,
-            "rsi": float(row['RSI']) if 'RSI' in row and pd.notna(row['RSI']) else None,
-            "sma_20": float(row['SMA_20']) if 'SMA_20' in row and pd.notna(row['SMA_20']) else None,
-            "sma_50": float(row['SMA_50']) if 'SMA_50' in row and pd.notna(row['SMA_50']) else None,
-            "sma_200": float(row['SMA_200']) if 'SMA_200' in row and pd.notna(row['SMA_200']) else None,
-            "macd": float(row['MACD']) if 'MACD' in row and pd.notna(row['MACD']) else None,
-            "macd_signal": float(row['Signal']) if 'Signal' in row and pd.notna(row['Signal']) else None,
-            "bb_upper": float(row['BB_Upper']) if 'BB_Upper' in row and pd.notna(row['BB_Upper']) else None,
-            "bb_middle": float(row['BB_Middle']) if 'BB_Middle' in row and pd.notna(row['BB_Middle']) else None,
-            "bb_lower": float(row['BB_Lower']) if 'BB_Lower' in row and pd.notna(row['BB_Lower']) else None,
-            "volatility": float(row['Volatility']) if 'Volatility' in row and pd.notna(row['Volatility']) else None,
+    data = bars_since(data, since)
+    source_records = len(data)
+    # From the source bars: a bucket is dated by its first bar, and the next
+    # poll should only re-send the last bar, not re-bucket the whole last bucket
+    cursor = next_cursor(data, since)
+    if max_points:
+        data = downsample_ohlc(data, max_points)
+    
+    if media_type:
+        return binary_response(chart_frame(data, selected), media_type, {
+            "ticker": ticker, "info": jsonable_encoder(info), "period": period, "total_records": len(data),
+            "source_records": source_records, "next_cursor": cursor,
         })
     
-    return {
+    # Built from whole columns; the payload is already JSON-native, so it
+    # skips jsonable_encoder
+    payload = {
         "ticker": ticker,
-        "info": info,
-        "data": data_json,
+        "info": jsonable_encoder(info),
+        "data": chart_columns(data, selected) if format == "columnar" else chart_rows(data, selected),
         "period": period,
-        "total_records": len(data_json),
+        "total_records": len(data),
     }
+    if format == "columnar":
+        payload["format"] = format
+    if len(data) < source_records:
+        payload["source_records"] = source_records
+    if since:
+        payload["since"] = since
+    payload["next_cursor"] = cursor
+    return JSONResponse(content=payload)
 
 
 @app.get("/api/crypto/bitcoin")
 @app.get("/api/sp500/index")  # Keep for backwards compatibility
-def get_bitcoin_index(period: str = Query(default="1y")):
+def get_bitcoin_index(
+    request: Request,
+    period: str = Query(default="1y"),
+    max_points: Optional[int] = Query(default=None, ge=3,
+                                      description="Downsample the close line to this many points (LTTB)"),
+    since: Optional[str] = Query(default=None, description="Only bars from this date on (the next_cursor of a previous response)"),
+):
     """Returns historical data for Bitcoin (main crypto index)."""
     from ..services.crypto_data_service import crypto_service
     from ..services.cache_service import cache_service
     
-    # Cache for 5 minutes by period
-    cache_key = f"bitcoin_index_{period}"
-    cached = cache_service.get(cache_key)
+    # Cache the full response for 5 minutes by period (JSON only); delta
+    # polls slice the cached index instead, so each cursor adds no entry
+    media_type = negotiate_binary(request)
+    cache_key = f"bitcoin_index_response_{period}_{max_points or 'all'}"
+    cached = None if media_type or since else cache_service.get(cache_key, family='bitcoin_index')
     if cached:
-        return cached
+        return cached.to_response(request)
     
-    data = crypto_service.fetch_bitcoin_index(period)
+    def fetch_index() -> pd.DataFrame:
+        index = crypto_service.fetch_bitcoin_index(period)
+        if index.empty:
+            raise HTTPException(status_code=404, detail="Bitcoin data not available")
+        return index
     
-    if data.empty:
-        raise HTTPException(status_code=404, detail="Bitcoin data not available")
+    data = cache_service.get_or_compute(f"bitcoin_index_frame_{period}", fetch_index, ttl_seconds=300,
+                                        tags={'family': 'bitcoin_index', 'ticker': 'BTC-USD', 'period': period})
+    
+    # Calculate variation (over every bar, before downsampling)
+    close = data['Close'].to_numpy(dtype=float)
+    day_change = 0
+    period_change = 0
+    if len(close) >= 2:
+        day_change = float(((close[-1] / close[-2]) - 1) * 100)
+        period_change = float(((close[-1] / close[0]) - 1) * 100)
+    
+    data = bars_since(data, since)
+    source_records = len(data)
+    cursor = next_cursor(data, since)
+    if max_points:
+        data = data.iloc[lttb_indices(data['Close'].to_numpy(dtype=float), max_points)]
+    
+    if media_type:
+        frame = pd.DataFrame({"close": data['Close'].to_numpy(dtype=float),
+                              "volume": data['Volume'].fillna(0).to_numpy(dtype=float)}, index=data.index)
+        return binary_response(frame, media_type, {
+            "index": "Bitcoin (BTC)",
+            "day_change": round(day_change, 2),
+            "period_change": round(period_change, 2),
+            "period": period,
+            "next_cursor": cursor,
+        })
     
     data_json = []
     for idx, row in data.iterrows():
@@ -158,13 +315,6 @@ def get_bitcoin_index(period: str = Query(default="1y")):
             "volume": int(row['Volume']) if pd.notna(row['Volume']) else 0,
         })
     
-    # Calculate variation
-    day_change = 0
-    period_change = 0
-    if len(data_json) >= 2:
-        day_change = ((data_json[-1]['close'] / data_json[-2]['close']) - 1) * 100
-        period_change = ((data_json[-1]['close'] / data_json[0]['close']) - 1) * 100
-    
     result = {
         "index": "Bitcoin (BTC)",
         "data": data_json,
@@ -172,74 +322,77 @@ def get_bitcoin_index(period: str = Query(default="1y")):
         "period_change": round(period_change, 2),
         "period": period,
     }
+    if len(data) < source_records:
+        result["source_records"] = source_records
+    if since:
+        result["since"] = since
+    result["next_cursor"] = cursor
     
-    cache_service.set(cache_key, result, ttl_seconds=300)
-    return result
+    # Cache the encoded body: hits skip JSON encoding entirely
+    encoded = encode_response(result)
+    if not since:
+        cache_service.set(cache_key, encoded, ttl_seconds=300,
+                          tags={'family': 'bitcoin_index', 'ticker': 'BTC-USD', 'period': period})
+    return encoded.to_response(request)
 
 
 @app.get("/api/crypto/categories")
 @app.get("/api/sp500/sectors")  # Keep for backwards compatibility
-def get_category_performance():
+def get_category_performance(request: Request):
     """Returns performance of crypto categories."""
     from ..services.crypto_data_service import crypto_service
     from ..services.cache_service import cache_service
     
-    # Cache for 5 minutes
-    cache_key = "categories"
-    cached = cache_service.get(cache_key)
-    if cached:
-        return cached
-    
-    categories = crypto_service.fetch_category_performance()
-    
-    sectors_list = [
-        {"sector": category, "change": round(change, 2)}
-        for category, change in categories.items()
-    ]
-    
-    # Sort by change
-    sectors_list = sorted(sectors_list, key=lambda x: x['change'], reverse=True)
-    
-    result = {
-        "sectors": sectors_list,
-        "total": len(sectors_list),
-        "timestamp": datetime.now().isoformat(),
-    }
+    def compute():
+        categories = crypto_service.fetch_category_performance()
+        
+        sectors_list = [
+            {"sector": category, "change": round(change, 2)}
+            for category, change in categories.items()
+        ]
+        
+        # Sort by change
+        sectors_list = sorted(sectors_list, key=lambda x: x['change'], reverse=True)
+        
+        return {
+            "sectors": sectors_list,
+            "total": len(sectors_list),
+            "timestamp": datetime.now().isoformat(),
+        }
     
-    cache_service.set(cache_key, result, ttl_seconds=300)
-    return result
+    # Cache for 5 minutes (encoded), then serve stale while refreshing
+    encoded, age = cache_service.get_or_compute("categories_response", lambda: encode_response(compute()), ttl_seconds=300,
+                                                tags={'family': 'categories'}, stale_seconds=SNAPSHOT_STALE_SECONDS,
+                                                with_age=True)
+    return encoded.to_response(request, extra={"data_age_seconds": round(age, 1)})
 
 
 @app.get("/api/crypto/ranking")
 @app.get("/api/sp500/ranking")  # Keep for backwards compatibility
-def get_crypto_ranking(type: str = Query(default="change", regex="^(change|volume)$")):
+def get_crypto_ranking(request: Request, type: str = Query(default="change", pattern="^(change|volume)$")):
     """Returns cryptocurrency ranking by change or volume."""
     from ..services.crypto_data_service import crypto_service
     from ..services.cache_service import cache_service
     
-    # Try cache first (2 minutes)
-    cache_key = f"ranking_{type}"
-    cached = cache_service.get(cache_key)
-    if cached:
-        return cached
-    
-    if type == "change":
-        ranking = crypto_service.fetch_change_ranking(limit=20)
-    else:
-        ranking = crypto_service.get_main_cryptos()
-        ranking = sorted(ranking, key=lambda x: x.get('volume', 0), reverse=True)[:20]
-    
-    result = {
-        "ranking": ranking,
-        "type": type,
-        "total": len(ranking),
-        "timestamp": datetime.now().isoformat(),
-    }
-    
-    # Cache for 2 minutes
-    cache_service.set(cache_key, result, ttl_seconds=120)
+    def compute():
+        if type == "change":
+            ranking = crypto_service.fetch_change_ranking(limit=20)
+        else:
+            ranking = crypto_service.get_main_cryptos()
+            ranking = sorted(ranking, key=lambda x: x.get('volume', 0), reverse=True)[:20]
+        
+        return {
+            "ranking": ranking,
+            "type": type,
+            "total": len(ranking),
+            "timestamp": datetime.now().isoformat(),
+        }
     
-    return result
+    # Cache for 2 minutes (encoded), then serve stale while refreshing
+    encoded, age = cache_service.get_or_compute(f"ranking_response_{type}", lambda: encode_response(compute()), ttl_seconds=120,
+                                                tags={'family': 'ranking'}, stale_seconds=SNAPSHOT_STALE_SECONDS,
+                                                with_age=True)
+    return encoded.to_response(request, extra={"data_age_seconds": round(age, 1)})
 
 
 @app.get("/api/crypto/correlations")
@@ -294,8 +447,10 @@ def get_correlations(
 @app.get("/api/crypto/comparison")
 @app.get("/api/sp500/comparison")  # Keep for backwards compatibility
 def get_crypto_comparison(
+    request: Request,
     tickers: str = Query(..., description="Comma-separated tickers"),
-    period: str = Query(default="1y")
+    period: str = Query(default="1y"),
+    since: Optional[str] = Query(default=None, description="Only bars from this date on (the next_cursor of a previous response)"),
 ):
     """Compares performance of multiple cryptocurrencies."""
     from ..services.crypto_data_service import crypto_service
@@ -305,13 +460,36 @@ def get_crypto_comparison(
     if len(ticker_list) < 2:
         raise HTTPException(status_code=400, detail="Provide at least 2 tickers for comparison")
     
+    media_type = negotiate_binary(request)
+    if media_type:
+        # One column per ticker, aligned on the union of their dates (unrounded)
+        closes = {}
+        for ticker in ticker_list:
+            data = crypto_service.fetch_crypto_data(ticker, period, indicators=())
+            if not data.empty:
+                closes[ticker] = data['Close']
+        normalized = pd.DataFrame({ticker: close / close.iloc[0] * 100 for ticker, close in closes.items()})
+        normalized = bars_since(normalized, since)
+        # Per-ticker last bars (the union index runs to the most recent one)
+        cursors = [next_cursor(normalized[ticker].dropna(), since) for ticker in normalized]
+        return binary_response(normalized, media_type, {
+            "tickers": ticker_list,
+            "period": period,
+            "base": 100,
+            "period_change": {ticker: round(float((close.iloc[-1] / close.iloc[0] - 1) * 100), 2)
+                              for ticker, close in closes.items()},
+            "next_cursor": min(filter(None, cursors), default=since),
+        })
+    
     comparison = {}
+    cursors = []
     
     for ticker in ticker_list:
-        data = crypto_service.fetch_crypto_data(ticker, period)
+        data = crypto_service.fetch_crypto_data(ticker, period, indicators=())
         if not data.empty:
-            # Normalize prices (base 100)
-            normalized_prices = (data['Close'] / data['Close'].iloc[0]) * 100
+            # Normalize prices (base 100), then keep the bars after the cursor
+            normalized_prices = bars_since((data['Close'] / data['Close'].iloc[0]) * 100, since)
+            cursors.append(next_cursor(normalized_prices, since))
             
             comparison[ticker] = {
                 "data": [
@@ -324,24 +502,30 @@ def get_crypto_comparison(
                 "period_change": round(((data['Close'].iloc[-1] / data['Close'].iloc[0]) - 1) * 100, 2),
             }
     
-    return {
+    result = {
         "comparison": comparison,
         "tickers": ticker_list,
         "period": period,
         "base": 100,
     }
+    if since:
+        result["since"] = since
+    # The oldest last bar, so every ticker re-sends (and may revise) its own last bar
+    result["next_cursor"] = min(filter(None, cursors), default=since)
+    return result
 
 
 # ============= Advanced Analysis Endpoints =============
 
 @app.get("/api/crypto/analysis/score/{ticker}")
 @app.get("/api/sp500/analysis/score/{ticker}")  # Keep for backwards compatibility
+@cached_route()
 def get_technical_score(ticker: str, period: str = Query(default="3mo")):
     """Returns Technical Score and Automatic Recommendation"""
     from ..services.crypto_data_service import crypto_service
     from ..services.technical_analysis_advanced import TechnicalAnalysisAdvanced
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=SCORE_INDICATORS)
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -365,11 +549,12 @@ def get_technical_score(ticker: str, period: str = Query(default="3mo")):
 
 @app.get("/api/crypto/analysis/patterns/{ticker}")
 @app.get("/api/sp500/analysis/patterns/{ticker}")  # Keep for backwards compatibility
+@cached_route()
 def get_candle_patterns(ticker: str, period: str = Query(default="1mo")):
     """Detects candlestick patterns"""
     from ..services.crypto_data_service import crypto_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=['Doji', 'Hammer', 'Bullish_Engulfing', 'Bearish_Engulfing'])
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -404,12 +589,13 @@ def get_candle_patterns(ticker: str, period: str = Query(default="1mo")):
 
 @app.get("/api/crypto/analysis/volume-profile/{ticker}")
 @app.get("/api/sp500/analysis/volume-profile/{ticker}")  # Keep for backwards compatibility
+@cached_route()
 def get_volume_profile(ticker: str, period: str = Query(default="3mo")):
     """Returns Volume Profile for the cryptocurrency"""
     from ..services.crypto_data_service import crypto_service
     from ..services.technical_analysis_advanced import TechnicalAnalysisAdvanced
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=())
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -426,11 +612,12 @@ def get_volume_profile(ticker: str, period: str = Query(default="3mo")):
 
 @app.get("/api/crypto/analysis/advanced-indicators/{ticker}")
 @app.get("/api/sp500/analysis/advanced-indicators/{ticker}")  # Keep for backwards compatibility
+@cached_route()
 def get_advanced_indicators(ticker: str, period: str = Query(default="6mo")):
     """Returns all advanced indicators"""
     from ..services.crypto_data_service import crypto_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=['VWAP', 'OBV', 'MFI', 'Force_Index', 'AD', 'ROC', 'Momentum', 'ADX'])
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -479,13 +666,8 @@ def compare_cryptos_advanced(
     if len(ticker_list) < 2:
         raise HTTPException(status_code=400, detail="Provide at least 2 tickers")
     
-    stocks_data = {}
-    for ticker in ticker_list:
-        data = crypto_service.fetch_crypto_data(ticker, period)
-        if not data.empty:
-            stocks_data[ticker] = data
-    
-    comparison = StockComparator.compare_metrics(stocks_data)
+    panel = crypto_service.fetch_panel(ticker_list, period)
+    comparison = StockComparator.compare_metrics_panel(panel)
     
     return {
         "comparison": comparison.to_dict(orient='records'),
@@ -496,12 +678,13 @@ def compare_cryptos_advanced(
 
 @app.get("/api/crypto/analysis/fibonacci/{ticker}")
 @app.get("/api/sp500/analysis/fibonacci/{ticker}")  # Keep for backwards compatibility
+@cached_route()
 def get_fibonacci(ticker: str, period: str = Query(default="3mo")):
     """Returns Fibonacci levels, Camarilla and extensions"""
     from ..services.crypto_data_service import crypto_service
     from ..services.technical_analysis_advanced import TechnicalAnalysisAdvanced
 
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=())
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
 
@@ -518,6 +701,7 @@ def get_fibonacci(ticker: str, period: str = Query(default="3mo")):
 @app.get("/api/crypto/screener")
 @app.get("/api/sp500/screener")  # Keep for backwards compatibility
 def crypto_screener(
+    request: Request,
     rsi_max: float = Query(default=None),
     rsi_min: float = Query(default=None),
     score_min: float = Query(default=None),
@@ -533,89 +717,86 @@ def crypto_screener(
     from ..services.cache_service import cache_service
     
     # Create unique key for this filter
-    cache_key = f"crypto_screener_{rsi_max}_{rsi_min}_{score_min}_{volume_min}_{price_max}_{price_min}"
-    
-    # Check cache (5 minutes)
-    cached = cache_service.get(cache_key)
-    if cached is not None:
-        logger.info(f"📦 Crypto Screener returned from cache")
-        return cached
-    
-    logger.info(f"🔍 Processing Crypto Screener (no cache)...")
-    results = []
-    
-    # Fetch only 20 cryptos to avoid taking too long
-    cryptos_to_analyze = crypto_service.MAIN_CRYPTOS[:20]
-    
-    for ticker in cryptos_to_analyze:
-        try:
-            data = crypto_service.fetch_crypto_data(ticker, '3mo')
+    cache_key = f"crypto_screener_response_{rsi_max}_{rsi_min}_{score_min}_{volume_min}_{price_max}_{price_min}"
+    
+    def compute():
+        logger.info(f"🔍 Processing Crypto Screener (no cache)...")
+        results = []
+        
+        # Fetch only 20 cryptos to avoid taking too long
+        cryptos_to_analyze = crypto_service.MAIN_CRYPTOS[:20]
+        
+        for ticker in cryptos_to_analyze:
+            try:
+                data = crypto_service.fetch_crypto_data(ticker, '3mo', indicators=SCORE_INDICATORS)
             
-            if data.empty or len(data) < 20:
-                continue
+                if data.empty or len(data) < 20:
+                    continue
             
-            info = crypto_service.fetch_crypto_info(ticker)
-            last = data.iloc[-1]
+                info = crypto_service.fetch_crypto_info(ticker)
+                last = data.iloc[-1]
             
-            # Extract values with protection against None/NaN
-            price_value = float(info.get('current_price', 0)) if info.get('current_price') else 0.0
-            rsi_value = float(last.get('RSI', 50)) if pd.notna(last.get('RSI')) else 50
-            volume_value = float(last.get('Volume', 0)) if pd.notna(last.get('Volume')) else 0
+                # Extract values with protection against None/NaN
+                price_value = float(info.get('current_price', 0)) if info.get('current_price') else 0.0
+                rsi_value = float(last.get('RSI', 50)) if pd.notna(last.get('RSI')) else 50
+                volume_value = float(last.get('Volume', 0)) if pd.notna(last.get('Volume')) else 0
             
-            # Apply filters
-            if price_max and price_value > price_max:
-                continue
-            if price_min and price_value < price_min:
-                continue
-            if rsi_max and rsi_value > rsi_max:
-                continue
-            if rsi_min and rsi_value < rsi_min:
-                continue
-            if volume_min and volume_value < volume_min:
-                continue
+                # Apply filters
+                if price_max and price_value > price_max:
+                    continue
+                if price_min and price_value < price_min:
+                    continue
+                if rsi_max and rsi_value > rsi_max:
+                    continue
+                if rsi_min and rsi_value < rsi_min:
+                    continue
+                if volume_min and volume_value < volume_min:
+                    continue
             
-            # Calculate score
-            score_data = TechnicalAnalysisAdvanced.calculate_technical_score(data)
+                # Calculate score
+                score_data = TechnicalAnalysisAdvanced.calculate_technical_score(data)
             
-            if score_min and score_data['score'] < score_min:
-                continue
+                if score_min and score_data['score'] < score_min:
+                    continue
             
-            results.append({
-                'ticker': str(ticker),
-                'name': str(info.get('name', ticker)),
-                'price': float(price_value),
-                'market_cap': float(info.get('market_cap', 0)),
-                'rsi': float(rsi_value),
-                'score': float(score_data['score']),
-                'recommendation': str(score_data['recommendation']),
-                'volume': float(volume_value)
-            })
+                results.append({
+                    'ticker': str(ticker),
+                    'name': str(info.get('name', ticker)),
+                    'price': float(price_value),
+                    'market_cap': float(info.get('market_cap', 0)),
+                    'rsi': float(rsi_value),
+                    'score': float(score_data['score']),
+                    'recommendation': str(score_data['recommendation']),
+                    'volume': float(volume_value)
+                })
             
-        except Exception as e:
-            logger.error(f"❌ Error analyzing {ticker} in crypto screener: {e}")
-            continue
-    
-    # Sort by score
-    results = sorted(results, key=lambda x: x['score'], reverse=True)
-    
-    response = {
-        "results": results,
-        "total": len(results),
-        "filters_applied": {
-            "price_max": price_max,
-            "price_min": price_min,
-            "rsi_max": rsi_max,
-            "rsi_min": rsi_min,
-            "score_min": score_min,
-            "volume_min": volume_min
+            except Exception as e:
+                logger.error(f"❌ Error analyzing {ticker} in crypto screener: {e}")
+                continue
+        
+        # Sort by score
+        results = sorted(results, key=lambda x: x['score'], reverse=True)
+        
+        response = {
+            "results": results,
+            "total": len(results),
+            "filters_applied": {
+                "price_max": price_max,
+                "price_min": price_min,
+                "rsi_max": rsi_max,
+                "rsi_min": rsi_min,
+                "score_min": score_min,
+                "volume_min": volume_min
+            }
         }
-    }
-    
-    # Cache result for 5 minutes (300 seconds)
-    cache_service.set(cache_key, response, ttl=300)
-    logger.info(f"✅ Crypto Screener processed and cached: {len(results)} results")
+        
+        logger.info(f"✅ Crypto Screener processed: {len(results)} results")
+        return response
     
-    return response
+    # Cache the encoded result for 5 minutes (300 seconds)
+    encoded = cache_service.get_or_compute(cache_key, lambda: encode_response(compute()), ttl_seconds=300,
+                                           tags={'family': 'screener'})
+    return encoded.to_response(request)
 
 
 @app.get("/api/crypto/heatmap/market-cap")
@@ -732,12 +913,13 @@ async def websocket_market_feed(websocket: WebSocket):
 # ============= ADVANCED ANALYSIS ENDPOINTS (20 NEW FEATURES) =============
 
 @app.get("/api/crypto/advanced/divergences/{ticker}")
+@cached_route()
 def get_divergences(ticker: str, period: str = Query(default="3mo")):
     """Detecta divergências entre preço e RSI"""
     from ..services.crypto_data_service import crypto_service
     from ..services.advanced_analysis_service import advanced_analysis_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=['RSI'])
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -746,12 +928,13 @@ def get_divergences(ticker: str, period: str = Query(default="3mo")):
 
 
 @app.get("/api/crypto/advanced/gaps/{ticker}")
+@cached_route()
 def get_gaps(ticker: str, period: str = Query(default="6mo")):
     """Analisa gaps de preço"""
     from ..services.crypto_data_service import crypto_service
     from ..services.advanced_analysis_service import advanced_analysis_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=())
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -760,12 +943,13 @@ def get_gaps(ticker: str, period: str = Query(default="6mo")):
 
 
 @app.get("/api/crypto/advanced/breakout/{ticker}")
+@cached_route()
 def get_breakout_analysis(ticker: str, period: str = Query(default="1y")):
     """Detecta breakouts"""
     from ..services.crypto_data_service import crypto_service
     from ..services.advanced_analysis_service import advanced_analysis_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=())
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -774,12 +958,13 @@ def get_breakout_analysis(ticker: str, period: str = Query(default="1y")):
 
 
 @app.get("/api/crypto/advanced/support-resistance/{ticker}")
+@cached_route()
 def get_advanced_support_resistance(ticker: str, period: str = Query(default="6mo")):
     """Suporte e resistência avançados com cluster analysis"""
     from ..services.crypto_data_service import crypto_service
     from ..services.advanced_analysis_service import advanced_analysis_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=())
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -788,12 +973,13 @@ def get_advanced_support_resistance(ticker: str, period: str = Query(default="6m
 
 
 @app.get("/api/crypto/advanced/momentum-multi/{ticker}")
+@cached_route()
 def get_momentum_multi_timeframe(ticker: str):
     """Momentum em múltiplos timeframes"""
     from ..services.crypto_data_service import crypto_service
     from ..services.advanced_analysis_service import advanced_analysis_service
     
-    data = crypto_service.fetch_crypto_data(ticker, "1y")
+    data = crypto_service.fetch_crypto_data(ticker, "1y", indicators=())
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -802,13 +988,14 @@ def get_momentum_multi_timeframe(ticker: str):
 
 
 @app.get("/api/crypto/advanced/relative-strength/{ticker}")
+@cached_route(depends_on=["BTC-USD"])
 def get_relative_strength(ticker: str, period: str = Query(default="6mo")):
     """Força relativa vs Bitcoin"""
     from ..services.crypto_data_service import crypto_service
     from ..services.advanced_analysis_service import advanced_analysis_service
     
-    crypto_data = crypto_service.fetch_crypto_data(ticker, period)
-    btc_data = crypto_service.fetch_crypto_data("BTC-USD", period)
+    crypto_data = crypto_service.fetch_crypto_data(ticker, period, indicators=())
+    btc_data = crypto_service.fetch_crypto_data("BTC-USD", period, indicators=())
     
     if crypto_data.empty or btc_data.empty:
         raise HTTPException(status_code=404, detail="Data not available")
@@ -818,12 +1005,13 @@ def get_relative_strength(ticker: str, period: str = Query(default="6mo")):
 
 
 @app.get("/api/crypto/advanced/mean-reversion/{ticker}")
+@cached_route()
 def get_mean_reversion(ticker: str, period: str = Query(default="3mo")):
     """Análise de mean reversion com Z-Score"""
     from ..services.crypto_data_service import crypto_service
     from ..services.advanced_analysis_service import advanced_analysis_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=())
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -832,12 +1020,13 @@ def get_mean_reversion(ticker: str, period: str = Query(default="3mo")):
 
 
 @app.get("/api/crypto/advanced/swing-signals/{ticker}")
+@cached_route()
 def get_swing_signals(ticker: str, period: str = Query(default="3mo")):
     """Sinais de swing trading"""
     from ..services.crypto_data_service import crypto_service
     from ..services.advanced_analysis_service import advanced_analysis_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=['RSI'])
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -846,12 +1035,13 @@ def get_swing_signals(ticker: str, period: str = Query(default="3mo")):
 
 
 @app.get("/api/crypto/advanced/seasonality/{ticker}")
+@cached_route(ttl_seconds=900)
 def get_seasonality(ticker: str):
     """Análise de sazonalidade"""
     from ..services.crypto_data_service import crypto_service
     from ..services.advanced_analysis_service import advanced_analysis_service
     
-    data = crypto_service.fetch_crypto_data(ticker, "2y")
+    data = crypto_service.fetch_crypto_data(ticker, "2y", indicators=())
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -860,12 +1050,13 @@ def get_seasonality(ticker: str):
 
 
 @app.get("/api/crypto/advanced/volatility-expanded/{ticker}")
+@cached_route()
 def get_volatility_expanded(ticker: str, period: str = Query(default="6mo")):
     """Análise expandida de volatilidade"""
     from ..services.crypto_data_service import crypto_service
     from ..services.advanced_analysis_service import advanced_analysis_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=['BB_Upper', 'BB_Lower', 'BB_Middle'])
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -874,12 +1065,13 @@ def get_volatility_expanded(ticker: str, period: str = Query(default="6mo")):
 
 
 @app.get("/api/crypto/advanced/price-patterns/{ticker}")
+@cached_route()
 def get_price_patterns(ticker: str, period: str = Query(default="6mo")):
     """Detecta padrões clássicos de price action"""
     from ..services.crypto_data_service import crypto_service
     from ..services.advanced_analysis_service import advanced_analysis_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=())
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -888,12 +1080,13 @@ def get_price_patterns(ticker: str, period: str = Query(default="6mo")):
 
 
 @app.get("/api/crypto/advanced/statistical/{ticker}")
+@cached_route()
 def get_statistical_analysis(ticker: str, period: str = Query(default="1y")):
     """Dashboard estatístico completo"""
     from ..services.crypto_data_service import crypto_service
     from ..services.advanced_analysis_service import advanced_analysis_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=())
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -902,12 +1095,13 @@ def get_statistical_analysis(ticker: str, period: str = Query(default="1y")):
 
 
 @app.get("/api/crypto/advanced/anomalies/{ticker}")
+@cached_route()
 def get_anomalies(ticker: str, period: str = Query(default="1y")):
     """Detecção de anomalias de mercado"""
     from ..services.crypto_data_service import crypto_service
     from ..services.advanced_analysis_service import advanced_analysis_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=())
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -916,12 +1110,13 @@ def get_anomalies(ticker: str, period: str = Query(default="1y")):
 
 
 @app.get("/api/crypto/advanced/consensus/{ticker}")
+@cached_route()
 def get_multi_indicator_consensus(ticker: str, period: str = Query(default="3mo")):
     """Sistema de votação multi-indicadores"""
     from ..services.crypto_data_service import crypto_service
     from ..services.advanced_analysis_service import advanced_analysis_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=['RSI', 'MACD', 'Signal', 'SMA_20', 'SMA_50', 'BB_Upper', 'BB_Lower'])
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -939,27 +1134,23 @@ def get_watchlist_comparison(
     from ..services.advanced_analysis_service import advanced_analysis_service
     
     ticker_list = [t.strip() for t in tickers.split(',')]
-    stocks_data = {}
+    panel = crypto_service.fetch_panel(ticker_list, period, indicators=['RSI', 'MACD', 'Signal'])
     
-    for ticker in ticker_list:
-        data = crypto_service.fetch_crypto_data(ticker, period)
-        if not data.empty:
-            stocks_data[ticker] = data
-    
-    if not stocks_data:
+    if len(panel) == 0:
         raise HTTPException(status_code=404, detail="No valid tickers found")
     
-    result = advanced_analysis_service.compare_watchlist(stocks_data)
+    result = advanced_analysis_service.compare_watchlist_panel(panel)
     return {"comparison": result, "total": len(result)}
 
 
 @app.get("/api/crypto/advanced/trade-planner/{ticker}")
+@cached_route()
 def get_trade_planner(ticker: str, period: str = Query(default="3mo")):
     """Plano visual de trade com entry, stop e targets"""
     from ..services.crypto_data_service import crypto_service
     from ..services.advanced_analysis_service import advanced_analysis_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=())
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -968,38 +1159,29 @@ def get_trade_planner(ticker: str, period: str = Query(default="3mo")):
 
 
 @app.get("/api/crypto/advanced/fast-movers")
-def get_fast_movers(period: str = Query(default="1mo")):
+def get_fast_movers(request: Request, period: str = Query(default="1mo")):
     """Cryptos com movimento rápido (alerta)"""
     from ..services.crypto_data_service import crypto_service
     from ..services.advanced_analysis_service import advanced_analysis_service
     from ..services.cache_service import cache_service
     
-    # Cache por 5 minutos
-    cache_key = "fast_movers"
-    cached = cache_service.get(cache_key)
-    if cached:
-        return cached
-    
-    # Analisa top 30 cryptos
-    main_cryptos = crypto_service.MAIN_CRYPTOS[:30]
-    stocks_data = {}
-    
-    for ticker in main_cryptos:
-        try:
-            data = crypto_service.fetch_crypto_data(ticker, period)
-            if not data.empty:
-                stocks_data[ticker] = data
-        except:
-            continue
-    
-    result = advanced_analysis_service.fast_movers_scanner(stocks_data)
-    response = {"movers": result, "total": len(result)}
+    def compute():
+        # Analisa top 30 cryptos
+        main_cryptos = crypto_service.MAIN_CRYPTOS[:30]
+        panel = crypto_service.fetch_panel(main_cryptos, period)
+        
+        result = advanced_analysis_service.fast_movers_scanner_panel(panel)
+        return {"movers": result, "total": len(result)}
     
-    cache_service.set(cache_key, response, ttl_seconds=300)
-    return response
+    # Cache por 5 minutos; depois serve o resultado antigo enquanto atualiza
+    encoded, age = cache_service.get_or_compute(f"fast_movers_response_{period}", lambda: encode_response(compute()),
+                                                ttl_seconds=300, tags={'family': 'fast_movers', 'period': period},
+                                                stale_seconds=SNAPSHOT_STALE_SECONDS, with_age=True)
+    return encoded.to_response(request, extra={"data_age_seconds": round(age, 1)})
 
 
 @app.get("/api/crypto/advanced/dca-simulator/{ticker}")
+@cached_route()
 def get_dca_simulator(
     ticker: str,
     monthly_investment: float = Query(default=100),
@@ -1010,7 +1192,7 @@ def get_dca_simulator(
     from ..services.advanced_analysis_service import advanced_analysis_service
     
     # Precisa de dados suficientes
-    data = crypto_service.fetch_crypto_data(ticker, "2y")
+    data = crypto_service.fetch_crypto_data(ticker, "2y", indicators=())
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -1019,12 +1201,13 @@ def get_dca_simulator(
 
 
 @app.get("/api/crypto/advanced/entry-checklist/{ticker}")
+@cached_route()
 def get_entry_checklist(ticker: str, period: str = Query(default="3mo")):
     """Checklist antes de entrar em trade"""
     from ..services.crypto_data_service import crypto_service
     from ..services.advanced_analysis_service import advanced_analysis_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=['RSI'])
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -1033,12 +1216,13 @@ def get_entry_checklist(ticker: str, period: str = Query(default="3mo")):
 
 
 @app.get("/api/crypto/advanced/fibonacci-time/{ticker}")
+@cached_route()
 def get_fibonacci_time_zones(ticker: str, period: str = Query(default="6mo")):
     """Projeção temporal de Fibonacci"""
     from ..services.crypto_data_service import crypto_service
     from ..services.advanced_analysis_service import advanced_analysis_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=())
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -1046,17 +1230,124 @@ def get_fibonacci_time_zones(ticker: str, period: str = Query(default="6mo")):
     return {"ticker": ticker, **result}
 
 
+# Indicator columns read by the analyses of the advanced bundle
+ADVANCED_BUNDLE_INDICATORS = ['RSI', 'MACD', 'Signal', 'SMA_20', 'SMA_50', 'BB_Upper', 'BB_Middle', 'BB_Lower']
+
+
+# Timing fields of the bundle payloads: they only describe the request
+# that computed the bundle, so cached copies are sent without them
+BUNDLE_TIMING_FIELDS = ("fetch_ms", "timings_ms")
+
+
+def _run_analyses(
+    tasks: Dict[str, Callable[[], Dict[str, Any]]], parallel: bool = False
+) -> Tuple[Dict[str, Optional[Dict[str, Any]]], Dict[str, str], Dict[str, float]]:
+    """
+    Run the analyses of a bundle endpoint, isolating failures
+
+    Results are JSON-encoded as they are produced, so one that cannot be
+    serialized fails on its own instead of failing the whole response.
+
+    Returns:
+        (results, errors, timings in ms) by task key; a failed analysis
+        has a None result and its message in errors
+    """
+    def run(key: str):
+        started = time.perf_counter()
+        try:
+            result, error = jsonable_encoder(tasks[key]()), None
+        except Exception as e:
+            logger.error(f"Bundle analysis {key} failed: {e}")
+            result, error = None, str(e) or type(e).__name__
+        return result, error, round((time.perf_counter() - started) * 1000, 1)
+
+    if parallel and len(tasks) > 1:
+        with ThreadPoolExecutor(max_workers=min(BUNDLE_WORKERS, len(tasks))) as pool:
+            outcomes = dict(zip(tasks, pool.map(run, tasks)))
+    else:
+        outcomes = {key: run(key) for key in tasks}
+
+    results = {key: result for key, (result, _, _) in outcomes.items()}
+    errors = {key: error for key, (_, error, _) in outcomes.items() if error is not None}
+    timings = {key: elapsed for key, (_, _, elapsed) in outcomes.items()}
+    return results, errors, timings
+
+
+@app.get("/api/crypto/advanced/bundle/{ticker}")
+@cached_route(depends_on=["BTC-USD"], uncached_fields=BUNDLE_TIMING_FIELDS)
+def get_advanced_bundle(
+    ticker: str,
+    monthly_investment: float = Query(default=100),
+    months: int = Query(default=12),
+    parallel: bool = Query(default=False, description="Run the analyses on a thread pool"),
+):
+    """Todas as análises avançadas de uma crypto em uma requisição"""
+    from ..services.crypto_data_service import crypto_service
+    from ..services.advanced_analysis_service import advanced_analysis_service as service
+    
+    def relative_strength(data: pd.DataFrame) -> Dict[str, Any]:
+        if btc_data.empty:
+            raise ValueError("BTC-USD data not available")
+        return service.calculate_relative_strength(data, btc_data)
+    
+    # Section -> (period, analysis), with the defaults of the individual endpoints
+    sections = {
+        "divergences": ("3mo", service.detect_divergences),
+        "gaps": ("6mo", service.analyze_gaps),
+        "breakout": ("1y", service.detect_breakouts),
+        "support": ("6mo", service.advanced_support_resistance),
+        "momentum": ("1y", service.momentum_multi_timeframe),
+        "relativeStrength": ("6mo", relative_strength),
+        "meanReversion": ("3mo", service.mean_reversion_zscore),
+        "swingSignals": ("3mo", service.swing_trading_signals),
+        "seasonality": ("2y", service.seasonality_analysis),
+        "volatility": ("6mo", service.volatility_analysis_expanded),
+        "patterns": ("6mo", service.detect_price_patterns),
+        "statistical": ("1y", service.statistical_analysis),
+        "anomalies": ("1y", service.detect_anomalies),
+        "consensus": ("3mo", service.multi_indicator_consensus),
+        "tradePlan": ("3mo", service.trade_planner),
+        "dcaSimulator": ("2y", lambda data: service.dca_simulator(data, monthly_investment, months)),
+        "entryChecklist": ("3mo", service.entry_checklist),
+        "fibonacciTime": ("6mo", service.fibonacci_time_zones),
+    }
+    
+    # One fetch for the longest period; the others are views of it
+    started = time.perf_counter()
+    frames = crypto_service.fetch_crypto_periods(
+        ticker, [period for period, _ in sections.values()], indicators=ADVANCED_BUNDLE_INDICATORS)
+    if all(frame.empty for frame in frames.values()):
+        raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
+    btc_data = frames["6mo"] if ticker == "BTC-USD" else crypto_service.fetch_crypto_data("BTC-USD", "6mo", indicators=())
+    fetch_ms = round((time.perf_counter() - started) * 1000, 1)
+    
+    def section(period, analysis):
+        return lambda: {"ticker": ticker, **analysis(frames[period])}
+    
+    results, errors, timings = _run_analyses(
+        {key: section(period, analysis) for key, (period, analysis) in sections.items()}, parallel)
+    return {
+        "ticker": ticker,
+        "analyses": results,
+        "errors": errors,
+        "fetch_ms": fetch_ms,
+        "timings_ms": timings,
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
 # ============================================================
 # PROFESSIONAL TOOLS API - 28 Advanced Features
 # ============================================================
 
 @app.get("/api/professional/ichimoku/{ticker}")
+@cached_route()
 def get_ichimoku_cloud(ticker: str, period: str = Query(default="6mo")):
     """Complete Ichimoku Cloud System"""
     from ..services.crypto_data_service import crypto_service
     from ..services.professional_tools_service import professional_tools_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=())
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -1065,12 +1356,13 @@ def get_ichimoku_cloud(ticker: str, period: str = Query(default="6mo")):
 
 
 @app.get("/api/professional/elliott-wave/{ticker}")
+@cached_route(ttl_seconds=900)
 def get_elliott_wave(ticker: str, period: str = Query(default="6mo")):
     """Elliott Wave Counter"""
     from ..services.crypto_data_service import crypto_service
     from ..services.professional_tools_service import professional_tools_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=())
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -1079,12 +1371,13 @@ def get_elliott_wave(ticker: str, period: str = Query(default="6mo")):
 
 
 @app.get("/api/professional/wyckoff/{ticker}")
+@cached_route(ttl_seconds=900)
 def get_wyckoff_analysis(ticker: str, period: str = Query(default="3mo")):
     """Wyckoff Method Analysis"""
     from ..services.crypto_data_service import crypto_service
     from ..services.professional_tools_service import professional_tools_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=())
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -1093,12 +1386,13 @@ def get_wyckoff_analysis(ticker: str, period: str = Query(default="3mo")):
 
 
 @app.get("/api/professional/trend-alignment/{ticker}")
+@cached_route()
 def get_trend_alignment(ticker: str, period: str = Query(default="6mo")):
     """Trend Alignment Scanner"""
     from ..services.crypto_data_service import crypto_service
     from ..services.professional_tools_service import professional_tools_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=())
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -1107,12 +1401,13 @@ def get_trend_alignment(ticker: str, period: str = Query(default="6mo")):
 
 
 @app.get("/api/professional/candlestick-patterns/{ticker}")
+@cached_route()
 def get_candlestick_patterns(ticker: str, period: str = Query(default="3mo")):
     """Candlestick Pattern Library"""
     from ..services.crypto_data_service import crypto_service
     from ..services.professional_tools_service import professional_tools_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=())
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -1121,12 +1416,13 @@ def get_candlestick_patterns(ticker: str, period: str = Query(default="3mo")):
 
 
 @app.get("/api/professional/support-resistance/{ticker}")
+@cached_route()
 def get_support_resistance_zones(ticker: str, period: str = Query(default="6mo")):
     """Support/Resistance Zones"""
     from ..services.crypto_data_service import crypto_service
     from ..services.professional_tools_service import professional_tools_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=())
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -1135,6 +1431,7 @@ def get_support_resistance_zones(ticker: str, period: str = Query(default="6mo")
 
 
 @app.get("/api/professional/monte-carlo/{ticker}")
+@cached_route(ttl_seconds=900)
 def get_monte_carlo_simulation(
     ticker: str, 
     period: str = Query(default="6mo"),
@@ -1145,7 +1442,7 @@ def get_monte_carlo_simulation(
     from ..services.crypto_data_service import crypto_service
     from ..services.professional_tools_service import professional_tools_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=())
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -1154,12 +1451,13 @@ def get_monte_carlo_simulation(
 
 
 @app.get("/api/professional/calendar/{ticker}")
+@cached_route(ttl_seconds=900)
 def get_historical_calendar(ticker: str, period: str = Query(default="2y")):
     """Historical Performance Calendar"""
     from ..services.crypto_data_service import crypto_service
     from ..services.professional_tools_service import professional_tools_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=())
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -1168,12 +1466,13 @@ def get_historical_calendar(ticker: str, period: str = Query(default="2y")):
 
 
 @app.get("/api/professional/drawdown/{ticker}")
+@cached_route()
 def get_drawdown_analysis(ticker: str, period: str = Query(default="1y")):
     """Drawdown Analysis"""
     from ..services.crypto_data_service import crypto_service
     from ..services.professional_tools_service import professional_tools_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=())
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -1182,12 +1481,13 @@ def get_drawdown_analysis(ticker: str, period: str = Query(default="1y")):
 
 
 @app.get("/api/professional/win-rate/{ticker}")
+@cached_route()
 def get_win_rate_by_time(ticker: str, period: str = Query(default="1y")):
     """Win Rate by Day/Hour"""
     from ..services.crypto_data_service import crypto_service
     from ..services.professional_tools_service import professional_tools_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=())
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -1196,12 +1496,13 @@ def get_win_rate_by_time(ticker: str, period: str = Query(default="1y")):
 
 
 @app.get("/api/professional/confluence/{ticker}")
+@cached_route()
 def get_confluence_detector(ticker: str, period: str = Query(default="6mo")):
     """Confluence Detector"""
     from ..services.crypto_data_service import crypto_service
     from ..services.professional_tools_service import professional_tools_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=())
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -1210,12 +1511,13 @@ def get_confluence_detector(ticker: str, period: str = Query(default="6mo")):
 
 
 @app.get("/api/professional/reversal-probability/{ticker}")
+@cached_route()
 def get_reversal_probability(ticker: str, period: str = Query(default="3mo")):
     """Reversal Probability"""
     from ..services.crypto_data_service import crypto_service
     from ..services.professional_tools_service import professional_tools_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=())
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -1224,12 +1526,13 @@ def get_reversal_probability(ticker: str, period: str = Query(default="3mo")):
 
 
 @app.get("/api/professional/acceleration/{ticker}")
+@cached_route()
 def get_acceleration_indicator(ticker: str, period: str = Query(default="3mo")):
     """Acceleration Indicator"""
     from ..services.crypto_data_service import crypto_service
     from ..services.professional_tools_service import professional_tools_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=())
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -1238,12 +1541,13 @@ def get_acceleration_indicator(ticker: str, period: str = Query(default="3mo")):
 
 
 @app.get("/api/professional/volume-momentum/{ticker}")
+@cached_route()
 def get_volume_momentum(ticker: str, period: str = Query(default="3mo")):
     """Volume Momentum"""
     from ..services.crypto_data_service import crypto_service
     from ..services.professional_tools_service import professional_tools_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=())
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -1252,12 +1556,13 @@ def get_volume_momentum(ticker: str, period: str = Query(default="3mo")):
 
 
 @app.get("/api/professional/velocity/{ticker}")
+@cached_route()
 def get_price_velocity_gauge(ticker: str, period: str = Query(default="3mo")):
     """Price Velocity Gauge"""
     from ..services.crypto_data_service import crypto_service
     from ..services.professional_tools_service import professional_tools_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=())
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -1266,6 +1571,7 @@ def get_price_velocity_gauge(ticker: str, period: str = Query(default="3mo")):
 
 
 @app.get("/api/professional/position-sizing/{ticker}")
+@cached_route()
 def get_position_sizing(
     ticker: str,
     period: str = Query(default="3mo"),
@@ -1277,7 +1583,7 @@ def get_position_sizing(
     from ..services.crypto_data_service import crypto_service
     from ..services.professional_tools_service import professional_tools_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=())
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -1286,12 +1592,13 @@ def get_position_sizing(
 
 
 @app.get("/api/professional/risk-reward/{ticker}")
+@cached_route()
 def get_risk_reward_heatmap(ticker: str, period: str = Query(default="3mo")):
     """Risk/Reward Heatmap"""
     from ..services.crypto_data_service import crypto_service
     from ..services.professional_tools_service import professional_tools_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=())
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -1300,12 +1607,13 @@ def get_risk_reward_heatmap(ticker: str, period: str = Query(default="3mo")):
 
 
 @app.get("/api/professional/technical-setups/{ticker}")
+@cached_route()
 def get_technical_setups(ticker: str, period: str = Query(default="6mo")):
     """Technical Setup Finder"""
     from ..services.crypto_data_service import crypto_service
     from ..services.professional_tools_service import professional_tools_service
     
-    data = crypto_service.fetch_crypto_data(ticker, period)
+    data = crypto_service.fetch_crypto_data(ticker, period, indicators=())
     if data.empty:
         raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
     
@@ -1313,6 +1621,67 @@ def get_technical_setups(ticker: str, period: str = Query(default="6mo")):
     return {"ticker": ticker, **result}
 
 
+@app.get("/api/professional/bundle/{ticker}")
+@cached_route(uncached_fields=BUNDLE_TIMING_FIELDS)
+def get_professional_bundle(
+    ticker: str,
+    days: int = Query(default=30),
+    simulations: int = Query(default=1000),
+    account_size: float = Query(default=10000),
+    risk_pct: float = Query(default=2),
+    stop_loss_pct: float = Query(default=5),
+    parallel: bool = Query(default=False, description="Run the tools on a thread pool"),
+):
+    """All professional tools for a ticker in one request, with per-tool timings when computed"""
+    from ..services.crypto_data_service import crypto_service
+    from ..services.professional_tools_service import professional_tools_service as service
+    
+    # Tool -> (period, analysis), with the defaults of the individual endpoints
+    sections = {
+        "ichimoku": ("6mo", service.ichimoku_cloud),
+        "elliottWave": ("6mo", service.elliott_wave_counter),
+        "wyckoff": ("3mo", service.wyckoff_analysis),
+        "trendAlignment": ("6mo", service.trend_alignment_scanner),
+        "candlestickPatterns": ("3mo", service.candlestick_pattern_library),
+        "supportResistance": ("6mo", service.support_resistance_zones),
+        "monteCarlo": ("6mo", lambda data: service.monte_carlo_simulation(data, days, simulations)),
+        "calendar": ("2y", service.historical_performance_calendar),
+        "drawdown": ("1y", service.drawdown_analysis),
+        "winRate": ("1y", service.win_rate_by_time),
+        "confluence": ("6mo", service.confluence_detector),
+        "reversalProbability": ("3mo", service.reversal_probability),
+        "acceleration": ("3mo", service.acceleration_indicator),
+        "volumeMomentum": ("3mo", service.volume_momentum),
+        "velocity": ("3mo", service.price_velocity_gauge),
+        "positionSizing": ("3mo", lambda data: service.position_sizing_calculator(
+            data, account_size, risk_pct, stop_loss_pct)),
+        "riskReward": ("3mo", service.risk_reward_heatmap),
+        "technicalSetups": ("6mo", service.technical_setup_finder),
+    }
+    
+    # One fetch for the longest period (2y); the others are views of it
+    started = time.perf_counter()
+    frames = crypto_service.fetch_crypto_periods(
+        ticker, [period for period, _ in sections.values()], indicators=())
+    if all(frame.empty for frame in frames.values()):
+        raise HTTPException(status_code=404, detail=f"Crypto {ticker} not found")
+    fetch_ms = round((time.perf_counter() - started) * 1000, 1)
+    
+    def section(period, analysis):
+        return lambda: {"ticker": ticker, **analysis(frames[period])}
+    
+    results, errors, timings = _run_analyses(
+        {key: section(period, analysis) for key, (period, analysis) in sections.items()}, parallel)
+    return {
+        "ticker": ticker,
+        "tools": results,
+        "errors": errors,
+        "fetch_ms": fetch_ms,
+        "timings_ms": timings,
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
@@ -0,0 +1,111 @@
+"""
+Route Cache
+Declarative response caching for analysis endpoints
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import json
+import typing
+from typing import Callable, Iterable, Optional
+
+from starlette.requests import Request
+
+from .encoded_response import EncodedResponse, encode_response
+
+# Default TTL of cached analysis responses (seconds)
+ROUTE_CACHE_TTL = 300
+
+# Name of the Request parameter added to decorated handlers
+_REQUEST_PARAM = '_route_cache_request'
+
+
+def cached_route(ttl_seconds: int = ROUTE_CACHE_TTL, depends_on: Iterable[str] = (),
+                 stale_seconds: float = 0.0, uncached_fields: Iterable[str] = ()) -> Callable:
+    """
+    Cache a route's response in cache_service
+
+    The key is the handler name plus its normalized arguments (path and
+    query parameters with defaults applied), so /x/BTC-USD and
+    /x/BTC-USD?period=<default> share an entry. When the route takes a
+    `ticker`, the key also holds the version of that ticker's bars (and of
+    any `depends_on` tickers): a new or revised bar changes the key, and
+    the old entries are invalidated through their tags. Concurrent misses
+    compute once (see CacheService.get_or_compute()).
+
+    What is cached is the encoded response (see EncodedResponse): hits
+    send stored bytes, gzip-compressed when accepted, and answer
+    If-None-Match with 304. Fields that describe one computation rather
+    than the result (timings) can be named in `uncached_fields`: they are
+    kept out of the cached body and only sent with the response that
+    computed it, so hits never replay them.
+
+    Place it below the @app.get decorators:
+
+        @app.get("/api/professional/wyckoff/{ticker}")
+        @cached_route(ttl_seconds=900)
+        def get_wyckoff_analysis(ticker: str, period: str = Query(default="3mo")):
+
+    Args:
+        ttl_seconds: TTL of cached responses
+        depends_on: Other tickers whose bars the response is computed from
+        stale_seconds: Serve-stale window after the TTL
+        uncached_fields: Top-level payload fields sent only on the computing response
+    """
+    depends_on = tuple(depends_on)
+    uncached_fields = tuple(uncached_fields)
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        route = func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            from ..services.cache_service import cache_service
+            from ..services.crypto_data_service import crypto_service
+
+            request = kwargs.pop(_REQUEST_PARAM)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+
+            ticker: Optional[str] = params.get('ticker')
+            tickers = ([ticker] if ticker else []) + [dep for dep in depends_on if dep != ticker]
+            versions = {symbol: crypto_service.bar_version(symbol) for symbol in tickers}
+
+            key = "response:{}:{}:{}".format(
+                route,
+                json.dumps(params, sort_keys=True, default=str),
+                json.dumps(versions, sort_keys=True),
+            )
+
+            computed = {}
+
+            def compute() -> EncodedResponse:
+                payload = func(*args, **kwargs)
+                if uncached_fields and isinstance(payload, dict):
+                    payload = dict(payload)
+                    computed.update({field: payload.pop(field) for field in uncached_fields if field in payload})
+                return encode_response(payload)
+
+            encoded = cache_service.get_or_compute(
+                key, compute, ttl_seconds=ttl_seconds, stale_seconds=stale_seconds,
+                tags={'family': 'route', 'route': route, 'ticker': ticker},
+            )
+            return encoded.to_response(request, extra=dict(computed) or None)
+
+        # FastAPI reads this signature: the handler's own parameters (with
+        # annotations resolved, as they may be strings) plus the Request
+        hints = typing.get_type_hints(func)
+        parameters = [
+            parameter.replace(annotation=hints.get(name, parameter.annotation))
+            for name, parameter in signature.parameters.items()
+        ]
+        parameters.append(inspect.Parameter(_REQUEST_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Request))
+        wrapper.__signature__ = signature.replace(
+            parameters=parameters, return_annotation=hints.get('return', signature.return_annotation))
+        return wrapper
+
+    return decorator
@@ -9,6 +9,9 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Any, Tuple
 import logging
 
+from .indicators import IndicatorEvaluator
+from .universe_panel import UniversePanel
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,7 +32,7 @@ class AdvancedAnalysisService:
         
         # Encontra swing highs e lows
         close = data['Close'].values
-        rsi = data['RSI'].values if 'RSI' in data.columns else np.zeros(len(data))
+        rsi = IndicatorEvaluator(data)['RSI'].values
         
         for i in range(lookback, len(data) - lookback):
             # Swing High
@@ -151,12 +154,7 @@ class AdvancedAnalysisService:
         volume_ratio = current_volume / avg_volume if avg_volume > 0 else 1
         
         # ATR para medir volatilidade
-        high_low = data['High'] - data['Low']
-        high_close = np.abs(data['High'] - data['Close'].shift())
-        low_close = np.abs(data['Low'] - data['Close'].shift())
-        ranges = pd.concat([high_low, high_close, low_close], axis=1)
-        true_range = ranges.max(axis=1)
-        atr = true_range.rolling(14).mean().iloc[-1]
+        atr = IndicatorEvaluator(data)['atr_14'].iloc[-1]
         atr_percent = (atr / current_price) * 100
         
         # Detecta breakout
@@ -432,10 +430,11 @@ class AdvancedAnalysisService:
         if len(data) < 50:
             return {"setup_found": False}
         
+        ind = IndicatorEvaluator(data)
         current_price = data['Close'].iloc[-1]
-        sma_20 = data['Close'].rolling(20).mean().iloc[-1]
-        sma_50 = data['Close'].rolling(50).mean().iloc[-1]
-        rsi = data['RSI'].iloc[-1] if 'RSI' in data.columns else 50
+        sma_20 = ind['SMA_20'].iloc[-1]
+        sma_50 = ind['SMA_50'].iloc[-1]
+        rsi = ind['RSI'].iloc[-1]
         
         # Encontra swing low recente (últimos 10 dias)
         recent_low = data['Low'].iloc[-10:].min()
@@ -593,13 +592,7 @@ class AdvancedAnalysisService:
         
         # ATR
         if 'High' in data.columns and 'Low' in data.columns:
-            high_low = data['High'] - data['Low']
-            high_close = np.abs(data['High'] - data['Close'].shift())
-            low_close = np.abs(data['Low'] - data['Close'].shift())
-            ranges = pd.concat([high_low, high_close, low_close], axis=1)
-            true_range = ranges.max(axis=1)
-            atr = true_range.rolling(14).mean()
-            current_atr = atr.iloc[-1]
+            current_atr = IndicatorEvaluator(data)['atr_14'].iloc[-1]
             atr_percent = (current_atr / data['Close'].iloc[-1]) * 100
         else:
             current_atr = 0
@@ -917,7 +910,7 @@ class AdvancedAnalysisService:
                 signals.append({'indicator': 'Bollinger', 'signal': 'NEUTRAL', 'value': 'Within bands'})
         
         # Volume
-        avg_volume = data['Volume'].rolling(20).mean().iloc[-1]
+        avg_volume = IndicatorEvaluator(data)['Volume_SMA'].iloc[-1]
         current_volume = data['Volume'].iloc[-1]
         if current_volume > avg_volume * 1.5:
             # Volume confirma a direção do preço
@@ -971,8 +964,9 @@ class AdvancedAnalysisService:
             if len(data) < 20:
                 continue
             
+            ind = IndicatorEvaluator(data)
             current_price = data['Close'].iloc[-1]
-            rsi = data['RSI'].iloc[-1] if 'RSI' in data.columns else 50
+            rsi = ind['RSI'].iloc[-1]
             
             # MACD
             if 'MACD' in data.columns and 'Signal' in data.columns:
@@ -987,7 +981,7 @@ class AdvancedAnalysisService:
                 momentum = 0
             
             # Volume
-            avg_volume = data['Volume'].rolling(20).mean().iloc[-1]
+            avg_volume = ind['Volume_SMA'].iloc[-1]
             current_volume = data['Volume'].iloc[-1]
             volume_ratio = current_volume / avg_volume if avg_volume > 0 else 1
             volume_class = 'High' if volume_ratio > 1.5 else 'Med' if volume_ratio > 0.8 else 'Low'
@@ -1022,6 +1016,53 @@ class AdvancedAnalysisService:
         
         return comparison
     
+    @staticmethod
+    def compare_watchlist_panel(panel: UniversePanel) -> List[Dict[str, Any]]:
+        """
+        compare_watchlist para todas as cryptos de um painel de uma vez
+        (cada linha usa as próprias últimas barras, mesmo com históricos de tamanhos diferentes)
+        """
+        panel = panel.bar_aligned()
+        rows = np.flatnonzero(panel.counts >= 20)
+        close = panel.close[rows]
+        volume = panel.volume[rows]
+        
+        current_price = close[:, -1]
+        rsi = panel.rsi()[rows, -1]
+        if 'MACD' in panel and 'Signal' in panel:
+            macd_up = panel['MACD'][rows, -1] > panel['Signal'][rows, -1]
+            macd_signal = np.where(macd_up, '↑', '↓')
+        else:
+            macd_signal = np.full(len(rows), '-')
+        momentum = ((current_price / panel.ago(close, 19)) - 1) * 100
+        
+        avg_volume = volume[:, -20:].mean(axis=1)
+        volume_ratio = np.where(avg_volume > 0, volume[:, -1] / avg_volume, 1)
+        volume_class = np.where(volume_ratio > 1.5, 'High', np.where(volume_ratio > 0.8, 'Med', 'Low'))
+        
+        # Score técnico (simplificado)
+        score = (
+            50
+            + np.where(rsi < 30, 20, np.where(rsi > 70, -20, 0))
+            + np.where(macd_signal == '↑', 15, np.where(macd_signal == '↓', -15, 0))
+            + np.where(momentum > 0, 15, -15)
+        )
+        
+        comparison = [
+            {
+                'ticker': panel.tickers[row],
+                'price': round(float(current_price[i]), 2),
+                'rsi': round(float(rsi[i]), 1),
+                'macd_signal': str(macd_signal[i]),
+                'momentum': round(float(momentum[i]), 2),
+                'volume': str(volume_class[i]),
+                'score': max(0, min(100, int(score[i])))
+            }
+            for i, row in enumerate(rows)
+        ]
+        
+        return sorted(comparison, key=lambda x: x['score'], reverse=True)
+    
     # ============= 16. VISUAL TRADE PLANNER =============
     
     @staticmethod
@@ -1039,16 +1080,12 @@ class AdvancedAnalysisService:
         recent_high = data['High'].iloc[-20:].max()
         
         # Calcula ATR para stop loss
-        high_low = data['High'] - data['Low']
-        high_close = np.abs(data['High'] - data['Close'].shift())
-        low_close = np.abs(data['Low'] - data['Close'].shift())
-        ranges = pd.concat([high_low, high_close, low_close], axis=1)
-        true_range = ranges.max(axis=1)
-        atr = true_range.rolling(14).mean().iloc[-1]
+        ind = IndicatorEvaluator(data)
+        atr = ind['atr_14'].iloc[-1]
         
         # Determina direção baseado em tendência
-        sma_20 = data['Close'].rolling(20).mean().iloc[-1]
-        sma_50 = data['Close'].rolling(50).mean().iloc[-1] if len(data) >= 50 else sma_20
+        sma_20 = ind['SMA_20'].iloc[-1]
+        sma_50 = ind['SMA_50'].iloc[-1] if len(data) >= 50 else sma_20
         
         if sma_20 > sma_50:
             # Bullish setup
@@ -1111,7 +1148,7 @@ class AdvancedAnalysisService:
             change_24h = ((current_price - prev_price) / prev_price) * 100
             
             # Volume vs média
-            avg_volume = data['Volume'].rolling(20).mean().iloc[-1]
+            avg_volume = IndicatorEvaluator(data)['Volume_SMA'].iloc[-1]
             current_volume = data['Volume'].iloc[-1]
             volume_ratio = current_volume / avg_volume if avg_volume > 0 else 1
             
@@ -1137,6 +1174,42 @@ class AdvancedAnalysisService:
         
         return movers[:10]  # Top 10
     
+    @staticmethod
+    def fast_movers_scanner_panel(panel: UniversePanel) -> List[Dict[str, Any]]:
+        """
+        fast_movers_scanner para todas as cryptos de um painel de uma vez
+        (cada linha usa as próprias últimas barras, mesmo com históricos de tamanhos diferentes)
+        """
+        panel = panel.bar_aligned()
+        rows = np.flatnonzero(panel.counts >= 20)
+        close = panel.close[rows]
+        volume = panel.volume[rows]
+        
+        current_price = close[:, -1]
+        prev_price = close[:, -2]
+        change_24h = ((current_price - prev_price) / prev_price) * 100
+        
+        avg_volume = volume[:, -20:].mean(axis=1)
+        volume_ratio = np.where(avg_volume > 0, volume[:, -1] / avg_volume, 1)
+        momentum_5d = ((current_price / close[:, -5]) - 1) * 100
+        
+        # Critérios para "fast mover"
+        selected = np.flatnonzero((np.abs(change_24h) >= 5) & (volume_ratio >= 1.5))
+        movers = [
+            {
+                'ticker': panel.tickers[rows[i]],
+                'price': round(float(current_price[i]), 2),
+                'change_24h': round(float(change_24h[i]), 2),
+                'volume_ratio': round(float(volume_ratio[i]), 2),
+                'momentum_5d': round(float(momentum_5d[i]), 2),
+                'alert_level': 'HIGH' if abs(change_24h[i]) >= 10 else 'MEDIUM'
+            }
+            for i in selected
+        ]
+        
+        movers = sorted(movers, key=lambda x: abs(x['change_24h']), reverse=True)
+        return movers[:10]
+    
     # ============= 18. DCA SIMULATOR =============
     
     @staticmethod
@@ -1208,10 +1281,12 @@ class AdvancedAnalysisService:
         
         current_price = data['Close'].iloc[-1]
         
+        ind = IndicatorEvaluator(data)
+        
         # 1. Tendência
         if len(data) >= 50:
-            sma_20 = data['Close'].rolling(20).mean().iloc[-1]
-            sma_50 = data['Close'].rolling(50).mean().iloc[-1]
+            sma_20 = ind['SMA_20'].iloc[-1]
+            sma_50 = ind['SMA_50'].iloc[-1]
             
             if sma_20 > sma_50:
                 checks.append({'check': 'Trend', 'status': 'PASS', 'detail': 'Bullish (SMA20 > SMA50)'})
@@ -1231,7 +1306,7 @@ class AdvancedAnalysisService:
             total += 1
         
         # 3. Volume
-        avg_volume = data['Volume'].rolling(20).mean().iloc[-1]
+        avg_volume = ind['Volume_SMA'].iloc[-1]
         current_volume = data['Volume'].iloc[-1]
         if current_volume > avg_volume:
             checks.append({'check': 'Volume', 'status': 'PASS', 'detail': 'Above average'})
@@ -0,0 +1,134 @@
+"""
+Bar Store
+Persistent columnar OHLCV storage, one file per ticker
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import time
+import logging
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Directory holding one .npz file per ticker
+BAR_STORE_DIR = Path(os.getenv("BAR_STORE_DIR", "bar_store"))
+
+BAR_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+class BarStore:
+    """
+    On-disk bar store
+
+    Each ticker file holds contiguous float64 arrays (one per OHLCV column),
+    an int64 date index (UTC nanoseconds) and the time of the last provider
+    refresh.
+    """
+
+    def __init__(self, directory: Path = BAR_STORE_DIR):
+        self.directory = Path(directory)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _path(self, ticker: str) -> Path:
+        safe_name = ticker.upper().replace('/', '_').replace('\\', '_')
+        return self.directory / f"{safe_name}.npz"
+
+    def lock(self, ticker: str) -> threading.Lock:
+        """Return the lock guarding reads/writes of a ticker file"""
+        with self._locks_guard:
+            if ticker not in self._locks:
+                self._locks[ticker] = threading.Lock()
+            return self._locks[ticker]
+
+    def read(self, ticker: str) -> Tuple[Optional[pd.DataFrame], float]:
+        """
+        Read stored bars for a ticker
+
+        Returns:
+            (bars, fetched_at) - bars is None when nothing is stored yet
+        """
+        path = self._path(ticker)
+        if not path.exists():
+            return None, 0.0
+
+        try:
+            with np.load(path, allow_pickle=False) as stored:
+                index = pd.to_datetime(stored['dates'], unit='ns', utc=True)
+                tz = str(stored['tz'])
+                if tz and tz != 'UTC':
+                    index = index.tz_convert(tz)
+                data = pd.DataFrame(
+                    {column: stored[column] for column in BAR_COLUMNS},
+                    index=index,
+                )
+                fetched_at = float(stored['fetched_at'])
+        except Exception as e:
+            logger.error(f"Error reading bar store for {ticker}: {e}")
+            return None, 0.0
+
+        data.index.name = 'Date'
+        volume = data['Volume'].to_numpy()
+        if np.isfinite(volume).all():
+            data['Volume'] = volume.astype(np.int64)
+        return data, fetched_at
+
+    def write(self, ticker: str, data: pd.DataFrame, fetched_at: Optional[float] = None):
+        """Replace the stored bars for a ticker (atomic rename)"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        index = pd.DatetimeIndex(data.index)
+        tz = str(index.tz) if index.tz is not None else ''
+        dates = (index.tz_convert('UTC') if index.tz is not None else index).as_unit('ns').asi8
+
+        arrays = {
+            column: np.ascontiguousarray(data[column].to_numpy(dtype=np.float64))
+            for column in BAR_COLUMNS
+        }
+
+        path = self._path(ticker)
+        # A temp file of our own, so concurrent writers (other workers) never share one
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=f"{path.stem}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(
+                    f,
+                    dates=np.ascontiguousarray(dates, dtype=np.int64),
+                    tz=np.array(tz),
+                    fetched_at=np.array(fetched_at if fetched_at is not None else time.time()),
+                    **arrays,
+                )
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def merge(self, ticker: str, stored: Optional[pd.DataFrame], new_bars: pd.DataFrame) -> pd.DataFrame:
+        """
+        Append provider bars to the stored history and persist the result
+
+        Bars sharing a date with stored bars replace them, so a revised
+        (still forming) last bar is updated in place.
+        """
+        new_bars = new_bars[BAR_COLUMNS]
+        if stored is None or stored.empty:
+            merged = new_bars
+        elif new_bars.empty:
+            merged = stored
+        else:
+            if new_bars.index.tz is not None and stored.index.tz is not None:
+                new_bars = new_bars.tz_convert(stored.index.tz)
+            merged = pd.concat([stored[stored.index < new_bars.index[0]], new_bars])
+            merged = merged[~merged.index.duplicated(keep='last')]
+
+        merged = merged.sort_index()
+        self.write(ticker, merged)
+        return merged
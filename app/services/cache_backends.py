@@ -0,0 +1,314 @@
+"""
+Cache Backends
+Shared cache tiers that every worker process on a host can read and write
+"""
+
+from __future__ import annotations
+
+import pickle
+import socket
+import threading
+import time
+import uuid
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Iterable, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+class BackendEntry(NamedTuple):
+    value: Any
+    fresh_for: float  # Seconds until the entry goes stale (<= 0 when already stale)
+    serve_for: float  # Seconds until it can no longer be served at all
+    stored_at: float  # Wall-clock time it was written
+    tags: Tuple[Tuple[str, str], ...]
+
+
+class CacheBackend(ABC):
+    """
+    Shared tier under CacheService
+
+    Deadlines are wall-clock (time.time()) so they mean the same thing in
+    every process and across restarts. Leases let one process recompute a
+    key while the others wait for its result.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[BackendEntry]:
+        """Entry that can still be served (fresh or stale), else None"""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl_seconds: float, tags: Iterable[Tuple[str, str]] = (),
+            stale_seconds: float = 0.0, stored_at: Optional[float] = None):
+        """Store an entry (values that cannot be pickled are skipped)"""
+
+    @abstractmethod
+    def delete(self, key: str):
+        pass
+
+    @abstractmethod
+    def invalidate(self, tags: Iterable[Tuple[str, str]]) -> int:
+        """Delete the entries holding all the given tags"""
+
+    @abstractmethod
+    def clear(self, pattern: Optional[str] = None):
+        """Delete every entry, or those whose key contains `pattern`"""
+
+    @abstractmethod
+    def cleanup_expired(self) -> int:
+        pass
+
+    @abstractmethod
+    def count(self) -> int:
+        pass
+
+    @abstractmethod
+    def acquire_lease(self, key: str, seconds: float) -> Optional[str]:
+        """Claim the right to recompute key; returns a token, or None if another process holds it"""
+
+    @abstractmethod
+    def release_lease(self, key: str, token: str):
+        pass
+
+    def close(self):
+        pass
+
+
+# Compare-and-delete: release a lease only if it still holds our token
+RELEASE_LEASE_SCRIPT = (
+    "if redis.call('get', KEYS[1]) == ARGV[1] then "
+    "return redis.call('del', KEYS[1]) "
+    "else return 0 end"
+)
+
+
+class RespError(Exception):
+    """Error reply from a Redis-protocol server"""
+
+
+class RespConnection:
+    """Minimal Redis protocol (RESP2) client over TCP or a unix socket"""
+
+    def __init__(self, address: Any, family: int = socket.AF_INET, timeout: float = 5.0,
+                 database: Optional[str] = None):
+        """
+        Args:
+            database: Database index to SELECT on every (re)connect
+        """
+        self.address = address
+        self.family = family
+        self.timeout = timeout
+        self.database = database
+        self._sock: Optional[socket.socket] = None
+        self._reader = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        sock = socket.socket(self.family, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.address)
+        if self.family == socket.AF_INET:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._sock = sock
+        self._reader = sock.makefile('rb')
+        if self.database:
+            # A new connection starts on db 0
+            sock.sendall(self._encode(('SELECT', self.database)))
+            try:
+                self._read_reply()
+            except RespError:
+                self._disconnect()
+                raise
+
+    def _disconnect(self):
+        if self._sock is not None:
+            try:
+                self._reader.close()
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = self._reader = None
+
+    @staticmethod
+    def _encode(args: Tuple[Any, ...]) -> bytes:
+        parts = [b'*%d\r\n' % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode()
+            parts.append(b'$%d\r\n%s\r\n' % (len(arg), arg))
+        return b''.join(parts)
+
+    def _read_reply(self) -> Any:
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by cache server")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b'+':
+            return payload.decode()
+        if kind == b'-':
+            raise RespError(payload.decode())
+        if kind == b':':
+            return int(payload)
+        if kind == b'$':
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if kind == b'*':
+            length = int(payload)
+            if length < 0:
+                return None
+            return [self._read_reply() for _ in range(length)]
+        raise ConnectionError(f"Unexpected reply from cache server: {line!r}")
+
+    def execute(self, *args: Any) -> Any:
+        """Send one command and return its reply (reconnects once on a dropped connection)"""
+        request = self._encode(args)
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    self._sock.sendall(request)
+                    return self._read_reply()
+                except (ConnectionError, socket.timeout, OSError):
+                    self._disconnect()
+                    if attempt:
+                        raise
+
+    def close(self):
+        with self._lock:
+            self._disconnect()
+
+
+class RedisBackend(CacheBackend):
+    """
+    Cache entries in Redis, or in any server speaking its protocol
+
+    Each entry is one pickled string that Redis expires at the end of its
+    serve-stale window; tags are Redis sets of keys. Works with a real
+    Redis or with the bundled stand-in (python -m app.services.resp_server).
+
+    Entries are unpickled on read, so the server must be trusted: anyone who
+    can write to it can run code in the API. Keep it on localhost or a unix
+    socket (the bundled server does both by default), or behind Redis AUTH
+    on a private network.
+    """
+
+    PREFIX = 'crypto_viewer:'
+
+    def __init__(self, url: str):
+        """
+        Args:
+            url: redis://host:port[/db] or unix:///path/to/socket
+        """
+        parsed = urlparse(url)
+        if parsed.scheme == 'unix':
+            self.connection = RespConnection(parsed.path, family=socket.AF_UNIX)
+        else:
+            database = parsed.path.strip('/') or None
+            self.connection = RespConnection((parsed.hostname or '127.0.0.1', parsed.port or 6379),
+                                             database=database)
+
+    def _key(self, key: str) -> str:
+        return f"{self.PREFIX}v:{key}"
+
+    def _tag_key(self, tag: Tuple[str, str]) -> str:
+        return f"{self.PREFIX}t:{tag[0]}={tag[1]}"
+
+    def get(self, key: str) -> Optional[BackendEntry]:
+        blob = self.connection.execute('GET', self._key(key))
+        if blob is None:
+            return None
+        try:
+            stored = pickle.loads(blob)
+        except Exception as e:
+            logger.warning(f"Dropping unreadable cache entry {key}: {e}")
+            self.delete(key)
+            return None
+        now = time.time()
+        if stored['expires_at'] <= now:
+            return None
+        return BackendEntry(stored['value'], stored['fresh_until'] - now, stored['expires_at'] - now,
+                            stored['stored_at'], tuple(stored['tags']))
+
+    def set(self, key: str, value: Any, ttl_seconds: float, tags: Iterable[Tuple[str, str]] = (),
+            stale_seconds: float = 0.0, stored_at: Optional[float] = None):
+        tags = list(tags)
+        now = time.time()
+        serve_for = ttl_seconds + stale_seconds
+        try:
+            blob = pickle.dumps({
+                'value': value,
+                'fresh_until': now + ttl_seconds,
+                'expires_at': now + serve_for,
+                'stored_at': now if stored_at is None else stored_at,
+                'tags': tags,
+            }, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.debug(f"Not sharing {key}: {e}")
+            return
+
+        milliseconds = max(int(serve_for * 1000), 1)
+        self.connection.execute('SET', self._key(key), blob, 'PX', milliseconds)
+        for tag in tags:
+            tag_key = self._tag_key(tag)
+            self.connection.execute('SADD', tag_key, key)
+            # Keep the tag set at least as long as its newest member
+            if self.connection.execute('PTTL', tag_key) < milliseconds:
+                self.connection.execute('PEXPIRE', tag_key, milliseconds)
+
+    def delete(self, key: str):
+        self.connection.execute('DEL', self._key(key))
+
+    def invalidate(self, tags: Iterable[Tuple[str, str]]) -> int:
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        if not tag_keys:
+            return 0
+        keys = [member.decode() for member in self.connection.execute('SINTER', *tag_keys)]
+        if not keys:
+            return 0
+        removed = self.connection.execute('DEL', *[self._key(key) for key in keys])
+        for tag_key in tag_keys:
+            self.connection.execute('SREM', tag_key, *keys)
+        return removed
+
+    def _entry_keys(self) -> List[bytes]:
+        return self.connection.execute('KEYS', f"{self.PREFIX}v:*")
+
+    def clear(self, pattern: Optional[str] = None):
+        prefix = f"{self.PREFIX}v:".encode()
+        tag_keys = self.connection.execute('KEYS', f"{self.PREFIX}t:*")
+        keys = [key for key in self._entry_keys() if not pattern or pattern.encode() in key[len(prefix):]]
+        if not pattern:
+            keys += tag_keys
+        if keys:
+            self.connection.execute('DEL', *keys)
+        if pattern and keys:
+            # Tag sets hold bare keys; drop the cleared ones (emptied sets go away)
+            members = [key[len(prefix):] for key in keys]
+            for tag_key in tag_keys:
+                self.connection.execute('SREM', tag_key, *members)
+
+    def cleanup_expired(self) -> int:
+        # The server expires entries itself
+        return 0
+
+    def count(self) -> int:
+        return len(self._entry_keys())
+
+    def acquire_lease(self, key: str, seconds: float) -> Optional[str]:
+        token = uuid.uuid4().hex
+        reply = self.connection.execute('SET', f"{self.PREFIX}l:{key}", token, 'NX', 'PX',
+                                        max(int(seconds * 1000), 1))
+        return token if reply == 'OK' else None
+
+    def release_lease(self, key: str, token: str):
+        # One atomic step, so a lease that expired and was taken over is never deleted
+        self.connection.execute('EVAL', RELEASE_LEASE_SCRIPT, 1, f"{self.PREFIX}l:{key}", token)
+
+    def close(self):
+        self.connection.close()
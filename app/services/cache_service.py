@@ -3,62 +3,631 @@ Simple In-Memory Cache Service
 Caches results from heavy calls for a few minutes
 """
 
-from datetime import datetime, timedelta
-from typing import Any, Optional, Dict
+import os
+import sys
+import math
+import time
+import random
+import logging
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, Dict, FrozenSet, Set, Tuple
 import threading
 
+import numpy as np
+import pandas as pd
+
+from .cache_backends import BackendEntry, CacheBackend, RedisBackend
+from .disk_cache import CACHE_DISK_PATH, DiskCache
+
+logger = logging.getLogger(__name__)
+
+# Bounds of the in-memory cache: least recently used entries are evicted
+# once either limit is exceeded
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+CACHE_MAX_BYTES = int(float(os.getenv("CACHE_MAX_MB", "256")) * 1024 * 1024)
+
+# Seconds between background sweeps of expired entries
+CACHE_SWEEP_SECONDS = float(os.getenv("CACHE_SWEEP_SECONDS", "60"))
+
+# Threads recomputing stale entries in the background
+CACHE_REFRESH_WORKERS = int(os.getenv("CACHE_REFRESH_WORKERS", "4"))
+
+# Shared tier: "sqlite" (file at CACHE_DISK_PATH), "memory" (none), or a
+# Redis-protocol server as redis://host:port[/db] or unix:///path
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "sqlite")
+
+# Longest a worker waits for another process computing the same key
+CACHE_LEASE_SECONDS = float(os.getenv("CACHE_LEASE_SECONDS", "120"))
+
+# Counters kept per key family (see CacheService.stats())
+METRIC_COUNTERS = (
+    'hits',           # Fresh value served
+    'stale_hits',     # Value past its TTL (or being refreshed) served
+    'shared_hits',    # Entry promoted from the shared tier
+    'misses',         # Nothing servable; caller computed or got None
+    'sets',
+    'computes',       # get_or_compute() runs, foreground or background
+    'evictions',
+    'expirations',
+    'invalidations',
+)
+
+
+def _empty_metrics() -> Dict[str, float]:
+    return {**dict.fromkeys(METRIC_COUNTERS, 0), 'compute_seconds': 0.0, 'compute_seconds_max': 0.0}
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate memory held by a cached value, in bytes"""
+    size = 0
+    seen = set()
+    pending = [value]
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+
+        if isinstance(obj, (pd.DataFrame, pd.Series)):
+            usage = obj.memory_usage(deep=True)
+            size += int(usage.sum()) if isinstance(obj, pd.DataFrame) else int(usage)
+        elif isinstance(obj, np.ndarray):
+            size += obj.nbytes
+        elif isinstance(obj, dict):
+            size += sys.getsizeof(obj)
+            pending.extend(obj.keys())
+            pending.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            size += sys.getsizeof(obj)
+            pending.extend(obj)
+        elif hasattr(obj, '__dict__'):
+            size += sys.getsizeof(obj)
+            pending.extend(vars(obj).values())
+        else:
+            size += sys.getsizeof(obj)
+    return size
+
+
 class CacheService:
-    """Simple in-memory cache with TTL"""
-    
-    def __init__(self):
-        self._cache: Dict[str, Dict[str, Any]] = {}
+    """
+    In-memory cache with TTL and bounded size
+
+    Entries are kept in least-recently-used order. When the number of
+    entries or their approximate size goes over the configured limits, the
+    least recently used entries are evicted; a value larger than the whole
+    byte budget is not cached at all. Expired entries are dropped when
+    touched and by a background sweeper (see start_sweeper()).
+
+    Entries can carry tags (ticker, period, endpoint family...). A reverse
+    index maps each tag to its keys, so invalidate() only touches the
+    entries holding the given tags.
+
+    With a shared tier (a CacheBackend: SQLite file or Redis-protocol
+    server), every set() is also written to it and a memory miss falls back
+    to it, promoting the entry back into memory. Entries evicted from
+    memory stay there until they expire; restarted processes and the other
+    workers on the host serve them instead of recomputing.
+
+    get_or_compute() protects expensive keys from stampedes: one caller per
+    key recomputes while the others wait, or keep getting the previous
+    value while it is servable. Entries can also outlive their TTL by a
+    serve-stale window, during which they are returned at once while a
+    background refresh replaces them.
+
+    Hits, misses, evictions, expirations and compute times are counted per
+    key family (the 'family' tag, refined by the 'route' tag) and reported
+    by stats().
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, max_bytes: int = CACHE_MAX_BYTES,
+                 backend: Optional[CacheBackend] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.backend = backend
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # (tag name, value) -> keys of the entries carrying that tag
+        self._tag_index: Dict[Tuple[str, str], Set[str]] = {}
         self._lock = threading.Lock()
-    
-    def get(self, key: str) -> Optional[Any]:
-        """Retrieve value from cache"""
+        # Key -> lock held while that key is being recomputed
+        self._compute_locks: "weakref.WeakValueDictionary[str, threading.Lock]" = weakref.WeakValueDictionary()
+        self._bytes = 0
+        # Family -> counters (METRIC_COUNTERS plus compute time sum/max)
+        self._metrics: Dict[str, Dict[str, float]] = {}
+        self._refresh_pool: Optional[ThreadPoolExecutor] = None
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop_sweeper = threading.Event()
+
+    @staticmethod
+    def _normalize_tags(tags: Optional[Dict[str, Any]]) -> FrozenSet[Tuple[str, str]]:
+        if not tags:
+            return frozenset()
+        return frozenset((name, str(value)) for name, value in tags.items() if value is not None)
+
+    @staticmethod
+    def _family(tags: FrozenSet[Tuple[str, str]]) -> str:
+        """Metrics family of an entry: its 'family' tag, plus its 'route' tag if any"""
+        tags = dict(tags)
+        family = tags.get('family', 'other')
+        return f"{family}/{tags['route']}" if 'route' in tags else family
+
+    def _count(self, family: str, counter: str, amount: float = 1):
+        """Bump a family counter (lock held)"""
+        metrics = self._metrics.get(family)
+        if metrics is None:
+            metrics = self._metrics[family] = _empty_metrics()
+        metrics[counter] += amount
+
+    def _remove(self, key: str):
+        entry = self._cache.pop(key)
+        self._bytes -= entry['size']
+        for tag in entry['tags']:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+
+    def _store(self, key: str, value: Any, tags: FrozenSet[Tuple[str, str]], size: int,
+               ttl_seconds: float, stale_seconds: float = 0.0, stored_at: Optional[float] = None,
+               compute_time: float = 0.0) -> Optional[Dict[str, Any]]:
+        """Insert into the memory tier and evict down to the limits (lock held)"""
+        if key in self._cache:
+            self._remove(key)
+        if size > self.max_bytes:
+            logger.debug(f"Not caching {key} in memory: {size} bytes exceeds the cache limit")
+            return None
+
+        now = time.monotonic()
+        entry = {
+            'value': value,
+            'expires_at': now + ttl_seconds,
+            'stale_until': now + ttl_seconds + stale_seconds,
+            'stored_at': time.time() if stored_at is None else stored_at,
+            'size': size,
+            'tags': tags,
+            'family': self._family(tags),
+            'compute_time': compute_time,
+        }
+        self._cache[key] = entry
+        self._bytes += size
+        for tag in tags:
+            self._tag_index.setdefault(tag, set()).add(key)
+
+        while len(self._cache) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._cache))
+            self._count(self._cache[oldest]['family'], 'evictions')
+            self._remove(oldest)
+        return entry
+
+    def _entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Entry for a key that is fresh or still serviceable as stale
+
+        Falls back to the shared tier on a memory miss and promotes what it
+        finds back into memory.
+        """
         with self._lock:
-            if key in self._cache:
-                entry = self._cache[key]
-                if datetime.now() < entry['expires_at']:
-                    return entry['value']
-                else:
-                    # Expired, remove it
-                    del self._cache[key]
+            entry = self._cache.get(key)
+            if entry is not None:
+                if time.monotonic() < entry['stale_until']:
+                    self._cache.move_to_end(key)
+                    return entry
+                # Past its stale deadline, remove it
+                self._count(entry['family'], 'expirations')
+                self._remove(key)
+
+        stored = self._shared_get(key)
+        return self._promote(key, stored) if stored is not None else None
+
+    def _shared_get(self, key: str) -> Optional[BackendEntry]:
+        if self.backend is None:
             return None
-    
-    def set(self, key: str, value: Any, ttl_seconds: int = 300, ttl: int = None):
-        """Save value to cache with TTL (default 5 minutes)"""
+        try:
+            return self.backend.get(key)
+        except Exception as e:
+            logger.error(f"Error reading shared cache: {e}")
+            return None
+
+    def _promote(self, key: str, stored: BackendEntry) -> Dict[str, Any]:
+        """Copy a shared-tier entry into memory and return it"""
+        size = estimate_size(stored.value)
+        tags = frozenset(stored.tags)
+        with self._lock:
+            self._count(self._family(tags), 'shared_hits')
+            entry = self._store(key, stored.value, tags, size,
+                                stored.fresh_for, stored.serve_for - stored.fresh_for, stored.stored_at)
+        if entry is None:
+            # Too large for memory: serve the shared copy without promoting it
+            now = time.monotonic()
+            entry = {
+                'value': stored.value,
+                'expires_at': now + stored.fresh_for,
+                'stale_until': now + stored.serve_for,
+                'stored_at': stored.stored_at,
+                'family': self._family(tags),
+                'compute_time': 0.0,
+            }
+        return entry
+
+    def get(self, key: str, family: Optional[str] = None) -> Optional[Any]:
+        """
+        Retrieve value from cache (fresh entries only)
+
+        Args:
+            family: Metrics family to count a miss under (hits use the entry's tags)
+        """
+        entry = self._entry(key)
+        hit = entry is not None and time.monotonic() < entry['expires_at']
+        with self._lock:
+            if entry is not None:
+                family = entry['family']
+            self._count(family or 'other', 'hits' if hit else 'misses')
+        return entry['value'] if hit else None
+
+    def set(self, key: str, value: Any, ttl_seconds: int = 300, ttl: int = None,
+            tags: Optional[Dict[str, Any]] = None, stale_seconds: float = 0.0, compute_time: float = 0.0):
+        """
+        Save value to cache with TTL (default 5 minutes)
+
+        Args:
+            tags: Tag name -> value, e.g. {'family': 'screener', 'ticker': 'BTC-USD'}
+            stale_seconds: How long after the TTL get_or_compute() may still
+                serve the value while refreshing it
+            compute_time: Seconds it took to produce the value (drives early refresh)
+        """
         # Support both ttl_seconds and ttl parameter names
         if ttl is not None:
             ttl_seconds = ttl
-            
+
+        size = estimate_size(value)
+        tags = self._normalize_tags(tags)
+        stored_at = time.time()
         with self._lock:
-            self._cache[key] = {
-                'value': value,
-                'expires_at': datetime.now() + timedelta(seconds=ttl_seconds)
-            }
-    
+            self._count(self._family(tags), 'sets')
+            self._store(key, value, tags, size, ttl_seconds, stale_seconds, stored_at, compute_time)
+
+        if self.backend is not None:
+            try:
+                self.backend.set(key, value, ttl_seconds, tags, stale_seconds, stored_at)
+            except Exception as e:
+                logger.error(f"Error writing shared cache: {e}")
+
+    def _compute_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            lock = self._compute_locks.get(key)
+            if lock is None:
+                lock = self._compute_locks[key] = threading.Lock()
+            return lock
+
+    def _acquire_lease(self, key: str) -> Tuple[bool, Optional[str]]:
+        """
+        Claim key for recomputation across processes
+
+        Returns:
+            (acquired, token) - acquired is False when another process
+            holds the lease; without a shared tier (or if it fails) the
+            caller may always compute
+        """
+        if self.backend is None:
+            return True, None
+        try:
+            token = self.backend.acquire_lease(key, CACHE_LEASE_SECONDS)
+        except Exception as e:
+            logger.error(f"Error acquiring cache lease: {e}")
+            return True, None
+        return token is not None, token
+
+    def _release_lease(self, key: str, token: Optional[str]):
+        if token is None:
+            return
+        try:
+            self.backend.release_lease(key, token)
+        except Exception as e:
+            logger.error(f"Error releasing cache lease: {e}")
+
+    def _wait_for_shared(self, key: str, previous: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Poll the shared tier until another process stores a fresh value for key"""
+        deadline = time.monotonic() + CACHE_LEASE_SECONDS
+        delay = 0.05
+        while time.monotonic() < deadline:
+            time.sleep(delay)
+            delay = min(delay * 2, 1.0)
+            stored = self._shared_get(key)
+            if stored is not None and stored.fresh_for > 0 and (
+                previous is None or stored.stored_at > previous['stored_at']
+            ):
+                return self._promote(key, stored)
+        return None
+
+    def _compute_and_set(self, key: str, compute: Callable[[], Any], ttl_seconds: float,
+                         tags: Optional[Dict[str, Any]], stale_seconds: float) -> Any:
+        started = time.monotonic()
+        value = compute()
+        elapsed = time.monotonic() - started
+        with self._lock:
+            family = self._family(self._normalize_tags(tags))
+            self._count(family, 'computes')
+            self._count(family, 'compute_seconds', elapsed)
+            metrics = self._metrics[family]
+            metrics['compute_seconds_max'] = max(metrics['compute_seconds_max'], elapsed)
+        self.set(key, value, ttl_seconds=ttl_seconds, tags=tags, stale_seconds=stale_seconds,
+                 compute_time=elapsed)
+        return value
+
+    def _refresh_in_background(self, key: str, compute: Callable[[], Any], ttl_seconds: float,
+                               tags: Optional[Dict[str, Any]], stale_seconds: float):
+        """Recompute a key on the refresh pool unless a refresh is already running"""
+        lock = self._compute_lock(key)
+        if not lock.acquire(blocking=False):
+            return
+
+        def refresh():
+            try:
+                acquired, token = self._acquire_lease(key)
+                if not acquired:
+                    # Another process is refreshing it
+                    return
+                try:
+                    self._compute_and_set(key, compute, ttl_seconds, tags, stale_seconds)
+                finally:
+                    self._release_lease(key, token)
+            except Exception as e:
+                logger.error(f"Error refreshing cache entry {key}: {e}")
+            finally:
+                lock.release()
+
+        try:
+            with self._lock:
+                if self._refresh_pool is None:
+                    self._refresh_pool = ThreadPoolExecutor(max_workers=CACHE_REFRESH_WORKERS,
+                                                            thread_name_prefix="cache-refresh")
+                pool = self._refresh_pool
+            pool.submit(refresh)
+        except Exception:
+            lock.release()
+            raise
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any], ttl_seconds: int = 300,
+                       tags: Optional[Dict[str, Any]] = None, beta: float = 1.0,
+                       stale_seconds: float = 0.0, with_age: bool = False) -> Any:
+        """
+        Return the cached value for key, computing it at most once at a time
+
+        Only one caller per key runs compute(), across worker processes too
+        when there is a shared tier (through its leases). Callers arriving
+        meanwhile get the previous value while it is still servable (fresh,
+        or within the serve-stale window), and otherwise wait for the result
+        instead of computing it again.
+
+        Hot keys are refreshed early (probabilistic "XFetch"): a read close
+        to expiry recomputes with a probability that grows as expiry nears
+        and with how long the value took to compute, so popular keys
+        rarely expire cold. beta=0 disables early refresh.
+
+        With stale_seconds, an entry past its TTL is still served for that
+        long (stale-while-revalidate): the caller gets it immediately and
+        the refresh runs in the background, so no request waits on it.
+
+        Args:
+            key: Cache key
+            compute: Produces the value on a miss
+            ttl_seconds: TTL of computed values
+            tags: Tags of computed values (see set())
+            beta: Early refresh aggressiveness (1.0 = standard XFetch)
+            stale_seconds: Serve-stale window after the TTL
+            with_age: Return (value, age in seconds) instead of the value
+
+        Returns:
+            The value, or (value, age) with with_age
+        """
+        family = self._family(self._normalize_tags(tags))
+
+        def result(counter: str, value: Any, stored_at: Optional[float]) -> Any:
+            with self._lock:
+                self._count(family, counter)
+            if not with_age:
+                return value
+            return value, (0.0 if stored_at is None else max(time.time() - stored_at, 0.0))
+
+        entry = self._entry(key)
+        if entry is not None:
+            now = time.monotonic()
+            early = beta * entry['compute_time'] * -math.log(1.0 - random.random())
+            if now + early < entry['expires_at']:
+                return result('hits', entry['value'], entry['stored_at'])
+            if stale_seconds > 0 and now < entry['stale_until']:
+                self._refresh_in_background(key, compute, ttl_seconds, tags, stale_seconds)
+                return result('stale_hits', entry['value'], entry['stored_at'])
+
+        lock = self._compute_lock(key)
+        if entry is not None:
+            # Expired or due for early refresh: let a single caller recompute
+            if not lock.acquire(blocking=False):
+                return result('stale_hits', entry['value'], entry['stored_at'])
+        else:
+            lock.acquire()
+
+        try:
+            # Someone else may have stored a new value while we waited
+            current = self._entry(key)
+            if current is not None and current is not entry and time.monotonic() < current['expires_at']:
+                return result('hits', current['value'], current['stored_at'])
+
+            acquired, token = self._acquire_lease(key)
+            if not acquired:
+                # Another worker process is computing it: serve what we have, or wait for its result
+                if entry is not None:
+                    return result('stale_hits', entry['value'], entry['stored_at'])
+                shared = self._wait_for_shared(key, entry)
+                if shared is not None:
+                    return result('hits', shared['value'], shared['stored_at'])
+            try:
+                return result('misses', self._compute_and_set(key, compute, ttl_seconds, tags, stale_seconds), None)
+            finally:
+                self._release_lease(key, token)
+        finally:
+            lock.release()
+
     def clear(self, pattern: Optional[str] = None):
         """Clear cache (total or by pattern)"""
         with self._lock:
             if pattern:
                 keys_to_delete = [k for k in self._cache.keys() if pattern in k]
                 for key in keys_to_delete:
-                    del self._cache[key]
+                    self._remove(key)
             else:
                 self._cache.clear()
-    
-    def cleanup_expired(self):
-        """Remove expired entries"""
+                self._tag_index.clear()
+                self._bytes = 0
+        if self.backend is not None:
+            try:
+                self.backend.clear(pattern)
+            except Exception as e:
+                logger.error(f"Error clearing shared cache: {e}")
+
+    def invalidate(self, **tags: Any) -> int:
+        """
+        Remove every entry carrying all the given tags
+
+        Example: invalidate(ticker='BTC-USD') or invalidate(family='screener').
+        Costs O(entries holding the rarest tag), not O(all keys).
+
+        Returns:
+            Number of entries removed
+        """
+        tags = self._normalize_tags(tags)
+        if not tags:
+            return 0
+
         with self._lock:
-            now = datetime.now()
+            matches = [self._tag_index.get(tag, set()) for tag in tags]
+            matches.sort(key=len)
+            keys = matches[0].intersection(*matches[1:])
+            for key in keys:
+                self._count(self._cache[key]['family'], 'invalidations')
+                self._remove(key)
+        removed = len(keys)
+        if self.backend is not None:
+            # Entries are written through, so the shared tier also holds the memory ones
+            try:
+                removed = max(removed, self.backend.invalidate(tags))
+            except Exception as e:
+                logger.error(f"Error invalidating shared cache: {e}")
+        return removed
+
+    def cleanup_expired(self) -> int:
+        """Remove entries past their stale deadline, returning how many were removed"""
+        with self._lock:
+            now = time.monotonic()
             keys_to_delete = [
                 key for key, entry in self._cache.items()
-                if now >= entry['expires_at']
+                if now >= entry['stale_until']
             ]
             for key in keys_to_delete:
-                del self._cache[key]
+                self._count(self._cache[key]['family'], 'expirations')
+                self._remove(key)
+        if self.backend is not None:
+            try:
+                self.backend.cleanup_expired()
+            except Exception as e:
+                logger.error(f"Error cleaning up shared cache: {e}")
+        return len(keys_to_delete)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Current size plus per-family counters
+
+        Each family reports the METRIC_COUNTERS, its hit rate (fresh and
+        stale hits over all lookups), mean and max compute time, and the
+        entries, bytes and oldest entry age it holds in memory right now.
+        """
+        shared_entries = 0
+        if self.backend is not None:
+            try:
+                shared_entries = self.backend.count()
+            except Exception as e:
+                logger.error(f"Error counting shared cache entries: {e}")
+        now = time.time()
+        with self._lock:
+            families = {family: dict(metrics) for family, metrics in self._metrics.items()}
+            for entry in self._cache.values():
+                family = families.setdefault(entry['family'], _empty_metrics())
+                family['entries'] = family.get('entries', 0) + 1
+                family['bytes'] = family.get('bytes', 0) + entry['size']
+                family['oldest_age_seconds'] = max(family.get('oldest_age_seconds', 0.0), now - entry['stored_at'])
+            totals = {
+                counter: sum(metrics[counter] for metrics in families.values())
+                for counter in METRIC_COUNTERS
+            }
+            stats = {
+                'entries': len(self._cache),
+                'tags': len(self._tag_index),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'shared_entries': shared_entries,
+                **totals,
+            }
+
+        for metrics in families.values():
+            metrics.setdefault('entries', 0)
+            metrics.setdefault('bytes', 0)
+            metrics.setdefault('oldest_age_seconds', 0.0)
+            lookups = metrics['hits'] + metrics['stale_hits'] + metrics['misses']
+            metrics['hit_rate'] = (metrics['hits'] + metrics['stale_hits']) / lookups if lookups else None
+            metrics['mean_compute_seconds'] = (
+                metrics['compute_seconds'] / metrics['computes'] if metrics['computes'] else None
+            )
+        stats['families'] = dict(sorted(families.items()))
+        return stats
+
+    def start_sweeper(self, interval: float = CACHE_SWEEP_SECONDS):
+        """Start a daemon thread removing expired entries every `interval` seconds"""
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return
+        self._stop_sweeper.clear()
+
+        def sweep():
+            while not self._stop_sweeper.wait(interval):
+                try:
+                    self.cleanup_expired()
+                except Exception as e:
+                    logger.error(f"Error sweeping cache: {e}")
+
+        self._sweeper = threading.Thread(target=sweep, name="cache-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self):
+        """Stop the background sweeper"""
+        self._stop_sweeper.set()
+        if self._sweeper is not None:
+            self._sweeper.join()
+            self._sweeper = None
+
+
+def open_backend(spec: str = CACHE_BACKEND) -> Optional[CacheBackend]:
+    """
+    Build the shared tier named by spec (see CACHE_BACKEND)
+
+    Returns None (memory-only cache) for "memory", or when the backend
+    cannot be opened.
+    """
+    try:
+        if spec.startswith(('redis://', 'unix://')):
+            backend = RedisBackend(spec)
+            backend.count()  # Fail now rather than on the first request
+            return backend
+        if spec == 'sqlite' and CACHE_DISK_PATH:
+            return DiskCache(CACHE_DISK_PATH)
+        if spec not in ('memory', 'sqlite'):
+            logger.error(f"Unknown cache backend {spec}, using memory only")
+        return None
+    except Exception as e:
+        logger.error(f"Cache backend {spec} unavailable, using memory only: {e}")
+        return None
 
 
 # Global instance
-cache_service = CacheService()
+cache_service = CacheService(backend=open_backend())
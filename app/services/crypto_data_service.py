@@ -9,13 +9,29 @@ import yfinance as yf
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Any, Optional, Tuple
 import logging
+import threading
+import time
+import zlib
 from .technical_analysis_advanced import TechnicalAnalysisAdvanced, StockComparator
+from .bar_store import BarStore, BAR_COLUMNS
+from .indicators import INDICATORS, IndicatorFrame
+from .streaming_indicators import StreamingIndicators
+from .universe_panel import UniversePanel
 
 logger = logging.getLogger(__name__)
 
 
+class _InFlightFetch:
+    """A data fetch in progress that concurrent callers wait on"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: pd.DataFrame = pd.DataFrame()
+
+
 class CryptoDataService:
     """Service to fetch cryptocurrency data"""
     
@@ -78,33 +94,420 @@ class CryptoDataService:
         'Enterprise Blockchain': ['VET-USD', 'HBAR-USD', 'ALGO-USD', 'XLM-USD'],
     }
     
+    CRYPTO_NAMES = {
+        'BTC': 'Bitcoin',
+        'ETH': 'Ethereum',
+        'USDT': 'Tether',
+        'BNB': 'Binance Coin',
+        'SOL': 'Solana',
+        'XRP': 'Ripple',
+        'USDC': 'USD Coin',
+        'ADA': 'Cardano',
+        'DOGE': 'Dogecoin',
+        'TRX': 'TRON',
+        'AVAX': 'Avalanche',
+        'LINK': 'Chainlink',
+        'DOT': 'Polkadot',
+        'MATIC': 'Polygon',
+        'SHIB': 'Shiba Inu',
+        'LTC': 'Litecoin',
+        'BCH': 'Bitcoin Cash',
+        'UNI': 'Uniswap',
+        'ATOM': 'Cosmos',
+        'XLM': 'Stellar',
+    }
+    
+    # Periods served from the bar store, as offsets back from the last bar
+    PERIOD_OFFSETS = {
+        '1d': pd.DateOffset(days=1),
+        '5d': pd.DateOffset(days=5),
+        '1mo': pd.DateOffset(months=1),
+        '3mo': pd.DateOffset(months=3),
+        '6mo': pd.DateOffset(months=6),
+        '1y': pd.DateOffset(years=1),
+        '2y': pd.DateOffset(years=2),
+        '5y': pd.DateOffset(years=5),
+        '10y': pd.DateOffset(years=10),
+    }
+    
+    # Seconds before the stored history is checked again for new bars
+    BAR_REFRESH_SECONDS = 60
+    
+    # Tickers whose full history (with indicators) is kept in memory;
+    # large enough to hold the whole MAIN_CRYPTOS universe
+    MAX_CACHED_HISTORIES = 128
+    
     def __init__(self):
         self.cache: Dict[str, Any] = {}
+        self.bar_store = BarStore()
+        
+        # ticker -> {'frame': IndicatorFrame over the full history, 'checked_at': ts,
+        #            'stream': StreamingIndicators continuing the frame (or None),
+        #            'version': bar version of the frame (see bar_version())}
+        self._histories: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+        self._histories_lock = threading.Lock()
+        
+        # Single-flight: identical concurrent fetches share one download
+        self._inflight: Dict[Tuple[Any, ...], _InFlightFetch] = {}
+        self._inflight_lock = threading.Lock()
+        self._fetch_stats = {'fetches': 0, 'coalesced': 0}
         
-    def fetch_crypto_data(self, ticker: str, period: str = '1y') -> pd.DataFrame:
+    def fetch_crypto_data(
+        self,
+        ticker: str,
+        period: str = '1y',
+        interval: str = '1d',
+        indicators: Optional[Iterable[str]] = None,
+    ) -> pd.DataFrame:
         """
         Fetch historical cryptocurrency data
         
+        Daily history is served from the local bar store; the provider is
+        only asked for bars newer than the last stored one. Indicators are
+        computed once over the full history, on first request, and every
+        period is returned as a tail view of that frame. Concurrent calls
+        for the same (ticker, period, interval, indicators) wait on a single
+        fetch and share its DataFrame, so callers must not modify it in place.
+        
         Args:
             ticker: Crypto ticker (e.g., 'BTC-USD')
             period: Data period ('1d', '5d', '1mo', '3mo', '6mo', '1y', '2y', '5y', 'max')
+            interval: Bar interval ('1d', '1h', ...)
+            indicators: Indicator columns the caller reads (None = all,
+                        empty = OHLCV only). Columns computed earlier for
+                        the ticker may also be present.
         """
+        if indicators is not None:
+            indicators = tuple(sorted(set(indicators)))
+        
+        key = (ticker, period, interval, indicators)
+        with self._inflight_lock:
+            flight = self._inflight.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = self._inflight[key] = _InFlightFetch()
+                self._fetch_stats['fetches'] += 1
+            else:
+                self._fetch_stats['coalesced'] += 1
+        
+        if not is_leader:
+            flight.done.wait()
+            return flight.result
+        
         try:
-            crypto = yf.Ticker(ticker)
-            data = crypto.history(period=period)
+            flight.result = self._fetch_crypto_data(ticker, period, interval, indicators)
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+            flight.done.set()
+        
+        return flight.result
+    
+    def get_fetch_stats(self) -> Dict[str, int]:
+        """Return single-flight counters (fetches executed, calls coalesced)"""
+        with self._inflight_lock:
+            return {**self._fetch_stats, 'in_flight': len(self._inflight)}
+    
+    def _fetch_crypto_data(
+        self, ticker: str, period: str, interval: str, indicators: Optional[Tuple[str, ...]]
+    ) -> pd.DataFrame:
+        """Fetch and process historical data (no coalescing)"""
+        try:
+            if interval == '1d' and self._is_stored_period(period):
+                history = self._get_history(ticker)
+                data = self._slice_period(history.ensure(indicators), period) if history is not None else pd.DataFrame()
+            else:
+                data = yf.Ticker(ticker).history(period=period, interval=interval)
+                if not data.empty:
+                    # Add technical indicators
+                    data = IndicatorFrame(data).ensure(indicators)
             
             if data.empty:
                 logger.warning(f"No data for {ticker}")
                 return pd.DataFrame()
             
-            # Add technical indicators
-            data = self._calculate_indicators(data)
-            
             return data
         except Exception as e:
             logger.error(f"Error fetching {ticker}: {e}")
             return pd.DataFrame()
     
+    def _get_history(self, ticker: str) -> Optional[IndicatorFrame]:
+        """
+        Return the full daily history as an IndicatorFrame
+        
+        When the stored bars change by new (or a revised last) bar, the
+        ticker's streaming state extends the frame and its computed
+        indicators incrementally; any other change rebuilds the frame.
+        Returns None when no bars are available.
+        """
+        with self.bar_store.lock(ticker):
+            with self._histories_lock:
+                entry = self._histories.get(ticker)
+                if entry is not None:
+                    self._histories.move_to_end(ticker)
+            
+            if entry is not None and time.time() - entry['checked_at'] < self.BAR_REFRESH_SECONDS:
+                return entry['frame']
+            
+            bars = self._load_bars(ticker)
+            if bars.empty:
+                return None
+            
+            if entry is not None and self._same_bars(entry['frame'].frame, bars):
+                entry['checked_at'] = time.time()
+                return entry['frame']
+            
+            frame, stream = None, None
+            if entry is not None:
+                try:
+                    stream = entry['stream'] or StreamingIndicators(entry['frame'].frame)
+                    frame = stream.extend(entry['frame'], bars)
+                except Exception as e:
+                    logger.error(f"Error extending {ticker} indicators incrementally: {e}")
+            if frame is None:
+                frame, stream = IndicatorFrame(bars), None
+            
+            with self._histories_lock:
+                self._histories[ticker] = {
+                    'frame': frame,
+                    'checked_at': time.time(),
+                    'stream': stream,
+                    'version': self._bars_version(bars),
+                }
+                self._histories.move_to_end(ticker)
+                while len(self._histories) > self.MAX_CACHED_HISTORIES:
+                    self._histories.popitem(last=False)
+        
+        if entry is not None:
+            # New or revised bars: drop responses computed from the old ones
+            from .cache_service import cache_service
+            cache_service.invalidate(family='route', ticker=ticker)
+        return frame
+    
+    def bar_version(self, ticker: str) -> Optional[str]:
+        """
+        Identify the daily bars currently served for a ticker
+        
+        The version changes whenever a bar is added or the last bar is
+        revised, so results keyed on it never outlive the data they were
+        computed from. Returns None when the ticker has no bars.
+        """
+        try:
+            if self._get_history(ticker) is None:
+                return None
+        except Exception as e:
+            logger.error(f"Error loading {ticker} history: {e}")
+            return None
+        with self._histories_lock:
+            entry = self._histories.get(ticker)
+            return entry['version'] if entry is not None else None
+    
+    @staticmethod
+    def _bars_version(bars: pd.DataFrame) -> str:
+        """Bar count, last bar time and a checksum of the last bar's OHLCV"""
+        last = np.ascontiguousarray(bars[BAR_COLUMNS].iloc[-1].to_numpy(dtype=np.float64))
+        return f"{len(bars)}-{bars.index[-1].value}-{zlib.crc32(last.tobytes()):08x}"
+    
+    @staticmethod
+    def _same_bars(frame: pd.DataFrame, bars: pd.DataFrame) -> bool:
+        """Whether bars match the history a cached frame was computed from"""
+        return (
+            len(frame) == len(bars)
+            and frame.index[-1] == bars.index[-1]
+            and np.array_equal(
+                frame[BAR_COLUMNS].iloc[-1].to_numpy(dtype=float),
+                bars[BAR_COLUMNS].iloc[-1].to_numpy(dtype=float),
+                equal_nan=True,
+            )
+        )
+    
+    def _load_bars(self, ticker: str) -> pd.DataFrame:
+        """
+        Return the full daily OHLCV history, topping up the bar store if stale
+        
+        Callers must hold bar_store.lock(ticker).
+        """
+        stored, fetched_at = self.bar_store.read(ticker)
+        if stored is not None and time.time() - fetched_at < self.BAR_REFRESH_SECONDS:
+            return stored
+        
+        try:
+            crypto = yf.Ticker(ticker)
+            if stored is None or stored.empty:
+                new_bars = crypto.history(period='max')
+            else:
+                # Re-request the last stored bar too: it may still be forming
+                new_bars = crypto.history(start=stored.index[-1].strftime('%Y-%m-%d'))
+        except Exception as e:
+            if stored is None:
+                raise
+            logger.error(f"Error refreshing {ticker}, serving stored bars: {e}")
+            return stored
+        
+        if new_bars.empty:
+            if stored is None:
+                return pd.DataFrame()
+            # Nothing new; remember we checked
+            self.bar_store.write(ticker, stored)
+            return stored
+        
+        return self.bar_store.merge(ticker, stored, new_bars)
+    
+    def _prefetch_bars(self, tickers: List[str]):
+        """
+        Top up missing or stale bar-store entries for many tickers at once
+        
+        Missing histories are downloaded in one batch, stale ones in another
+        (starting at the oldest last stored bar), so a following
+        _get_history finds every ticker fresh without a per-ticker request.
+        """
+        now = time.time()
+        missing, stale = [], {}
+        for ticker in dict.fromkeys(tickers):
+            with self._histories_lock:
+                entry = self._histories.get(ticker)
+            if entry is not None and now - entry['checked_at'] < self.BAR_REFRESH_SECONDS:
+                continue
+            stored, fetched_at = self.bar_store.read(ticker)
+            if stored is None or stored.empty:
+                missing.append(ticker)
+            elif now - fetched_at >= self.BAR_REFRESH_SECONDS:
+                stale[ticker] = stored.index[-1]
+        
+        if missing:
+            self._download_into_store(missing, period='max')
+        if stale:
+            self._download_into_store(list(stale), start=min(stale.values()).strftime('%Y-%m-%d'))
+    
+    def _download_into_store(self, tickers: List[str], **kwargs):
+        """Download daily bars for many tickers and merge them into the bar store"""
+        try:
+            data = yf.download(tickers, interval='1d', group_by='column', ignore_tz=False,
+                               progress=False, **kwargs)
+        except Exception as e:
+            logger.error(f"Error prefetching {len(tickers)} histories: {e}")
+            return
+        
+        if data is None or data.empty:
+            return
+        
+        fields = {column: self._download_field(data, column, tickers) for column in BAR_COLUMNS}
+        if fields['Close'].index.tz is None:
+            fields = {column: values.tz_localize('UTC') for column, values in fields.items()}
+        
+        for ticker in tickers:
+            if ticker not in fields['Close'].columns:
+                continue
+            new_bars = pd.DataFrame({column: fields[column][ticker] for column in BAR_COLUMNS})
+            new_bars = new_bars.dropna(subset=['Close'])
+            
+            with self.bar_store.lock(ticker):
+                stored, _ = self.bar_store.read(ticker)
+                if stored is not None and not stored.empty:
+                    new_bars = new_bars[new_bars.index >= stored.index[-1]]
+                if new_bars.empty:
+                    if stored is not None:
+                        # Nothing new; remember we checked
+                        self.bar_store.write(ticker, stored)
+                    continue
+                self.bar_store.merge(ticker, stored, new_bars)
+    
+    def fetch_panel(
+        self,
+        tickers: List[str],
+        period: str = '1y',
+        indicators: Optional[Iterable[str]] = (),
+    ) -> UniversePanel:
+        """
+        Fetch daily history for many tickers as one date-aligned panel
+        
+        Args:
+            tickers: Crypto tickers (duplicates are ignored)
+            period: Period of history per ticker
+            indicators: Indicator columns to include as panel fields
+                        (None = all)
+        
+        Returns:
+            UniversePanel with a row per ticker that has data
+        """
+        tickers = list(dict.fromkeys(tickers))
+        if self._is_stored_period(period):
+            self._prefetch_bars(tickers)
+        
+        frames = {ticker: self.fetch_crypto_data(ticker, period, indicators=indicators) for ticker in tickers}
+        return UniversePanel.from_frames(frames, columns=INDICATORS if indicators is None else indicators)
+    
+    def fetch_crypto_periods(
+        self,
+        ticker: str,
+        periods: Iterable[str],
+        indicators: Optional[Iterable[str]] = None,
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch several periods of daily history with a single fetch
+
+        The longest period is fetched (with the union of the indicators)
+        and the others are cut from it as tail views, reading the same as
+        separate fetch_crypto_data() calls. Periods the bar store cannot
+        serve are fetched on their own.
+
+        Returns:
+            period -> DataFrame (empty when the ticker has no data)
+        """
+        periods = list(dict.fromkeys(periods))
+        stored = [period for period in periods if self._is_stored_period(period)]
+        frames = {period: self.fetch_crypto_data(ticker, period, indicators=indicators)
+                  for period in periods if period not in stored}
+        if stored:
+            longest = max(stored, key=self._period_span)
+            data = self.fetch_crypto_data(ticker, longest, indicators=indicators)
+            for period in stored:
+                frames[period] = data if period == longest else self._slice_period(data, period)
+        return frames
+
+    def _period_span(self, period: str) -> pd.Timedelta:
+        """Upper bound on the time a stored period covers, for ordering periods"""
+        if period == 'max':
+            return pd.Timedelta.max
+        if period == 'ytd':
+            # Shorter than a year, so 1y is fetched when both are asked for
+            return self._period_span('1y') - pd.Timedelta(days=1)
+        anchor = pd.Timestamp('2000-01-01')
+        return anchor - (anchor - self.PERIOD_OFFSETS[period])
+
+    def _is_stored_period(self, period: str) -> bool:
+        """Whether a period can be cut from the stored daily history"""
+        return period in self.PERIOD_OFFSETS or period in ('ytd', 'max')
+    
+    def _slice_period(self, data: pd.DataFrame, period: str) -> pd.DataFrame:
+        """
+        Return the bars covered by a yfinance-style period, anchored at the last bar
+        
+        The result is a tail view sharing memory with data. Cumulative
+        indicators (VWAP, OBV, A/D) are re-anchored to the first bar of the
+        period so they read the same as if only that period had been fetched.
+        """
+        if data.empty or period == 'max':
+            return data
+        
+        last = data.index[-1]
+        if period == 'ytd':
+            start = data.index.searchsorted(last.normalize().replace(month=1, day=1), side='left')
+        else:
+            start = data.index.searchsorted(last - self.PERIOD_OFFSETS[period], side='right')
+        
+        if start == 0:
+            return data
+        
+        view = data.iloc[start:].copy(deep=False)
+        if 'VWAP' in view.columns:
+            view['VWAP'] = TechnicalAnalysisAdvanced.calculate_vwap(view)
+        if 'OBV' in view.columns:
+            view['OBV'] = view['OBV'] - data['OBV'].iloc[start] + data['Volume'].iloc[start]
+        if 'AD' in view.columns:
+            view['AD'] = view['AD'] - data['AD'].iloc[start - 1]
+        return view
+    
     def fetch_crypto_info(self, ticker: str) -> Dict[str, Any]:
         """Fetch detailed cryptocurrency information"""
         try:
@@ -113,32 +516,10 @@ class CryptoDataService:
             
             # Get crypto name without -USD suffix
             crypto_name = ticker.replace('-USD', '')
-            name_map = {
-                'BTC': 'Bitcoin',
-                'ETH': 'Ethereum',
-                'USDT': 'Tether',
-                'BNB': 'Binance Coin',
-                'SOL': 'Solana',
-                'XRP': 'Ripple',
-                'USDC': 'USD Coin',
-                'ADA': 'Cardano',
-                'DOGE': 'Dogecoin',
-                'TRX': 'TRON',
-                'AVAX': 'Avalanche',
-                'LINK': 'Chainlink',
-                'DOT': 'Polkadot',
-                'MATIC': 'Polygon',
-                'SHIB': 'Shiba Inu',
-                'LTC': 'Litecoin',
-                'BCH': 'Bitcoin Cash',
-                'UNI': 'Uniswap',
-                'ATOM': 'Cosmos',
-                'XLM': 'Stellar',
-            }
             
             return {
                 'ticker': ticker,
-                'name': name_map.get(crypto_name, info.get('longName', crypto_name)),
+                'name': self.CRYPTO_NAMES.get(crypto_name, info.get('longName', crypto_name)),
                 'sector': self._get_crypto_category(ticker),
                 'current_price': info.get('regularMarketPrice', info.get('currentPrice', 0)),
                 'day_change': info.get('regularMarketChangePercent', 0),
@@ -161,6 +542,117 @@ class CryptoDataService:
                 return category
         return 'Other'
     
+    def fetch_quote_snapshot(self, tickers: List[str], with_supply: bool = False) -> pd.DataFrame:
+        """
+        Fetch a per-ticker quote snapshot for many cryptos in one batched download
+        
+        Args:
+            tickers: Crypto tickers (duplicates are ignored)
+            with_supply: Also look up circulating/total supply (cached for a day)
+                         so market cap can be derived; without it only supplies
+                         already cached are used
+        
+        Returns:
+            DataFrame indexed by ticker with the same fields as fetch_crypto_info
+        """
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return pd.DataFrame()
+        
+        try:
+            data = yf.download(tickers, period='1y', interval='1d', group_by='column', progress=False)
+        except Exception as e:
+            logger.error(f"Error fetching quote snapshot: {e}")
+            return pd.DataFrame()
+        
+        if data.empty:
+            return pd.DataFrame()
+        
+        close = self._download_field(data, 'Close', tickers)
+        high = self._download_field(data, 'High', tickers)
+        low = self._download_field(data, 'Low', tickers)
+        volume = self._download_field(data, 'Volume', tickers)
+        
+        static_info = self._fetch_static_info(tickers, fetch_missing=with_supply)
+        
+        rows = []
+        for ticker in tickers:
+            if ticker not in close.columns:
+                continue
+            closes = close[ticker].dropna()
+            if len(closes) < 2:
+                continue
+            
+            volumes = volume[ticker].dropna()
+            static = static_info.get(ticker, {})
+            crypto_name = ticker.replace('-USD', '')
+            current_price = float(closes.iloc[-1])
+            circulating_supply = static.get('circulating_supply') or 0
+            
+            rows.append({
+                'ticker': ticker,
+                'name': self.CRYPTO_NAMES.get(crypto_name, static.get('long_name') or crypto_name),
+                'sector': self._get_crypto_category(ticker),
+                'current_price': current_price,
+                'day_change': float((closes.iloc[-1] / closes.iloc[-2] - 1) * 100),
+                'volume': float(volumes.iloc[-1]) if len(volumes) else 0.0,
+                'market_cap': float(current_price * circulating_supply),
+                'circulating_supply': circulating_supply,
+                'total_supply': static.get('total_supply') or 0,
+                'week_52_low': float(low[ticker].min()),
+                'week_52_high': float(high[ticker].max()),
+                'avg_volume': float(volumes.iloc[-90:].mean()) if len(volumes) else 0.0,
+            })
+        
+        if not rows:
+            return pd.DataFrame()
+        return pd.DataFrame(rows, index=[row['ticker'] for row in rows])
+    
+    @staticmethod
+    def _download_field(data: pd.DataFrame, field: str, tickers: List[str]) -> pd.DataFrame:
+        """Return one OHLCV field of a yf.download result as a dates x tickers frame"""
+        if isinstance(data.columns, pd.MultiIndex):
+            return data[field]
+        return data[[field]].rename(columns={field: tickers[0]})
+    
+    def _fetch_static_info(self, tickers: List[str], fetch_missing: bool = True) -> Dict[str, Dict[str, Any]]:
+        """Slow-changing details (long name, supply), cached for a day per ticker"""
+        from concurrent.futures import ThreadPoolExecutor
+        from .cache_service import cache_service
+        
+        static_info = {}
+        missing = []
+        for ticker in tickers:
+            cached = cache_service.get(f"crypto_static_info_{ticker}", family='static_info')
+            if cached is not None:
+                static_info[ticker] = cached
+            else:
+                missing.append(ticker)
+        
+        if not fetch_missing or not missing:
+            return static_info
+        
+        def fetch(ticker: str) -> Dict[str, Any]:
+            try:
+                info = yf.Ticker(ticker).info
+            except Exception as e:
+                logger.error(f"Error fetching info for {ticker}: {e}")
+                return {}
+            static = {
+                'long_name': info.get('longName'),
+                'circulating_supply': info.get('circulatingSupply', 0),
+                'total_supply': info.get('totalSupply', 0),
+            }
+            cache_service.set(f"crypto_static_info_{ticker}", static, ttl_seconds=86400,
+                              tags={'family': 'static_info', 'ticker': ticker})
+            return static
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for ticker, static in zip(missing, executor.map(fetch, missing)):
+                static_info[ticker] = static
+        
+        return static_info
+    
     def fetch_realtime_quotes(self, tickers: List[str]) -> pd.DataFrame:
         """Fetch real-time quotes for multiple cryptocurrencies"""
         try:
@@ -173,6 +665,11 @@ class CryptoDataService:
     def fetch_bitcoin_index(self, period: str = '1y') -> pd.DataFrame:
         """Fetch Bitcoin (BTC) index data as main reference"""
         try:
+            if self._is_stored_period(period):
+                history = self._get_history('BTC-USD')
+                if history is None:
+                    return pd.DataFrame()
+                return self._slice_period(history.frame, period)
             btc = yf.Ticker('BTC-USD')
             data = btc.history(period=period)
             return data
@@ -184,13 +681,18 @@ class CryptoDataService:
         """Fetch category performance"""
         category_performance = {}
         
+        # Top 3 from each category, fetched in one batch
+        snapshot = self.fetch_quote_snapshot(
+            [ticker for tickers in self.CATEGORIES.values() for ticker in tickers[:3]]
+        )
+        
         for category, tickers in self.CATEGORIES.items():
             try:
-                changes = []
-                for ticker in tickers[:3]:  # Top 3 from each category
-                    info = self.fetch_crypto_info(ticker)
-                    if 'day_change' in info and info['day_change'] is not None:
-                        changes.append(info['day_change'])
+                changes = [
+                    snapshot.at[ticker, 'day_change']
+                    for ticker in tickers[:3]
+                    if ticker in snapshot.index
+                ]
                 
                 if changes:
                     category_performance[category] = np.mean(changes)
@@ -199,72 +701,12 @@ class CryptoDataService:
         
         return category_performance
     
-    def _calculate_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
-        """Calculate technical indicators"""
-        try:
-            # RSI (Relative Strength Index)
-            delta = data['Close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            data['RSI'] = 100 - (100 / (1 + rs))
-            
-            # Moving Averages
-            data['SMA_20'] = data['Close'].rolling(window=20).mean()
-            data['SMA_50'] = data['Close'].rolling(window=50).mean()
-            data['SMA_200'] = data['Close'].rolling(window=200).mean()
-            
-            # MACD
-            exp1 = data['Close'].ewm(span=12, adjust=False).mean()
-            exp2 = data['Close'].ewm(span=26, adjust=False).mean()
-            data['MACD'] = exp1 - exp2
-            data['Signal'] = data['MACD'].ewm(span=9, adjust=False).mean()
-            data['MACD_Histogram'] = data['MACD'] - data['Signal']
-            
-            # Bollinger Bands
-            data['BB_Middle'] = data['Close'].rolling(window=20).mean()
-            std = data['Close'].rolling(window=20).std()
-            data['BB_Upper'] = data['BB_Middle'] + (std * 2)
-            data['BB_Lower'] = data['BB_Middle'] - (std * 2)
-            
-            # Volatility (crypto markets are 24/7, so adjusted calculation)
-            data['Volatility'] = data['Close'].pct_change().rolling(window=20).std() * np.sqrt(365) * 100
-            
-            # Average Volume
-            data['Volume_SMA'] = data['Volume'].rolling(window=20).mean()
-            
-            # Advanced Indicators
-            data['VWAP'] = TechnicalAnalysisAdvanced.calculate_vwap(data)
-            data['OBV'] = TechnicalAnalysisAdvanced.calculate_obv(data)
-            data['MFI'] = TechnicalAnalysisAdvanced.calculate_mfi(data)
-            data['Force_Index'] = TechnicalAnalysisAdvanced.calculate_force_index(data)
-            data['AD'] = TechnicalAnalysisAdvanced.calculate_accumulation_distribution(data)
-            data['ROC'] = TechnicalAnalysisAdvanced.calculate_roc(data)
-            data['Momentum'] = TechnicalAnalysisAdvanced.calculate_momentum(data)
-            data['ADX'] = TechnicalAnalysisAdvanced.calculate_adx(data)
-            
-            # Detect Patterns
-            data['Doji'] = TechnicalAnalysisAdvanced.detect_doji(data)
-            data['Hammer'] = TechnicalAnalysisAdvanced.detect_hammer(data)
-            data['Bullish_Engulfing'] = TechnicalAnalysisAdvanced.detect_bullish_engulfing(data)
-            data['Bearish_Engulfing'] = TechnicalAnalysisAdvanced.detect_bearish_engulfing(data)
-            
-            return data
-        except Exception as e:
-            logger.error(f"Error calculating indicators: {e}")
-            return data
-    
     def get_main_cryptos(self) -> List[Dict[str, Any]]:
         """Return list of main cryptocurrencies with basic information"""
-        cryptos = []
-        for ticker in self.MAIN_CRYPTOS[:20]:  # Top 20
-            try:
-                info = self.fetch_crypto_info(ticker)
-                cryptos.append(info)
-            except Exception as e:
-                logger.error(f"Error fetching {ticker}: {e}")
-        
-        return cryptos
+        snapshot = self.fetch_quote_snapshot(self.MAIN_CRYPTOS[:20], with_supply=True)  # Top 20
+        if snapshot.empty:
+            return []
+        return snapshot.to_dict(orient='records')
     
     def fetch_change_ranking(self, limit: int = 20) -> List[Dict[str, Any]]:
         """Return cryptocurrency ranking by daily change (half gainers, half losers)"""
@@ -272,20 +714,15 @@ class CryptoDataService:
         
         # CACHE: avoid fetching 100+ cryptos every time (2 minutes)
         cache_key = f"crypto_ranking_raw_{limit}"
-        cached = cache_service.get(cache_key)
+        cached = cache_service.get(cache_key, family='ranking')
         if cached:
             logger.info("🚀 Crypto Ranking returned from CACHE!")
             return cached
         
-        logger.info(f"⏳ Fetching {len(self.MAIN_CRYPTOS)} cryptocurrencies (will take ~60s)...")
-        cryptos = []
-        for ticker in self.MAIN_CRYPTOS:
-            try:
-                info = self.fetch_crypto_info(ticker)
-                if 'day_change' in info and info['day_change'] is not None:
-                    cryptos.append(info)
-            except Exception as e:
-                logger.error(f"Error fetching {ticker}: {e}")
+        logger.info(f"⏳ Fetching {len(self.MAIN_CRYPTOS)} cryptocurrencies in one batch...")
+        # Supplies are cached for a day, so only a cold cache pays for the lookups
+        snapshot = self.fetch_quote_snapshot(self.MAIN_CRYPTOS, with_supply=True)
+        cryptos = snapshot.to_dict(orient='records') if not snapshot.empty else []
         
         # Sort by change (highest to lowest)
         sorted_cryptos = sorted(cryptos, key=lambda x: x.get('day_change', 0), reverse=True)
@@ -300,7 +737,7 @@ class CryptoDataService:
         result = top_gainers + top_losers
         
         # Cache for 2 minutes
-        cache_service.set(cache_key, result, ttl_seconds=120)
+        cache_service.set(cache_key, result, ttl_seconds=120, tags={'family': 'ranking'})
         logger.info(f"✅ Crypto Ranking of {len(result)} cryptos cached!")
         
         return result
@@ -308,6 +745,9 @@ class CryptoDataService:
     def calculate_correlations(self, tickers: List[str], period: str = '6mo') -> pd.DataFrame:
         """Calculate correlation matrix between cryptocurrencies"""
         try:
+            if self._is_stored_period(period):
+                return self.fetch_panel(tickers, period).correlations()
+            
             data = yf.download(tickers, period=period, progress=False)['Close']
             
             if isinstance(data, pd.Series):
@@ -0,0 +1,202 @@
+"""
+Disk Cache
+SQLite-backed second cache tier that survives process restarts
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+import logging
+from pathlib import Path
+from typing import Any, Iterable, Optional, Tuple
+
+from .cache_backends import BackendEntry, CacheBackend
+
+logger = logging.getLogger(__name__)
+
+# SQLite file backing the cache (empty = memory-only cache)
+CACHE_DISK_PATH = os.getenv("CACHE_DISK_PATH", "cache.sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires_at REAL NOT NULL,
+    fresh_until REAL,
+    stored_at REAL
+);
+CREATE TABLE IF NOT EXISTS tags (
+    name TEXT NOT NULL,
+    value TEXT NOT NULL,
+    key TEXT NOT NULL REFERENCES entries(key) ON DELETE CASCADE,
+    PRIMARY KEY (name, value, key)
+);
+CREATE TABLE IF NOT EXISTS leases (
+    key TEXT PRIMARY KEY,
+    token TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tags_by_key ON tags(key);
+CREATE INDEX IF NOT EXISTS entries_by_expiry ON entries(expires_at);
+"""
+
+
+class DiskCache(CacheBackend):
+    """
+    Pickled cache entries in a SQLite file
+
+    Every worker process opening the same file shares its entries (SQLite
+    handles the cross-process locking; WAL keeps readers from blocking).
+    Reading an entry unpickles it, so anyone who can write the file can run
+    code in the API: the file is created owner-only (0600) and must not be
+    shared with other users.
+
+    Deadlines are wall-clock (time.time()) so they stay meaningful across
+    restarts: fresh_until ends the TTL, expires_at the serve-stale window
+    after it. Tags are stored in their own indexed table, so invalidating
+    a tag only reads the rows holding it.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        if self.path.parent != Path('.'):
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._make_private()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(entries)")}
+        for column in ('fresh_until', 'stored_at'):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE entries ADD COLUMN {column} REAL")
+
+    def _make_private(self):
+        """Create the file owner-only (SQLite gives its -wal/-shm files the same mode)"""
+        try:
+            os.close(os.open(self.path, os.O_CREAT | os.O_RDWR, 0o600))
+            os.chmod(self.path, 0o600)
+        except OSError as e:
+            logger.warning(f"Could not make cache file {self.path} private: {e}")
+
+    def get(self, key: str) -> Optional[BackendEntry]:
+        """
+        Read an entry that can still be served (fresh or stale)
+
+        Returns:
+            The entry, or None when missing, expired or unreadable
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at, fresh_until, stored_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            blob, expires_at, fresh_until, stored_at = row
+            now = time.time()
+            if expires_at <= now:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+            tags = tuple(self._conn.execute("SELECT name, value FROM tags WHERE key = ?", (key,)))
+
+        fresh_until = expires_at if fresh_until is None else fresh_until
+        try:
+            return BackendEntry(pickle.loads(blob), fresh_until - now, expires_at - now,
+                             now if stored_at is None else stored_at, tags)
+        except Exception as e:
+            logger.warning(f"Dropping unreadable disk cache entry {key}: {e}")
+            self.delete(key)
+            return None
+
+    def set(self, key: str, value: Any, ttl_seconds: float, tags: Iterable[Tuple[str, str]] = (),
+            stale_seconds: float = 0.0, stored_at: Optional[float] = None):
+        """Store an entry (values that cannot be pickled are skipped)"""
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.debug(f"Not persisting {key}: {e}")
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, expires_at, fresh_until, stored_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, blob, now + ttl_seconds + stale_seconds, now + ttl_seconds,
+                     now if stored_at is None else stored_at),
+                )
+                self._conn.execute("DELETE FROM tags WHERE key = ?", (key,))
+                self._conn.executemany(
+                    "INSERT INTO tags (name, value, key) VALUES (?, ?, ?)",
+                    [(name, value, key) for name, value in tags],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def invalidate(self, tags: Iterable[Tuple[str, str]]) -> int:
+        """Delete the entries holding all the given tags"""
+        tags = list(tags)
+        if not tags:
+            return 0
+        query = " INTERSECT ".join(["SELECT key FROM tags WHERE name = ? AND value = ?"] * len(tags))
+        params = [part for tag in tags for part in tag]
+        with self._lock:
+            cursor = self._conn.execute(f"DELETE FROM entries WHERE key IN ({query})", params)
+            return cursor.rowcount
+
+    def clear(self, pattern: Optional[str] = None):
+        """Delete every entry, or those whose key contains `pattern`"""
+        with self._lock:
+            if pattern:
+                self._conn.execute("DELETE FROM entries WHERE instr(key, ?) > 0", (pattern,))
+            else:
+                self._conn.execute("DELETE FROM entries")
+
+    def cleanup_expired(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+            return cursor.rowcount
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def acquire_lease(self, key: str, seconds: float) -> Optional[str]:
+        token = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM leases WHERE key = ? AND expires_at <= ?", (key, now))
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO leases (key, token, expires_at) VALUES (?, ?, ?)",
+                    (key, token, now + seconds),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return token if cursor.rowcount == 1 else None
+
+    def release_lease(self, key: str, token: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM leases WHERE key = ? AND token = ?", (key, token))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,211 @@
+"""
+Indicator Registry
+Technical indicators declared as a dependency graph over shared intermediates,
+evaluated lazily and memoized per frame
+"""
+
+from __future__ import annotations
+
+import threading
+import logging
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .bar_store import BAR_COLUMNS
+from .technical_analysis_advanced import TechnicalAnalysisAdvanced
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class IndicatorSpec:
+    """One node of the indicator graph"""
+    name: str
+    inputs: Tuple[str, ...]
+    compute: Callable[['IndicatorEvaluator'], pd.Series]
+    column: bool = True  # False = shared intermediate, never exposed as a column
+
+
+# Node name -> spec, in registration order. Inputs must be OHLCV columns or
+# nodes registered earlier, which keeps the graph acyclic.
+REGISTRY: Dict[str, IndicatorSpec] = {}
+
+
+def register(name: str, inputs: Iterable[str], compute: Callable[['IndicatorEvaluator'], pd.Series],
+             column: bool = True):
+    """Add a node to the indicator graph"""
+    inputs = tuple(inputs)
+    for dep in inputs:
+        if dep not in BAR_COLUMNS and dep not in REGISTRY:
+            raise ValueError(f"Indicator {name} depends on unknown input {dep}")
+    REGISTRY[name] = IndicatorSpec(name, inputs, compute, column)
+
+
+# ----- Shared intermediates -----
+
+register('delta', ['Close'], lambda ev: ev['Close'].diff(), column=False)
+register('gain_14', ['delta'],
+         lambda ev: ev['delta'].where(ev['delta'] > 0, 0).rolling(window=14).mean(), column=False)
+register('loss_14', ['delta'],
+         lambda ev: (-ev['delta'].where(ev['delta'] < 0, 0)).rolling(window=14).mean(), column=False)
+register('returns', ['Close'], lambda ev: ev['Close'].pct_change(), column=False)
+register('close_std_20', ['Close'], lambda ev: ev['Close'].rolling(window=20).std(), column=False)
+register('ema_12', ['Close'], lambda ev: ev['Close'].ewm(span=12, adjust=False).mean(), column=False)
+register('ema_26', ['Close'], lambda ev: ev['Close'].ewm(span=26, adjust=False).mean(), column=False)
+register('typical_price', ['High', 'Low', 'Close'],
+         lambda ev: (ev['High'] + ev['Low'] + ev['Close']) / 3, column=False)
+register('true_range', ['High', 'Low', 'Close'],
+         lambda ev: TechnicalAnalysisAdvanced.calculate_true_range(ev.data), column=False)
+register('atr_14', ['true_range'], lambda ev: ev['true_range'].rolling(window=14).mean(), column=False)
+
+# ----- Indicator columns (order matches a fully computed frame) -----
+
+# RSI (Relative Strength Index)
+register('RSI', ['gain_14', 'loss_14'], lambda ev: 100 - (100 / (1 + ev['gain_14'] / ev['loss_14'])))
+
+# Moving Averages
+register('SMA_20', ['Close'], lambda ev: ev['Close'].rolling(window=20).mean())
+register('SMA_50', ['Close'], lambda ev: ev['Close'].rolling(window=50).mean())
+register('SMA_200', ['Close'], lambda ev: ev['Close'].rolling(window=200).mean())
+
+# MACD
+register('MACD', ['ema_12', 'ema_26'], lambda ev: ev['ema_12'] - ev['ema_26'])
+register('Signal', ['MACD'], lambda ev: ev['MACD'].ewm(span=9, adjust=False).mean())
+register('MACD_Histogram', ['MACD', 'Signal'], lambda ev: ev['MACD'] - ev['Signal'])
+
+# Bollinger Bands
+register('BB_Middle', ['SMA_20'], lambda ev: ev['SMA_20'])
+register('BB_Upper', ['BB_Middle', 'close_std_20'], lambda ev: ev['BB_Middle'] + (ev['close_std_20'] * 2))
+register('BB_Lower', ['BB_Middle', 'close_std_20'], lambda ev: ev['BB_Middle'] - (ev['close_std_20'] * 2))
+
+# Volatility (crypto markets are 24/7, so adjusted calculation)
+register('Volatility', ['returns'], lambda ev: ev['returns'].rolling(window=20).std() * np.sqrt(365) * 100)
+
+# Average Volume
+register('Volume_SMA', ['Volume'], lambda ev: ev['Volume'].rolling(window=20).mean())
+
+# Advanced Indicators
+register('VWAP', ['typical_price', 'Volume'],
+         lambda ev: TechnicalAnalysisAdvanced.calculate_vwap(ev.data, typical_price=ev['typical_price']))
+register('OBV', ['Close', 'Volume'], lambda ev: TechnicalAnalysisAdvanced.calculate_obv(ev.data))
+register('MFI', ['typical_price', 'Volume'],
+         lambda ev: TechnicalAnalysisAdvanced.calculate_mfi(ev.data, typical_price=ev['typical_price']))
+register('Force_Index', ['delta', 'Volume'],
+         lambda ev: TechnicalAnalysisAdvanced.calculate_force_index(ev.data, delta=ev['delta']))
+register('AD', ['High', 'Low', 'Close', 'Volume'],
+         lambda ev: TechnicalAnalysisAdvanced.calculate_accumulation_distribution(ev.data))
+register('ROC', ['Close'], lambda ev: TechnicalAnalysisAdvanced.calculate_roc(ev.data))
+register('Momentum', ['Close'], lambda ev: TechnicalAnalysisAdvanced.calculate_momentum(ev.data))
+register('ADX', ['High', 'Low', 'true_range'],
+         lambda ev: TechnicalAnalysisAdvanced.calculate_adx(ev.data, true_range=ev['true_range']))
+
+# Patterns
+register('Doji', ['Open', 'High', 'Low', 'Close'], lambda ev: TechnicalAnalysisAdvanced.detect_doji(ev.data))
+register('Hammer', ['Open', 'High', 'Low', 'Close'], lambda ev: TechnicalAnalysisAdvanced.detect_hammer(ev.data))
+register('Bullish_Engulfing', ['Open', 'Close'],
+         lambda ev: TechnicalAnalysisAdvanced.detect_bullish_engulfing(ev.data))
+register('Bearish_Engulfing', ['Open', 'Close'],
+         lambda ev: TechnicalAnalysisAdvanced.detect_bearish_engulfing(ev.data))
+
+# Every indicator column, in the column order of a fully computed frame
+INDICATORS: Tuple[str, ...] = tuple(name for name, spec in REGISTRY.items() if spec.column)
+
+
+class IndicatorEvaluator:
+    """
+    Evaluates registry nodes over one OHLCV frame
+
+    Each node is computed at most once: its inputs are resolved first and
+    every result is memoized, so intermediates like delta or true range are
+    shared by all indicators built on them. Columns already present on the
+    frame (raw OHLCV or indicators computed upstream) are used as-is.
+    """
+
+    def __init__(self, data: pd.DataFrame):
+        self.data = data
+        self._values: Dict[str, pd.Series] = {}
+
+    def __getitem__(self, name: str) -> pd.Series:
+        if name in self._values:
+            return self._values[name]
+        if name in self.data.columns:
+            return self.data[name]
+
+        spec = REGISTRY.get(name)
+        if spec is None:
+            raise KeyError(f"Unknown indicator: {name}")
+        for dep in spec.inputs:
+            self[dep]
+        value = spec.compute(self)
+        self._values[name] = value
+        return value
+
+
+class IndicatorFrame:
+    """
+    OHLCV frame with lazily computed indicator columns
+
+    Indicator columns are computed the first time they are requested
+    (through ensure() or item access) and kept for later callers. A frame
+    returned by .frame is never modified afterwards: new columns are
+    published together as a new frame, so DataFrames handed out earlier
+    stay valid while other threads request more columns.
+    """
+
+    def __init__(self, bars: pd.DataFrame, frame: Optional[pd.DataFrame] = None):
+        """
+        Args:
+            bars: OHLCV bars
+            frame: Bars with indicator columns already computed, if any
+        """
+        self._frame = bars if frame is None else frame
+        self._evaluator = IndicatorEvaluator(bars)
+        self._lock = threading.RLock()
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """Bars plus every indicator computed so far"""
+        return self._frame
+
+    def __getitem__(self, name: str) -> pd.Series:
+        frame = self._frame
+        if name in frame.columns:
+            return frame[name]
+        return self.ensure([name])[name]
+
+    def ensure(self, names: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Compute the given indicator columns if missing
+
+        Args:
+            names: Indicator columns needed (None = every known indicator)
+
+        Returns:
+            The frame including at least the requested columns; indicators
+            that fail to compute are logged and left out
+        """
+        names = list(INDICATORS) if names is None else list(names)
+        if all(name in self._frame.columns for name in names):
+            return self._frame
+
+        with self._lock:
+            computed = {}
+            for name in names:
+                if name in self._frame.columns or name in computed:
+                    continue
+                spec = REGISTRY.get(name)
+                if spec is None or not spec.column:
+                    logger.warning(f"Unknown indicator requested: {name}")
+                    continue
+                try:
+                    computed[name] = self._evaluator[name]
+                except Exception as e:
+                    logger.error(f"Error calculating {name}: {e}")
+
+            if computed:
+                # Publish all new columns at once, as a new frame
+                self._frame = pd.concat([self._frame, pd.DataFrame(computed, index=self._frame.index)], axis=1)
+            return self._frame
@@ -10,6 +10,9 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Any, Tuple
 import logging
 
+from .indicators import IndicatorEvaluator
+from .universe_panel import UniversePanel
+
 logger = logging.getLogger(__name__)
 
 
@@ -288,10 +291,11 @@ class ProfessionalToolsService:
         close = data['Close']
         
         # Multiple SMAs
-        sma20 = close.rolling(20).mean().iloc[-1]
-        sma50 = close.rolling(50).mean().iloc[-1]
+        ind = IndicatorEvaluator(data)
+        sma20 = ind['SMA_20'].iloc[-1]
+        sma50 = ind['SMA_50'].iloc[-1]
         sma100 = close.rolling(100).mean().iloc[-1] if len(data) >= 100 else sma50
-        sma200 = close.rolling(200).mean().iloc[-1] if len(data) >= 200 else sma100
+        sma200 = ind['SMA_200'].iloc[-1] if len(data) >= 200 else sma100
         
         current_price = close.iloc[-1]
         
@@ -411,6 +415,55 @@ class ProfessionalToolsService:
             "cold_sector": ranked[-1][0] if ranked else None
         }
     
+    @staticmethod
+    def sector_rotation_analysis_panel(panel: UniversePanel) -> Dict[str, Any]:
+        """
+        Sector rotation with one panel row per sector (each on its own bars)
+        """
+        panel = panel.bar_aligned()
+        rows = np.flatnonzero(panel.counts >= 5)
+        counts = panel.counts[rows]
+        close = panel.close[rows]
+        volume = panel.volume[rows]
+        
+        def perf(bars: int) -> np.ndarray:
+            past = panel.ago(close, bars)
+            return np.where(counts > bars, (close[:, -1] - past) / past * 100, 0)
+        
+        perf_1d, perf_7d, perf_30d = perf(1), perf(7), perf(30)
+        
+        # Volume trend
+        avg_volume_recent = volume[:, -5:].mean(axis=1)
+        avg_volume_older = avg_volume_recent
+        if volume.shape[1] >= 15:
+            avg_volume_older = np.where(counts >= 15, volume[:, -15:-5].mean(axis=1), avg_volume_recent)
+        
+        sectors = {}
+        for i, row in enumerate(rows):
+            if avg_volume_recent[i] > avg_volume_older[i] * 1.1:
+                volume_trend = "INCREASING"
+            elif avg_volume_recent[i] < avg_volume_older[i] * 0.9:
+                volume_trend = "DECREASING"
+            else:
+                volume_trend = "STABLE"
+            
+            sectors[panel.tickers[row]] = {
+                "perf_1d": round(float(perf_1d[i]), 2),
+                "perf_7d": round(float(perf_7d[i]), 2),
+                "perf_30d": round(float(perf_30d[i]), 2),
+                "volume_trend": volume_trend,
+                "score": round(float(perf_7d[i] * 0.5 + perf_30d[i] * 0.5), 2)
+            }
+        
+        ranked = sorted(sectors.items(), key=lambda x: x[1]['score'], reverse=True)
+        
+        return {
+            "sectors": sectors,
+            "rankings": [{"sector": name, **data} for name, data in ranked],
+            "hot_sector": ranked[0][0] if ranked else None,
+            "cold_sector": ranked[-1][0] if ranked else None
+        }
+    
     # ============= 8. CANDLESTICK PATTERN LIBRARY =============
     
     @staticmethod
@@ -833,9 +886,10 @@ class ProfessionalToolsService:
         current_price = close.iloc[-1]
         
         # Calculate key levels
-        sma20 = close.rolling(20).mean().iloc[-1]
-        sma50 = close.rolling(50).mean().iloc[-1]
-        sma200 = close.rolling(200).mean().iloc[-1] if len(data) >= 200 else sma50
+        ind = IndicatorEvaluator(data)
+        sma20 = ind['SMA_20'].iloc[-1]
+        sma50 = ind['SMA_50'].iloc[-1]
+        sma200 = ind['SMA_200'].iloc[-1] if len(data) >= 200 else sma50
         
         # Fibonacci levels
         high_52w = high.iloc[-252:].max() if len(high) >= 252 else high.max()
@@ -926,12 +980,10 @@ class ProfessionalToolsService:
         low = data['Low']
         volume = data['Volume']
         
+        ind = IndicatorEvaluator(data)
+        
         # RSI
-        delta = close.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
+        rsi = ind['RSI']
         current_rsi = rsi.iloc[-1]
         
         # Factors
@@ -959,7 +1011,7 @@ class ProfessionalToolsService:
             score += 15
         
         # Factor 3: Volume spike
-        avg_volume = volume.rolling(20).mean().iloc[-1]
+        avg_volume = ind['Volume_SMA'].iloc[-1]
         if volume.iloc[-1] > avg_volume * 1.5:
             factors.append({"name": "High volume", "weight": +10})
             score += 10
@@ -1193,15 +1245,7 @@ class ProfessionalToolsService:
             })
         
         # ATR-based stop
-        high = data['High']
-        low = data['Low']
-        close = data['Close']
-        
-        tr1 = high - low
-        tr2 = abs(high - close.shift())
-        tr3 = abs(low - close.shift())
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = tr.rolling(14).mean().iloc[-1]
+        atr = IndicatorEvaluator(data)['atr_14'].iloc[-1]
         
         atr_stop_distance = atr * 2
         atr_stop_price = current_price - atr_stop_distance
@@ -1284,11 +1328,7 @@ class ProfessionalToolsService:
             volume = data['Volume']
             
             # RSI
-            delta = close.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
+            rsi = IndicatorEvaluator(data)['RSI']
             
             # Check conditions
             passes = True
@@ -1316,6 +1356,39 @@ class ProfessionalToolsService:
             "conditions": conditions
         }
     
+    @staticmethod
+    def custom_screener_panel(panel: UniversePanel, conditions: Dict[str, Any]) -> Dict[str, Any]:
+        """Custom screener over every ticker of a panel at once (each on its own bars)"""
+        panel = panel.bar_aligned()
+        rows = np.flatnonzero(panel.counts >= 50)
+        rsi = panel.rsi()[rows, -1]
+        volume = panel.volume[rows]
+        volume_ratio = volume[:, -1] / np.nanmean(volume, axis=1) if len(rows) else np.zeros(0)
+        
+        passes = np.ones(len(rows), dtype=bool)
+        if 'rsi_min' in conditions:
+            passes &= ~(rsi < conditions['rsi_min'])
+        if 'rsi_max' in conditions:
+            passes &= ~(rsi > conditions['rsi_max'])
+        if 'volume_min' in conditions:
+            passes &= ~(volume_ratio < conditions['volume_min'])
+        
+        matches = [
+            {
+                'ticker': panel.tickers[rows[i]],
+                'price': float(panel.close[rows[i], -1]),
+                'rsi': round(float(rsi[i]), 2),
+                'volume_ratio': round(float(volume_ratio[i]), 2)
+            }
+            for i in np.flatnonzero(passes)
+        ]
+        
+        return {
+            "matches": matches,
+            "total": len(matches),
+            "conditions": conditions
+        }
+    
     @staticmethod
     def top_movers_matrix(data_dict: Dict[str, pd.DataFrame]) -> Dict[str, Any]:
         """Top movers across timeframes"""
@@ -1345,17 +1418,48 @@ class ProfessionalToolsService:
             "bottom_24h": sorted(results, key=lambda x: x['perf_24h'])[:5]
         }
     
+    @staticmethod
+    def top_movers_matrix_panel(panel: UniversePanel) -> Dict[str, Any]:
+        """Top movers across timeframes, every ticker of a panel at once (each on its own bars)"""
+        panel = panel.bar_aligned()
+        rows = np.flatnonzero(panel.counts >= 31)
+        close = panel.close[rows]
+        
+        def perf(bars: int) -> np.ndarray:
+            past = panel.ago(close, bars)
+            return (close[:, -1] - past) / past * 100
+        
+        perf_24h, perf_7d, perf_30d = perf(1), perf(7), perf(30)
+        results = [
+            {
+                'ticker': panel.tickers[row],
+                'price': float(close[i, -1]),
+                'perf_24h': round(float(perf_24h[i]), 2),
+                'perf_7d': round(float(perf_7d[i]), 2),
+                'perf_30d': round(float(perf_30d[i]), 2)
+            }
+            for i, row in enumerate(rows)
+        ]
+        
+        return {
+            "top_24h": sorted(results, key=lambda x: x['perf_24h'], reverse=True)[:5],
+            "top_7d": sorted(results, key=lambda x: x['perf_7d'], reverse=True)[:5],
+            "top_30d": sorted(results, key=lambda x: x['perf_30d'], reverse=True)[:5],
+            "bottom_24h": sorted(results, key=lambda x: x['perf_24h'])[:5]
+        }
+    
     @staticmethod
     def technical_setup_finder(data: pd.DataFrame) -> Dict[str, Any]:
         """Find technical setups"""
         close = data['Close']
         volume = data['Volume']
         
+        ind = IndicatorEvaluator(data)
         setups = []
         
         # Golden Cross
-        sma50 = close.rolling(50).mean()
-        sma200 = close.rolling(200).mean() if len(close) >= 200 else sma50
+        sma50 = ind['SMA_50']
+        sma200 = ind['SMA_200'] if len(close) >= 200 else sma50
         
         if len(sma50) >= 2 and len(sma200) >= 2:
             if sma50.iloc[-2] < sma200.iloc[-2] and sma50.iloc[-1] > sma200.iloc[-1]:
@@ -1366,11 +1470,7 @@ class ProfessionalToolsService:
                 })
         
         # RSI Oversold
-        delta = close.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
+        rsi = ind['RSI']
         
         if rsi.iloc[-1] < 30:
             setups.append({
@@ -1380,7 +1480,7 @@ class ProfessionalToolsService:
             })
         
         # Volume Breakout
-        avg_vol = volume.rolling(20).mean().iloc[-1]
+        avg_vol = ind['Volume_SMA'].iloc[-1]
         if volume.iloc[-1] > avg_vol * 2:
             setups.append({
                 "name": "Volume Spike",
@@ -0,0 +1,311 @@
+"""
+RESP Server
+Minimal in-memory Redis-protocol server: a local stand-in for Redis that
+lets several API workers share one cache without an external service
+
+Usage:
+    python -m app.services.resp_server --port 6380
+    python -m app.services.resp_server --unix /tmp/crypto-viewer-cache.sock
+
+Then start the API with CACHE_BACKEND=redis://127.0.0.1:6380 (or
+unix:///tmp/crypto-viewer-cache.sock). Only the commands RedisBackend uses
+are implemented, and EVAL only runs the scripts RedisBackend sends.
+
+The API unpickles what it reads from here, so the server is only for the
+workers of one host: TCP binds 127.0.0.1 by default and the unix socket is
+owner-only (0600). There is no authentication.
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import ipaddress
+import os
+import socketserver
+import threading
+import time
+import logging
+from typing import Any, Dict, List, Optional, Set, Union
+
+from .cache_backends import RELEASE_LEASE_SCRIPT
+
+logger = logging.getLogger(__name__)
+
+
+# Databases a client can SELECT (Redis' default)
+DATABASES = 16
+
+
+class RespStore:
+    """Strings and sets with optional expiry, as commands see them, in numbered databases"""
+
+    def __init__(self):
+        self._databases = [({}, {}) for _ in range(DATABASES)]
+        # The selected database's keys and deadlines (swapped in per command)
+        self._data: Dict[bytes, Union[bytes, Set[bytes]]] = {}
+        self._expires: Dict[bytes, float] = {}
+        self._lock = threading.Lock()
+
+    def _alive(self, key: bytes) -> bool:
+        """Whether key exists, dropping it if expired (lock held)"""
+        deadline = self._expires.get(key)
+        if deadline is not None and deadline <= time.monotonic():
+            self._data.pop(key, None)
+            del self._expires[key]
+        return key in self._data
+
+    def _set_members(self, key: bytes) -> Set[bytes]:
+        if not self._alive(key):
+            return set()
+        value = self._data[key]
+        if not isinstance(value, set):
+            raise ValueError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    @staticmethod
+    def database_index(arg: bytes) -> int:
+        """Validate the argument of SELECT"""
+        try:
+            index = int(arg)
+        except ValueError:
+            raise ValueError("ERR value is not an integer or out of range")
+        if not 0 <= index < DATABASES:
+            raise ValueError("ERR DB index is out of range")
+        return index
+
+    def execute(self, command: str, args: List[bytes], database: int = 0) -> Any:
+        with self._lock:
+            handler = getattr(self, f"_cmd_{command}", None)
+            if handler is None:
+                raise ValueError(f"ERR unknown command '{command}'")
+            self._data, self._expires = self._databases[database]
+            return handler(args)
+
+    def _cmd_ping(self, args):
+        return args[0] if args else 'PONG'
+
+    def _cmd_select(self, args):
+        # The connection handler tracks the selection; this only validates it
+        self.database_index(args[0])
+        return 'OK'
+
+    def _cmd_get(self, args):
+        key = args[0]
+        if not self._alive(key):
+            return None
+        value = self._data[key]
+        if isinstance(value, set):
+            raise ValueError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    def _cmd_set(self, args):
+        key, value, options = args[0], args[1], [arg.upper() for arg in args[2:]]
+        ttl: Optional[float] = None
+        if b'EX' in options:
+            ttl = float(args[2 + options.index(b'EX') + 1])
+        if b'PX' in options:
+            ttl = float(args[2 + options.index(b'PX') + 1]) / 1000
+        if b'NX' in options and self._alive(key):
+            return None
+        self._data[key] = value
+        if ttl is not None:
+            self._expires[key] = time.monotonic() + ttl
+        else:
+            self._expires.pop(key, None)
+        return 'OK'
+
+    def _cmd_del(self, args):
+        removed = 0
+        for key in args:
+            if self._alive(key):
+                del self._data[key]
+                self._expires.pop(key, None)
+                removed += 1
+        return removed
+
+    def _cmd_exists(self, args):
+        return sum(1 for key in args if self._alive(key))
+
+    def _cmd_sadd(self, args):
+        key = args[0]
+        members = self._set_members(key)
+        if key not in self._data:
+            self._data[key] = members
+        before = len(members)
+        members.update(args[1:])
+        return len(members) - before
+
+    def _cmd_srem(self, args):
+        members = self._set_members(args[0])
+        before = len(members)
+        members.difference_update(args[1:])
+        if not members:
+            # Like Redis, an emptied set no longer exists
+            self._cmd_del(args[:1])
+        return before - len(members)
+
+    def _cmd_smembers(self, args):
+        return sorted(self._set_members(args[0]))
+
+    def _cmd_sinter(self, args):
+        sets = [self._set_members(key) for key in args]
+        return sorted(set.intersection(*sets)) if sets else []
+
+    def _cmd_pexpire(self, args):
+        key = args[0]
+        if not self._alive(key):
+            return 0
+        self._expires[key] = time.monotonic() + int(args[1]) / 1000
+        return 1
+
+    def _cmd_expire(self, args):
+        return self._cmd_pexpire([args[0], str(int(args[1]) * 1000).encode()])
+
+    def _cmd_pttl(self, args):
+        key = args[0]
+        if not self._alive(key):
+            return -2
+        deadline = self._expires.get(key)
+        return -1 if deadline is None else int((deadline - time.monotonic()) * 1000)
+
+    def _cmd_keys(self, args):
+        pattern = args[0].decode()
+        return [key for key in list(self._data) if self._alive(key) and fnmatch.fnmatchcase(key.decode(), pattern)]
+
+    def _cmd_dbsize(self, args):
+        return sum(1 for key in list(self._data) if self._alive(key))
+
+    def _cmd_eval(self, args):
+        script, numkeys = args[0].decode(), int(args[1])
+        keys, argv = args[2:2 + numkeys], args[2 + numkeys:]
+        if script == RELEASE_LEASE_SCRIPT:
+            if self._cmd_get(keys[:1]) == argv[0]:
+                return self._cmd_del(keys[:1])
+            return 0
+        raise ValueError("ERR only the cache's own scripts can be evaluated")
+
+    def _cmd_flushdb(self, args):
+        self._data.clear()
+        self._expires.clear()
+        return 'OK'
+
+    def purge_expired(self):
+        with self._lock:
+            for self._data, self._expires in self._databases:
+                for key in list(self._expires):
+                    self._alive(key)
+
+
+def _encode(reply: Any) -> bytes:
+    if reply is None:
+        return b'$-1\r\n'
+    if isinstance(reply, str):
+        return b'+%s\r\n' % reply.encode()
+    if isinstance(reply, int):
+        return b':%d\r\n' % reply
+    if isinstance(reply, bytes):
+        return b'$%d\r\n%s\r\n' % (len(reply), reply)
+    if isinstance(reply, list):
+        return b'*%d\r\n' % len(reply) + b''.join(_encode(item) for item in reply)
+    raise TypeError(f"Cannot encode {type(reply)}")
+
+
+class _RespHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        store: RespStore = self.server.store
+        database = 0
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            if not line.startswith(b'*'):
+                self.wfile.write(b'-ERR inline commands are not supported\r\n')
+                return
+            args = []
+            for _ in range(int(line[1:-2])):
+                length = int(self.rfile.readline()[1:-2])
+                args.append(self.rfile.read(length + 2)[:-2])
+            command = args[0].decode().lower()
+            if command == 'quit':
+                self.wfile.write(b'+OK\r\n')
+                return
+            try:
+                reply = _encode(store.execute(command, args[1:], database))
+                if command == 'select':
+                    database = store.database_index(args[1])
+            except Exception as e:
+                message = str(e)
+                reply = b'-%s\r\n' % (message if message[:3].isupper() else f"ERR {message}").encode()
+            self.wfile.write(reply)
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, 'ThreadingUnixStreamServer'):
+    class _UnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+
+def _is_loopback(host: str) -> bool:
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def make_server(host: str = '127.0.0.1', port: int = 6380, unix_path: Optional[str] = None) -> socketserver.BaseServer:
+    """Create a server (not yet serving); call serve_forever() on it"""
+    if unix_path:
+        if os.path.exists(unix_path):
+            os.remove(unix_path)
+        server = _UnixServer(unix_path, _RespHandler)
+        os.chmod(unix_path, 0o600)
+    else:
+        if not _is_loopback(host):
+            logger.warning(f"Cache server listening on {host}: any client that can reach it can run code in the API")
+        server = _TCPServer((host, port), _RespHandler)
+    server.store = RespStore()
+    return server
+
+
+def serve_in_background(host: str = '127.0.0.1', port: int = 6380,
+                        unix_path: Optional[str] = None) -> socketserver.BaseServer:
+    """Start a server on a daemon thread (call shutdown() to stop it)"""
+    server = make_server(host, port, unix_path)
+    threading.Thread(target=server.serve_forever, name="resp-server", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Redis-protocol cache server")
+    parser.add_argument('--host', default='127.0.0.1', help="Keep this a loopback address (no authentication)")
+    parser.add_argument('--port', type=int, default=6380)
+    parser.add_argument('--unix', help="Listen on this unix socket instead of TCP")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = make_server(args.host, args.port, args.unix)
+
+    def purge():
+        while True:
+            time.sleep(60)
+            server.store.purge_expired()
+
+    threading.Thread(target=purge, daemon=True).start()
+    logger.info(f"Cache server listening on {args.unix or f'{args.host}:{args.port}'}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
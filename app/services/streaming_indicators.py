@@ -0,0 +1,332 @@
+"""
+Streaming Indicators
+Incremental indicator state, updated bar by bar as new bars arrive
+"""
+
+from __future__ import annotations
+
+import copy
+import math
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Deque, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .bar_store import BAR_COLUMNS
+from .indicators import INDICATORS, IndicatorEvaluator, IndicatorFrame
+
+logger = logging.getLogger(__name__)
+
+NAN = float('nan')
+
+# Longest look-back of any indicator (SMA_200); enough to rebuild every window
+WARMUP_BARS = 256
+
+
+def _div(a: float, b: float) -> float:
+    """Division with pandas semantics (x/0 -> inf, 0/0 -> nan)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return float(np.float64(a) / np.float64(b))
+
+
+def _window_sum(values: Deque[float], window: int) -> float:
+    """Sum of the last `window` values (NaN until the window is full)"""
+    if len(values) < window:
+        return NAN
+    return sum(islice(reversed(values), window))
+
+
+def _window_mean(values: Deque[float], window: int) -> float:
+    return _window_sum(values, window) / window
+
+
+def _window_std(values: Deque[float], window: int) -> float:
+    """Sample standard deviation of the last `window` values"""
+    if len(values) < window:
+        return NAN
+    window_values = list(islice(reversed(values), window))
+    mean = sum(window_values) / window
+    if mean != mean:
+        return NAN
+    return math.sqrt(sum((x - mean) ** 2 for x in window_values) / (window - 1))
+
+
+class _EWM:
+    """
+    ewm(span=..., adjust=False).mean() one observation at a time
+
+    Mirrors the pandas recursion step for step (including NaN gaps), so a
+    state seeded from a batch value continues that series exactly.
+    """
+
+    def __init__(self, span: int):
+        com = (span - 1) / 2.0
+        self.alpha = 1.0 / (1.0 + com)
+        self.old_wt_factor = 1.0 - self.alpha
+        self.weighted = NAN
+        self.old_wt = 1.0
+
+    def seed(self, inputs: pd.Series, outputs: pd.Series, position: int):
+        """Take the state the batch recursion had after `position`"""
+        self.weighted = float(outputs.iloc[position])
+        self.old_wt = 1.0
+        if self.weighted == self.weighted:
+            values = inputs.to_numpy(dtype=float)[:position + 1]
+            trailing_gaps = len(values) - 1 - np.flatnonzero(~np.isnan(values))[-1]
+            self.old_wt = self.old_wt_factor ** int(trailing_gaps)
+
+    def update(self, x: float) -> float:
+        if self.weighted == self.weighted:
+            self.old_wt *= self.old_wt_factor
+            if x == x:
+                if self.weighted != x:
+                    self.weighted = (self.old_wt * self.weighted + self.alpha * x) / (self.old_wt + self.alpha)
+                self.old_wt = 1.0
+        elif x == x:
+            self.weighted = x
+        return self.weighted
+
+
+@dataclass
+class _StreamState:
+    """Everything needed to compute the indicators of the next bar"""
+    prev: Optional[Dict[str, float]] = None
+    closes: Deque[float] = field(default_factory=lambda: deque(maxlen=201))
+    gains: Deque[float] = field(default_factory=lambda: deque(maxlen=14))
+    losses: Deque[float] = field(default_factory=lambda: deque(maxlen=14))
+    returns: Deque[float] = field(default_factory=lambda: deque(maxlen=20))
+    volumes: Deque[float] = field(default_factory=lambda: deque(maxlen=20))
+    positive_flow: Deque[float] = field(default_factory=lambda: deque(maxlen=14))
+    negative_flow: Deque[float] = field(default_factory=lambda: deque(maxlen=14))
+    true_range: Deque[float] = field(default_factory=lambda: deque(maxlen=14))
+    plus_dm: Deque[float] = field(default_factory=lambda: deque(maxlen=14))
+    minus_dm: Deque[float] = field(default_factory=lambda: deque(maxlen=14))
+    dx: Deque[float] = field(default_factory=lambda: deque(maxlen=14))
+    ema_12: _EWM = field(default_factory=lambda: _EWM(12))
+    ema_26: _EWM = field(default_factory=lambda: _EWM(26))
+    signal: _EWM = field(default_factory=lambda: _EWM(9))
+    force: _EWM = field(default_factory=lambda: _EWM(13))
+    obv: float = NAN
+    cum_pv: float = 0.0
+    cum_volume: float = 0.0
+    ad: float = 0.0
+    length: int = 0
+
+
+class StreamingIndicators:
+    """
+    Per-ticker incremental indicator engine
+
+    Keeps EMA accumulators, fixed-size window buffers and cumulative sums
+    for one history, so each appended bar costs a constant amount of work
+    regardless of history length. Values match the batch registry
+    (EMAs and cumulative series exactly, rolling windows to float rounding).
+
+    The state before the last bar is checkpointed, so a revised (still
+    forming) last bar can be replaced rather than appended.
+    """
+
+    def __init__(self, history: pd.DataFrame):
+        """
+        Args:
+            history: Bars (optionally with indicator columns) to continue from
+        """
+        self._state = _StreamState()
+        self._checkpoint = _StreamState()
+
+        bars = history[BAR_COLUMNS]
+        if bars.empty:
+            return
+
+        # Rebuild the windows from the tail, then take the recursive state
+        # (EMAs, cumulative sums) from the batch values at the bar before last
+        tail = bars.iloc[-WARMUP_BARS:]
+        for row in tail.iloc[:-1].itertuples(index=False):
+            self._step(row)
+
+        if len(bars) > 1:
+            self._seed_recursive(IndicatorEvaluator(history), len(bars) - 2)
+        self._state.length = len(bars) - 1
+        self._checkpoint = copy.deepcopy(self._state)
+        self._step(next(tail.iloc[-1:].itertuples(index=False)))
+
+    @property
+    def length(self) -> int:
+        """Number of bars the state has consumed"""
+        return self._state.length
+
+    def _seed_recursive(self, ev: IndicatorEvaluator, position: int):
+        state = self._state
+        state.ema_12.seed(ev['Close'], ev['ema_12'], position)
+        state.ema_26.seed(ev['Close'], ev['ema_26'], position)
+        state.signal.seed(ev['MACD'], ev['Signal'], position)
+        state.force.seed(ev['delta'] * ev['Volume'], ev['Force_Index'], position)
+        state.obv = float(ev['OBV'].iloc[position])
+        state.ad = float(ev['AD'].iloc[position])
+        state.cum_pv = float((ev['typical_price'] * ev['Volume']).cumsum().iloc[position])
+        state.cum_volume = float(ev['Volume'].cumsum().iloc[position])
+
+    def update(self, bars: pd.DataFrame, revise_last: bool = False) -> pd.DataFrame:
+        """
+        Feed new bars and return their indicator values
+
+        Args:
+            bars: OHLCV bars following the last consumed bar
+            revise_last: The first bar replaces the last consumed bar
+
+        Returns:
+            DataFrame indexed like bars with every indicator column
+        """
+        if revise_last:
+            self._state = copy.deepcopy(self._checkpoint)
+
+        rows = []
+        for i, row in enumerate(bars[BAR_COLUMNS].itertuples(index=False)):
+            if i == len(bars) - 1:
+                self._checkpoint = copy.deepcopy(self._state)
+            rows.append(self._step(row))
+
+        return pd.DataFrame(rows, index=bars.index, columns=list(INDICATORS))
+
+    def extend(self, history: IndicatorFrame, bars: pd.DataFrame) -> Optional[IndicatorFrame]:
+        """
+        Continue a history frame with newer bars
+
+        Args:
+            history: Frame whose bars this state has consumed
+            bars: Full bars - the history's bars with the last one possibly
+                revised and new bars appended
+
+        Returns:
+            IndicatorFrame over bars carrying the history's computed columns,
+            or None when bars do not continue the history (rebuild in batch)
+        """
+        frame = history.frame
+        n = len(frame)
+        if n == 0 or n != self.length or len(bars) < n:
+            return None
+
+        old = frame[BAR_COLUMNS].to_numpy(dtype=float)
+        new = bars[BAR_COLUMNS].to_numpy(dtype=float)
+        if not frame.index.equals(bars.index[:n]) or not np.array_equal(old[:-1], new[:n - 1], equal_nan=True):
+            return None
+
+        revised = not np.array_equal(old[-1], new[n - 1], equal_nan=True)
+        start = n - 1 if revised else n
+        if start == len(bars):
+            return history
+
+        new_bars = bars.iloc[start:]
+        values = self.update(new_bars, revise_last=revised)
+
+        columns = [column for column in frame.columns if column in values.columns]
+        appended = pd.concat([new_bars, values[columns]], axis=1)
+        extended = pd.concat([frame.iloc[:start], appended])
+        return IndicatorFrame(bars, frame=extended[frame.columns])
+
+    def _step(self, bar) -> Dict[str, float]:
+        """Consume one bar and return its indicator values"""
+        s = self._state
+        o, h, l, c, v = (float(x) for x in bar)
+        tp = (h + l + c) / 3
+        prev = s.prev
+        pc = prev['close'] if prev else NAN
+
+        # RSI
+        delta = c - pc
+        s.gains.append(delta if delta > 0 else 0.0)
+        s.losses.append(-delta if delta < 0 else 0.0)
+        rsi = 100 - (100 / (1 + _div(_window_mean(s.gains, 14), _window_mean(s.losses, 14))))
+
+        # Moving averages
+        s.closes.append(c)
+        sma_20 = _window_mean(s.closes, 20)
+
+        # MACD
+        macd = s.ema_12.update(c) - s.ema_26.update(c)
+        signal = s.signal.update(macd)
+
+        # Bollinger Bands
+        close_std = _window_std(s.closes, 20)
+
+        # Volatility and volume
+        s.returns.append(c / pc - 1 if prev else NAN)
+        s.volumes.append(v)
+
+        # VWAP, OBV, A/D
+        s.cum_pv += tp * v
+        s.cum_volume += v
+        if prev is None:
+            s.obv = v
+        elif c > pc:
+            s.obv += v
+        elif c < pc:
+            s.obv -= v
+        clv = _div((c - l) - (h - c), h - l)
+        s.ad += (0.0 if clv != clv else clv) * v
+
+        # MFI
+        money_flow = tp * v
+        tp_change = tp - prev['tp'] if prev else NAN
+        s.positive_flow.append(money_flow if tp_change > 0 else 0.0)
+        s.negative_flow.append(money_flow if tp_change < 0 else 0.0)
+        mfi = 100 - (100 / (1 + _div(_window_sum(s.positive_flow, 14), _window_sum(s.negative_flow, 14))))
+
+        # ROC / Momentum
+        c_12 = s.closes[-13] if len(s.closes) > 12 else NAN
+        c_10 = s.closes[-11] if len(s.closes) > 10 else NAN
+
+        # ADX
+        plus_dm = h - prev['high'] if prev else NAN
+        minus_dm = l - prev['low'] if prev else NAN
+        plus_dm = 0.0 if plus_dm < 0 else plus_dm
+        minus_dm = abs(0.0 if minus_dm > 0 else minus_dm)
+        ranges = [x for x in (h - l, abs(h - pc), abs(l - pc)) if x == x]
+        s.true_range.append(max(ranges) if ranges else NAN)
+        s.plus_dm.append(plus_dm)
+        s.minus_dm.append(minus_dm)
+        atr = _window_mean(s.true_range, 14)
+        plus_di = 100 * _div(_window_mean(s.plus_dm, 14), atr)
+        minus_di = 100 * _div(_window_mean(s.minus_dm, 14), atr)
+        s.dx.append(_div(100 * abs(plus_di - minus_di), plus_di + minus_di))
+
+        # Patterns
+        body = abs(c - o)
+        total_range = h - l
+        lower_shadow = min(o, c) - l
+        upper_shadow = h - max(o, c)
+        po, pclose = (prev['open'], pc) if prev else (NAN, NAN)
+
+        s.prev = {'open': o, 'high': h, 'low': l, 'close': c, 'tp': tp}
+        s.length += 1
+
+        return {
+            'RSI': rsi,
+            'SMA_20': sma_20,
+            'SMA_50': _window_mean(s.closes, 50),
+            'SMA_200': _window_mean(s.closes, 200),
+            'MACD': macd,
+            'Signal': signal,
+            'MACD_Histogram': macd - signal,
+            'BB_Middle': sma_20,
+            'BB_Upper': sma_20 + (close_std * 2),
+            'BB_Lower': sma_20 - (close_std * 2),
+            'Volatility': _window_std(s.returns, 20) * math.sqrt(365) * 100,
+            'Volume_SMA': _window_mean(s.volumes, 20),
+            'VWAP': _div(s.cum_pv, s.cum_volume),
+            'OBV': s.obv,
+            'MFI': mfi,
+            'Force_Index': s.force.update(delta * v),
+            'AD': s.ad,
+            'ROC': _div(c - c_12, c_12) * 100,
+            'Momentum': c - c_10,
+            'ADX': _window_mean(s.dx, 14),
+            'Doji': bool(_div(body, total_range) < 0.1 and total_range > 0),
+            'Hammer': bool(lower_shadow > 2 * body and upper_shadow < body * 0.3 and c > o),
+            'Bullish_Engulfing': bool(pclose < po and c > o and o < pclose and c > po),
+            'Bearish_Engulfing': bool(pclose > po and c < o and o > pclose and c < po),
+        }
@@ -9,6 +9,8 @@ from typing import Dict, List, Tuple, Any
 from datetime import datetime, timedelta
 import logging
 
+from .universe_panel import UniversePanel
+
 logger = logging.getLogger(__name__)
 
 
@@ -16,9 +18,10 @@ class TechnicalAnalysisAdvanced:
     """Class for advanced technical analysis"""
     
     @staticmethod
-    def calculate_vwap(data: pd.DataFrame) -> pd.Series:
+    def calculate_vwap(data: pd.DataFrame, typical_price: pd.Series = None) -> pd.Series:
         """Calculate VWAP (Volume Weighted Average Price)"""
-        typical_price = (data['High'] + data['Low'] + data['Close']) / 3
+        if typical_price is None:
+            typical_price = (data['High'] + data['Low'] + data['Close']) / 3
         vwap = (typical_price * data['Volume']).cumsum() / data['Volume'].cumsum()
         return vwap
     
@@ -83,33 +86,30 @@ class TechnicalAnalysisAdvanced:
     @staticmethod
     def calculate_obv(data: pd.DataFrame) -> pd.Series:
         """Calculate OBV (On Balance Volume)"""
-        obv = pd.Series(index=data.index, dtype=float)
-        obv.iloc[0] = data['Volume'].iloc[0]
-        
-        for i in range(1, len(data)):
-            if data['Close'].iloc[i] > data['Close'].iloc[i-1]:
-                obv.iloc[i] = obv.iloc[i-1] + data['Volume'].iloc[i]
-            elif data['Close'].iloc[i] < data['Close'].iloc[i-1]:
-                obv.iloc[i] = obv.iloc[i-1] - data['Volume'].iloc[i]
-            else:
-                obv.iloc[i] = obv.iloc[i-1]
-        
-        return obv
+        close = data['Close'].to_numpy(dtype=float)
+        volume = data['Volume'].to_numpy(dtype=float)
+        
+        # Signed volume: +volume on up closes, -volume on down closes,
+        # nothing on flat (or missing) closes
+        direction = np.sign(np.diff(close))
+        flow = np.empty(len(close))
+        flow[:1] = volume[:1]
+        flow[1:] = np.where(direction > 0, volume[1:], np.where(direction < 0, -volume[1:], 0.0))
+        
+        return pd.Series(np.cumsum(flow), index=data.index)
     
     @staticmethod
-    def calculate_mfi(data: pd.DataFrame, period: int = 14) -> pd.Series:
+    def calculate_mfi(data: pd.DataFrame, period: int = 14, typical_price: pd.Series = None) -> pd.Series:
         """Calculate MFI (Money Flow Index)"""
-        typical_price = (data['High'] + data['Low'] + data['Close']) / 3
+        if typical_price is None:
+            typical_price = (data['High'] + data['Low'] + data['Close']) / 3
         money_flow = typical_price * data['Volume']
         
-        positive_flow = pd.Series(0, index=data.index)
-        negative_flow = pd.Series(0, index=data.index)
-        
-        for i in range(1, len(data)):
-            if typical_price.iloc[i] > typical_price.iloc[i-1]:
-                positive_flow.iloc[i] = money_flow.iloc[i]
-            elif typical_price.iloc[i] < typical_price.iloc[i-1]:
-                negative_flow.iloc[i] = money_flow.iloc[i]
+        # Money flow goes to the positive side on rising typical price,
+        # to the negative side on falling typical price
+        change = typical_price.diff()
+        positive_flow = money_flow.where(change > 0, 0.0)
+        negative_flow = money_flow.where(change < 0, 0.0)
         
         positive_mf = positive_flow.rolling(window=period).sum()
         negative_mf = negative_flow.rolling(window=period).sum()
@@ -118,9 +118,11 @@ class TechnicalAnalysisAdvanced:
         return mfi
     
     @staticmethod
-    def calculate_force_index(data: pd.DataFrame, period: int = 13) -> pd.Series:
+    def calculate_force_index(data: pd.DataFrame, period: int = 13, delta: pd.Series = None) -> pd.Series:
         """Calculate Force Index"""
-        force = (data['Close'] - data['Close'].shift(1)) * data['Volume']
+        if delta is None:
+            delta = data['Close'] - data['Close'].shift(1)
+        force = delta * data['Volume']
         force_ema = force.ewm(span=period, adjust=False).mean()
         return force_ema
     
@@ -145,23 +147,32 @@ class TechnicalAnalysisAdvanced:
         return momentum
     
     @staticmethod
-    def calculate_adx(data: pd.DataFrame, period: int = 14) -> pd.Series:
-        """Calculate ADX (Average Directional Index)"""
+    def calculate_true_range(data: pd.DataFrame) -> pd.Series:
+        """Calculate True Range"""
         high = data['High']
         low = data['Low']
         close = data['Close']
         
+        tr1 = high - low
+        tr2 = abs(high - close.shift())
+        tr3 = abs(low - close.shift())
+        return pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+    
+    @staticmethod
+    def calculate_adx(data: pd.DataFrame, period: int = 14, true_range: pd.Series = None) -> pd.Series:
+        """Calculate ADX (Average Directional Index)"""
+        high = data['High']
+        low = data['Low']
+        
         plus_dm = high.diff()
         minus_dm = low.diff()
         plus_dm[plus_dm < 0] = 0
         minus_dm[minus_dm > 0] = 0
         minus_dm = abs(minus_dm)
         
-        tr1 = high - low
-        tr2 = abs(high - close.shift())
-        tr3 = abs(low - close.shift())
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = tr.rolling(window=period).mean()
+        if true_range is None:
+            true_range = TechnicalAnalysisAdvanced.calculate_true_range(data)
+        atr = true_range.rolling(window=period).mean()
         
         plus_di = 100 * (plus_dm.rolling(window=period).mean() / atr)
         minus_di = 100 * (minus_dm.rolling(window=period).mean() / atr)
@@ -542,4 +553,39 @@ class StockComparator:
                 results.append(metrics)
         
         return pd.DataFrame(results)
+    
+    @staticmethod
+    def compare_metrics_panel(panel: UniversePanel) -> pd.DataFrame:
+        """compare_metrics for every ticker of a panel at once (each on its own bars)"""
+        panel = panel.bar_aligned()
+        rows = panel.counts >= 20
+        close = panel.close[rows]
+        returns = panel.returns()[rows]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            total_return = ((close[:, -1] / panel.first(panel.close)[rows]) - 1) * 100
+            
+            valid_returns = np.count_nonzero(~np.isnan(returns), axis=1)
+            std = np.nanstd(returns, axis=1, ddof=1) if returns.size else np.zeros(0)
+            volatility = std * np.sqrt(252) * 100
+            
+            # Sharpe Ratio (same guards as calculate_sharpe_ratio)
+            annual_volatility = std * np.sqrt(252)
+            sharpe_ratio = (np.nanmean(returns, axis=1) * 252 - 0.04) / annual_volatility if returns.size else np.zeros(0)
+            sharpe_ratio[(valid_returns < 2) | ~(annual_volatility > 0)] = 0.0
+            
+            running_max = np.fmax.accumulate(close, axis=1)
+            max_drawdown = np.nanmax((running_max - close) / running_max, axis=1) * 100 if close.size else np.zeros(0)
+        
+        def clean(values: np.ndarray) -> List[float]:
+            return [float(v) if np.isfinite(v) else 0.0 for v in values]
+        
+        return pd.DataFrame({
+            'ticker': [ticker for ticker, keep in zip(panel.tickers, rows) if keep],
+            'total_return': clean(total_return),
+            'volatility': clean(volatility),
+            'sharpe_ratio': clean(sharpe_ratio),
+            'max_drawdown': clean(max_drawdown),
+            'current_price': clean(close[:, -1]),
+        })
 
@@ -0,0 +1,168 @@
+"""
+Universe Panel
+Date-aligned (or bar-aligned) ticker x bar matrices for cross-sectional analysis
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .bar_store import BAR_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+
+class UniversePanel:
+    """
+    OHLCV (and optionally indicator) fields for many tickers as 2D arrays
+
+    Every field is a float64 array of shape (tickers, bars): one row per
+    ticker, one column per date of the shared (union) date index. Dates a
+    ticker has no bar for are NaN. A history that starts late is NaN-padded
+    on the left, but one that ends early or skips dates also has NaN columns
+    on the right or in the middle, so column -1 is not necessarily a
+    ticker's latest bar. Scans that look at "the latest bar" or "N bars ago"
+    should work on bar_aligned() instead.
+    """
+
+    def __init__(self, tickers: List[str], index: pd.Index, fields: Dict[str, np.ndarray],
+                 present: Optional[np.ndarray] = None):
+        self.tickers = list(tickers)
+        self.index = index
+        self.fields = fields
+        # Which columns each ticker has a bar for (its own frame's dates)
+        self.present = ~np.isnan(fields['Close']) if present is None else present
+        self.counts = np.count_nonzero(self.present, axis=1)
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame], columns: Optional[Iterable[str]] = None) -> UniversePanel:
+        """
+        Align per-ticker frames on their union of dates
+
+        Args:
+            frames: Ticker -> OHLCV frame (empty frames are skipped)
+            columns: Fields to keep (default OHLCV); fields a frame lacks are NaN
+        """
+        frames = {ticker: data for ticker, data in frames.items() if not data.empty}
+        columns = list(BAR_COLUMNS) if columns is None else list(dict.fromkeys([*BAR_COLUMNS, *columns]))
+        if not frames:
+            return cls([], pd.DatetimeIndex([]), {column: np.empty((0, 0)) for column in columns})
+
+        indexes = [data.index for data in frames.values()]
+        index = indexes[0]
+        if not all(other.equals(index) for other in indexes[1:]):
+            index = index.append(indexes[1:]).unique().sort_values()
+
+        # One (fields, tickers, bars) block; each field is a contiguous slice of it
+        stacked = np.full((len(columns), len(frames), len(index)), np.nan)
+        present = np.zeros((len(frames), len(index)), dtype=bool)
+        for row, data in enumerate(frames.values()):
+            available = [i for i, column in enumerate(columns) if column in data.columns]
+            values = np.array([data[columns[i]].to_numpy(dtype=float) for i in available])
+            tail = index[len(index) - len(data):]
+            if tail.equals(data.index):
+                stacked[available, row, len(index) - len(data):] = values
+                present[row, len(index) - len(data):] = True
+            else:
+                positions = index.get_indexer(data.index)
+                stacked[np.ix_(available, [row], positions)] = values[:, None, :]
+                present[row, positions] = True
+        fields = {column: stacked[i] for i, column in enumerate(columns)}
+
+        return cls(list(frames), index, fields, present)
+
+    def bar_aligned(self) -> UniversePanel:
+        """
+        The same panel with every row's own bars right-aligned
+
+        Column -1 is each ticker's latest bar and column -k its k-th latest,
+        whatever dates the other tickers have; rows are NaN-padded on the
+        left only. The index becomes positional (bars back from the latest),
+        so use the date-aligned panel for anything that pairs up dates, such
+        as correlations(). Returns self when the rows are already aligned.
+        """
+        width = len(self.index)
+        aligned = np.arange(width) >= (width - self.counts)[:, None]
+        if np.array_equal(aligned, self.present):
+            return self
+
+        # Stable sort puts the missing dates first and keeps the bars in date order
+        order = np.argsort(self.present, axis=1, kind='stable')
+        fields = {name: np.take_along_axis(values, order, axis=1) for name, values in self.fields.items()}
+        return UniversePanel(self.tickers, pd.RangeIndex(-width + 1, 1), fields, aligned)
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.fields[field]
+
+    def __contains__(self, field: str) -> bool:
+        return field in self.fields
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.fields['Close']
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self.fields['Volume']
+
+    def returns(self) -> np.ndarray:
+        """Bar-to-bar percent change along each row (pct_change)"""
+        close = self.close
+        returns = np.full(close.shape, np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns[:, 1:] = close[:, 1:] / close[:, :-1] - 1
+        return returns
+
+    def first(self, values: np.ndarray) -> np.ndarray:
+        """Value at each ticker's first bar"""
+        if values.size == 0:
+            return np.full(len(values), np.nan)
+        first_bar = np.argmax(self.present, axis=1)
+        return values[np.arange(len(values)), first_bar]
+
+    def ago(self, values: np.ndarray, bars: int) -> np.ndarray:
+        """Value `bars` columns before the last one (NaN when out of range); per-ticker on bar_aligned()"""
+        if bars >= values.shape[1]:
+            return np.full(len(values), np.nan)
+        return values[:, -1 - bars]
+
+    @staticmethod
+    def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+        """rolling(window).mean() along each row (NaN until the window is full)"""
+        result = np.full(values.shape, np.nan)
+        if values.shape[1] >= window:
+            result[:, window - 1:] = sliding_window_view(values, window, axis=1).mean(axis=-1)
+        return result
+
+    def rsi(self, period: int = 14) -> np.ndarray:
+        """RSI of every ticker, same formula as the indicator registry"""
+        if 'RSI' in self.fields and period == 14:
+            return self.fields['RSI']
+
+        close = self.close
+        delta = np.full(close.shape, np.nan)
+        delta[:, 1:] = close[:, 1:] - close[:, :-1]
+        missing = np.isnan(close)
+        gain = np.where(delta > 0, delta, 0.0)
+        loss = -np.where(delta < 0, delta, 0.0)
+        gain[missing] = np.nan
+        loss[missing] = np.nan
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = self.rolling_mean(gain, period) / self.rolling_mean(loss, period)
+            return 100 - (100 / (1 + rs))
+
+    def correlations(self) -> pd.DataFrame:
+        """Correlation of daily returns over the dates every ticker traded"""
+        returns = self.returns()
+        complete = returns[:, np.isfinite(returns).all(axis=0)]
+        if len(self) < 2 or complete.shape[1] < 2:
+            return pd.DataFrame()
+        return pd.DataFrame(np.corrcoef(complete), index=self.tickers, columns=self.tickers)
@@ -33,45 +33,13 @@ export default function AdvancedAnalysis({ ticker }: AdvancedAnalysisProps) {
   const loadAllData = async () => {
     setLoading(true);
     try {
-      const endpoints = [
-        { key: "divergences", url: `/api/crypto/advanced/divergences/${ticker}` },
-        { key: "gaps", url: `/api/crypto/advanced/gaps/${ticker}` },
-        { key: "breakout", url: `/api/crypto/advanced/breakout/${ticker}` },
-        { key: "support", url: `/api/crypto/advanced/support-resistance/${ticker}` },
-        { key: "momentum", url: `/api/crypto/advanced/momentum-multi/${ticker}` },
-        { key: "relativeStrength", url: `/api/crypto/advanced/relative-strength/${ticker}` },
-        { key: "meanReversion", url: `/api/crypto/advanced/mean-reversion/${ticker}` },
-        { key: "swingSignals", url: `/api/crypto/advanced/swing-signals/${ticker}` },
-        { key: "seasonality", url: `/api/crypto/advanced/seasonality/${ticker}` },
-        { key: "volatility", url: `/api/crypto/advanced/volatility-expanded/${ticker}` },
-        { key: "patterns", url: `/api/crypto/advanced/price-patterns/${ticker}` },
-        { key: "statistical", url: `/api/crypto/advanced/statistical/${ticker}` },
-        { key: "anomalies", url: `/api/crypto/advanced/anomalies/${ticker}` },
-        { key: "consensus", url: `/api/crypto/advanced/consensus/${ticker}` },
-        { key: "tradePlan", url: `/api/crypto/advanced/trade-planner/${ticker}` },
-        { key: "dcaSimulator", url: `/api/crypto/advanced/dca-simulator/${ticker}` },
-        { key: "entryChecklist", url: `/api/crypto/advanced/entry-checklist/${ticker}` },
-        { key: "fibonacciTime", url: `/api/crypto/advanced/fibonacci-time/${ticker}` },
-      ];
-
-      const promises = endpoints.map(async ({ key, url }) => {
-        try {
-          const res = await fetch(`http://localhost:8000${url}`);
-          const json = await res.json();
-          return { key, data: json };
-        } catch (error) {
-          console.error(`Error loading ${key}:`, error);
-          return { key, data: null };
-        }
+      // One request: the API fetches the data once and runs every analysis on it
+      const res = await fetch(`http://localhost:8000/api/crypto/advanced/bundle/${ticker}`);
+      const json = await res.json();
+      Object.entries(json.errors || {}).forEach(([key, error]) => {
+        console.error(`Error loading ${key}:`, error);
       });
-
-      const results = await Promise.all(promises);
-      const newData: any = {};
-      results.forEach(({ key, data }) => {
-        newData[key] = data;
-      });
-      
-      setData(newData);
+      setData(json.analyses || {});
     } catch (error) {
       console.error("Error loading advanced analysis:", error);
     } finally {
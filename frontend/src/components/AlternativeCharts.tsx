@@ -21,7 +21,7 @@ export default function AlternativeCharts({ ticker }: Props) {
   const fetchData = async () => {
     setLoading(true);
     try {
-      const res = await fetch(`http://localhost:8000/api/sp500/stock/${ticker}?period=3mo`);
+      const res = await fetch(`http://localhost:8000/api/sp500/stock/${ticker}?period=3mo&fields=open,high,low,close`);
       const json = await res.json();
       setData(json.data || []);
     } catch (error) {
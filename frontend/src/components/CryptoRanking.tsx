@@ -142,13 +142,13 @@ export default function CryptoRanking({ stocks, type }: Props) {
                   </div>
                 </div>
 
-                {stock.market_cap && (
+                {stock.market_cap ? (
                   <div className="mt-2 pt-2 border-t border-gray-700">
                     <p className="text-xs text-gray-500">
                       Market Cap: <span className="text-gray-400">{formatMarketCap(stock.market_cap)}</span>
                     </p>
                   </div>
-                )}
+                ) : null}
               </motion.div>
             </div>
           );
@@ -51,95 +51,37 @@ export default function ProfessionalTools({ ticker }: ProfessionalToolsProps) {
     const baseUrl = 'http://localhost:8000/api/professional';
 
     try {
-      // Fetch all tools in parallel
-      console.log('Starting parallel fetch...');
-      const [
-        ichimokuRes,
-        elliottRes,
-        wyckoffRes,
-        trendRes,
-        patternsRes,
-        srRes,
-        monteCarloRes,
-        calendarRes,
-        drawdownRes,
-        winRateRes,
-        confluenceRes,
-        reversalRes,
-        accelRes,
-        volMomRes,
-        velocityRes,
-        positionRes,
-        rrRes,
-        setupsRes
-      ] = await Promise.all([
-        fetch(`${baseUrl}/ichimoku/${ticker}`),
-        fetch(`${baseUrl}/elliott-wave/${ticker}`),
-        fetch(`${baseUrl}/wyckoff/${ticker}`),
-        fetch(`${baseUrl}/trend-alignment/${ticker}`),
-        fetch(`${baseUrl}/candlestick-patterns/${ticker}`),
-        fetch(`${baseUrl}/support-resistance/${ticker}`),
-        fetch(`${baseUrl}/monte-carlo/${ticker}?days=30`),
-        fetch(`${baseUrl}/calendar/${ticker}?period=2y`),
-        fetch(`${baseUrl}/drawdown/${ticker}?period=1y`),
-        fetch(`${baseUrl}/win-rate/${ticker}?period=1y`),
-        fetch(`${baseUrl}/confluence/${ticker}`),
-        fetch(`${baseUrl}/reversal-probability/${ticker}`),
-        fetch(`${baseUrl}/acceleration/${ticker}`),
-        fetch(`${baseUrl}/volume-momentum/${ticker}`),
-        fetch(`${baseUrl}/velocity/${ticker}`),
-        fetch(`${baseUrl}/position-sizing/${ticker}?account_size=10000&risk_pct=2&stop_loss_pct=5`),
-        fetch(`${baseUrl}/risk-reward/${ticker}`),
-        fetch(`${baseUrl}/technical-setups/${ticker}`)
-      ]);
-
-      console.log('Responses received, parsing JSON...');
-      
-      const ichimokuData = await ichimokuRes.json();
-      console.log('✅ Ichimoku data:', ichimokuData);
-      console.log('  - tenkan_sen:', ichimokuData.tenkan_sen);
-      console.log('  - current_price:', ichimokuData.current_price);
-      setIchimoku(ichimokuData);
-      
-      const srData = await srRes.json();
-      console.log('✅ Support/Resistance:', srData);
-      console.log('  - current_price:', srData.current_price);
-      setSupportResistance(srData);
-      
-      const volMomData = await volMomRes.json();
-      console.log('✅ Volume Momentum:', volMomData);
-      console.log('  - volume_ratio:', volMomData.volume_ratio);
-      console.log('  - current_volume:', volMomData.current_volume);
-      setVolumeMomentum(volMomData);
-      
-      const velocityData = await velocityRes.json();
-      console.log('✅ Velocity:', velocityData);
-      console.log('  - return_24h:', velocityData.return_24h);
-      setVelocity(velocityData);
-      
-      const positionData = await positionRes.json();
-      console.log('✅ Position Sizing:', positionData);
-      console.log('  - account_size:', positionData.account_size);
-      console.log('  - entry_price:', positionData.entry_price);
-      setPositionSizing(positionData);
-      
-      const accelData = await accelRes.json();
-      console.log('✅ Acceleration:', accelData);
-      console.log('  - velocity:', accelData.velocity);
-      setAcceleration(accelData);
-      
-      setElliottWave(await elliottRes.json());
-      setWyckoff(await wyckoffRes.json());
-      setTrendAlignment(await trendRes.json());
-      setCandlestickPatterns(await patternsRes.json());
-      setMonteCarlo(await monteCarloRes.json());
-      setCalendar(await calendarRes.json());
-      setDrawdown(await drawdownRes.json());
-      setWinRate(await winRateRes.json());
-      setConfluence(await confluenceRes.json());
-      setReversalProb(await reversalRes.json());
-      setRiskReward(await rrRes.json());
-      setTechnicalSetups(await setupsRes.json());
+      console.log('Fetching professional tools bundle...');
+      // One request: the API fetches the history once and runs every tool on it
+      const res = await fetch(
+        `${baseUrl}/bundle/${ticker}?days=30&account_size=10000&risk_pct=2&stop_loss_pct=5`
+      );
+      const bundle = await res.json();
+      const tools = bundle.tools || {};
+      // Only sent when this request computed the bundle (not on cache hits)
+      if (bundle.timings_ms) console.log('Tool timings (ms):', bundle.timings_ms);
+      Object.entries(bundle.errors || {}).forEach(([key, error]) => {
+        console.error(`Error loading ${key}:`, error);
+      });
+
+      setIchimoku(tools.ichimoku);
+      setSupportResistance(tools.supportResistance);
+      setVolumeMomentum(tools.volumeMomentum);
+      setVelocity(tools.velocity);
+      setPositionSizing(tools.positionSizing);
+      setAcceleration(tools.acceleration);
+      setElliottWave(tools.elliottWave);
+      setWyckoff(tools.wyckoff);
+      setTrendAlignment(tools.trendAlignment);
+      setCandlestickPatterns(tools.candlestickPatterns);
+      setMonteCarlo(tools.monteCarlo);
+      setCalendar(tools.calendar);
+      setDrawdown(tools.drawdown);
+      setWinRate(tools.winRate);
+      setConfluence(tools.confluence);
+      setReversalProb(tools.reversalProbability);
+      setRiskReward(tools.riskReward);
+      setTechnicalSetups(tools.technicalSetups);
 
       console.log('All data loaded successfully!');
       setLoading(false);
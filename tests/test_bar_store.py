@@ -0,0 +1,60 @@
+"""
+BarStore writes from several writers at once
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.bar_store import BarStore
+
+
+def make_bars(periods: int) -> pd.DataFrame:
+    dates = pd.date_range('2024-01-01', periods=periods, freq='D', tz='UTC')
+    close = np.linspace(100, 200, periods)
+    return pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close,
+                         'Volume': np.arange(periods)}, index=dates)
+
+
+def test_concurrent_writers_do_not_share_a_temp_file(tmp_path):
+    # One store per "worker process", all refreshing the same ticker
+    stores = [BarStore(tmp_path) for _ in range(4)]
+    errors = []
+
+    def refresh(store: BarStore, periods: int):
+        try:
+            for _ in range(20):
+                store.write('BTC-USD', make_bars(periods))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=refresh, args=(store, 50 + i)) for i, store in enumerate(stores)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    data, _ = BarStore(tmp_path).read('BTC-USD')
+    assert len(data) in {50, 51, 52, 53}
+    np.testing.assert_array_equal(data['Close'].to_numpy(), make_bars(len(data))['Close'].to_numpy())
+    assert [path.name for path in tmp_path.iterdir()] == ['BTC-USD.npz']
+
+
+def test_failed_write_leaves_no_temp_file(tmp_path, monkeypatch):
+    store = BarStore(tmp_path)
+    store.write('BTC-USD', make_bars(10))
+
+    def fail(file, **arrays):
+        file.write(b'partial')
+        raise OSError("disk full")
+
+    monkeypatch.setattr(np, 'savez', fail)
+    with pytest.raises(OSError):
+        store.write('BTC-USD', make_bars(20))
+    monkeypatch.undo()
+
+    assert [path.name for path in tmp_path.iterdir()] == ['BTC-USD.npz']
+    assert len(store.read('BTC-USD')[0]) == 10
@@ -0,0 +1,183 @@
+"""
+RedisBackend against the bundled RESP server, and CacheService sharing through it
+"""
+
+import socket
+import threading
+import time
+
+import pytest
+
+from app.services.cache_backends import RedisBackend, RespError
+from app.services.cache_service import CacheService
+from app.services.resp_server import serve_in_background
+
+
+@pytest.fixture(scope='module')
+def server():
+    server = serve_in_background(port=0)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def url(server):
+    server.store.execute('flushdb', [])
+    host, port = server.server_address
+    return f"redis://{host}:{port}"
+
+
+@pytest.fixture
+def backend(url):
+    backend = RedisBackend(url)
+    yield backend
+    backend.close()
+
+
+def test_set_get_round_trip(backend):
+    backend.set('prices', {'BTC-USD': [1.5, 2.5]}, ttl_seconds=60, stale_seconds=30)
+
+    entry = backend.get('prices')
+    assert entry.value == {'BTC-USD': [1.5, 2.5]}
+    assert 0 < entry.fresh_for <= 60
+    assert 60 < entry.serve_for <= 90
+    assert backend.get('missing') is None
+    assert backend.count() == 1
+
+
+def test_entries_expire_after_the_stale_window(backend):
+    backend.set('short', 1, ttl_seconds=0.05, stale_seconds=0.05)
+    assert backend.get('short').fresh_for <= 0.05
+    time.sleep(0.15)
+    assert backend.get('short') is None
+
+
+def test_invalidate_by_tags(backend):
+    backend.set('a', 1, 60, tags=[('ticker', 'BTC-USD'), ('family', 'chart')])
+    backend.set('b', 2, 60, tags=[('ticker', 'BTC-USD'), ('family', 'screener')])
+    backend.set('c', 3, 60, tags=[('ticker', 'ETH-USD'), ('family', 'chart')])
+
+    assert backend.invalidate([('ticker', 'BTC-USD'), ('family', 'chart')]) == 1
+    assert backend.get('a') is None
+    assert backend.invalidate([('ticker', 'BTC-USD')]) == 1
+    assert backend.get('b') is None
+    assert backend.get('c').value == 3
+
+
+def test_clear_by_pattern(backend):
+    backend.set('response:chart:BTC', 1, 60)
+    backend.set('history:BTC', 2, 60)
+
+    backend.clear('response:')
+    assert backend.get('response:chart:BTC') is None
+    assert backend.get('history:BTC').value == 2
+    backend.clear()
+    assert backend.count() == 0
+
+
+def test_clear_by_pattern_drops_tag_members(server, backend):
+    backend.set('response:chart:BTC', 1, 60, tags=[('ticker', 'BTC-USD')])
+    backend.set('history:BTC', 2, 60, tags=[('ticker', 'BTC-USD')])
+    backend.set('response:chart:ETH', 3, 60, tags=[('ticker', 'ETH-USD')])
+
+    backend.clear('response:')
+    tag_key = f"{RedisBackend.PREFIX}t:ticker=BTC-USD".encode()
+    assert server.store.execute('smembers', [tag_key]) == [b'history:BTC']
+    # The emptied ETH tag set is gone, as in Redis
+    assert server.store.execute('dbsize', []) == 2
+
+
+def test_invalidated_tag_sets_do_not_linger(server, backend):
+    backend.set('a', 1, 60, tags=[('ticker', 'BTC-USD')])
+    backend.invalidate([('ticker', 'BTC-USD')])
+    assert server.store.execute('dbsize', []) == 0
+
+
+def test_leases_are_exclusive(backend):
+    token = backend.acquire_lease('key', 60)
+    assert token is not None
+    assert backend.acquire_lease('key', 60) is None
+
+    # Only the holder's token releases it
+    backend.release_lease('key', 'someone-else')
+    assert backend.acquire_lease('key', 60) is None
+    backend.release_lease('key', token)
+    assert backend.acquire_lease('key', 60) is not None
+
+
+def test_expired_lease_taken_over_is_not_released_by_old_holder(backend):
+    stale_token = backend.acquire_lease('key', 0.05)
+    time.sleep(0.1)
+    token = backend.acquire_lease('key', 60)
+    assert token is not None
+
+    backend.release_lease('key', stale_token)
+    assert backend.acquire_lease('key', 60) is None
+
+
+def test_selected_database_survives_reconnects(server, url):
+    backend = RedisBackend(f"{url}/3")
+    server.store.execute('flushdb', [], 3)
+    value_key = f"{RedisBackend.PREFIX}v:before".encode()
+
+    backend.set('before', 1, 60)
+    assert server.store.execute('exists', [value_key], 3) == 1
+    assert server.store.execute('exists', [value_key], 0) == 0
+
+    # Drop the connection under the backend; the next command reconnects
+    backend.connection._sock.shutdown(socket.SHUT_RDWR)
+    backend.set('after', 2, 60)
+
+    assert backend.get('before').value == 1
+    assert server.store.execute('exists', [f"{RedisBackend.PREFIX}v:after".encode()], 3) == 1
+    assert server.store.execute('dbsize', [], 0) == 0
+    backend.close()
+
+
+def test_invalid_database_is_rejected(url):
+    backend = RedisBackend(f"{url}/99")
+    with pytest.raises(RespError):
+        backend.count()
+    assert backend.connection._sock is None
+
+
+def test_two_services_share_entries(url):
+    first, second = CacheService(backend=RedisBackend(url)), CacheService(backend=RedisBackend(url))
+
+    first.set('quote:BTC-USD', {'price': 1.0}, ttl_seconds=60, tags={'ticker': 'BTC-USD'})
+    assert second.get('quote:BTC-USD') == {'price': 1.0}
+
+    first.set('quote:ETH-USD', {'price': 2.0}, ttl_seconds=60, tags={'ticker': 'ETH-USD'})
+    first.invalidate(ticker='ETH-USD')
+    assert second.get('quote:ETH-USD') is None
+
+    calls = []
+    value = second.get_or_compute('computed', lambda: calls.append(1) or 'second', ttl_seconds=60)
+    assert first.get_or_compute('computed', lambda: calls.append(1) or 'first', ttl_seconds=60) == value == 'second'
+    assert len(calls) == 1
+
+
+def test_waits_for_the_lease_holder_instead_of_recomputing(url):
+    first, second = CacheService(backend=RedisBackend(url)), CacheService(backend=RedisBackend(url))
+    token = first.backend.acquire_lease('slow', 60)
+
+    def finish():
+        time.sleep(0.2)
+        first.set('slow', 'from first', ttl_seconds=60)
+        first.backend.release_lease('slow', token)
+
+    threading.Thread(target=finish).start()
+    assert second.get_or_compute('slow', lambda: 'from second', ttl_seconds=60) == 'from first'
+
+
+def test_unreachable_backend_falls_back_to_memory():
+    cache = CacheService(backend=RedisBackend('redis://127.0.0.1:1'))
+
+    cache.set('key', 1, ttl_seconds=60, tags={'ticker': 'BTC-USD'})
+    assert cache.get('key') == 1
+    assert cache.invalidate(ticker='BTC-USD') == 1
+    cache.set('key', 1, ttl_seconds=60)
+    cache.clear()
+    assert cache.get('key') is None
+    assert cache.stats()['entries'] == 0
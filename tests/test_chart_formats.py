@@ -0,0 +1,34 @@
+"""
+Accept-header negotiation of the binary chart formats
+"""
+
+import pytest
+from starlette.requests import Request
+
+from app.api.chart_formats import F64_MEDIA_TYPE, negotiate_binary
+
+
+def request_accepting(accept: str) -> Request:
+    return Request({'type': 'http', 'headers': [(b'accept', accept.encode())]})
+
+
+@pytest.mark.parametrize('accept', [
+    F64_MEDIA_TYPE,
+    f"{F64_MEDIA_TYPE};q=0.5, application/json",
+    f"{F64_MEDIA_TYPE}; Q = 0.001",
+    f"{F64_MEDIA_TYPE};q=bogus",
+])
+def test_binary_accepted(accept):
+    assert negotiate_binary(request_accepting(accept)) == F64_MEDIA_TYPE
+
+
+@pytest.mark.parametrize('accept', [
+    'application/json',
+    f"{F64_MEDIA_TYPE};q=0",
+    f"{F64_MEDIA_TYPE};q=0.0",
+    f"{F64_MEDIA_TYPE};q=0.000, application/json",
+    f"{F64_MEDIA_TYPE} ; q = 0",
+    f"{F64_MEDIA_TYPE};Q=0.00",
+])
+def test_binary_refused(accept):
+    assert negotiate_binary(request_accepting(accept)) is None
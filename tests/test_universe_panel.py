@@ -0,0 +1,129 @@
+"""
+UniversePanel scans against the original per-ticker loops
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.advanced_analysis_service import AdvancedAnalysisService
+from app.services.professional_tools_service import ProfessionalToolsService
+from app.services.technical_analysis_advanced import StockComparator
+from app.services.universe_panel import UniversePanel
+
+
+def make_frame(dates: pd.DatetimeIndex, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.04, len(dates))))
+    return pd.DataFrame({
+        'Open': close * (1 + rng.normal(0, 0.01, len(dates))),
+        'High': close * 1.02,
+        'Low': close * 0.98,
+        'Close': close,
+        'Volume': rng.uniform(1e6, 5e6, len(dates)),
+    }, index=dates)
+
+
+@pytest.fixture
+def ragged_frames():
+    dates = pd.date_range('2024-01-01', periods=60, freq='D')
+    return {
+        'FULL-USD': make_frame(dates, 1),
+        'LATE-USD': make_frame(dates[15:], 2),       # starts late
+        'ENDED-USD': make_frame(dates[:-3], 3),      # history ends 3 bars early
+        'GAPPY-USD': make_frame(dates.delete([30, 31, 45]), 4),  # skips dates
+        'SHORT-USD': make_frame(dates[-10:], 5),     # too short for the scans
+    }
+
+
+def by_ticker(rows):
+    return {row['ticker']: row for row in rows}
+
+
+def test_bar_aligned_uses_each_tickers_own_bars(ragged_frames):
+    panel = UniversePanel.from_frames(ragged_frames)
+    aligned = panel.bar_aligned()
+
+    assert aligned.tickers == panel.tickers
+    assert list(aligned.counts) == [len(data) for data in ragged_frames.values()]
+    for row, data in enumerate(ragged_frames.values()):
+        closes = aligned.close[row]
+        np.testing.assert_array_equal(closes[-len(data):], data['Close'].to_numpy())
+        assert np.isnan(closes[:-len(data)]).all()
+        assert aligned.first(aligned.close)[row] == data['Close'].iloc[0]
+        assert aligned.ago(aligned.close, 4)[row] == data['Close'].iloc[-5]
+
+
+def test_bar_aligned_is_a_no_op_for_left_padded_rows(ragged_frames):
+    frames = {ticker: ragged_frames[ticker] for ticker in ('FULL-USD', 'LATE-USD')}
+    panel = UniversePanel.from_frames(frames)
+    assert panel.bar_aligned() is panel
+
+
+def test_compare_watchlist_panel_matches_loop(ragged_frames):
+    expected = by_ticker(AdvancedAnalysisService.compare_watchlist(ragged_frames))
+    result = by_ticker(AdvancedAnalysisService.compare_watchlist_panel(UniversePanel.from_frames(ragged_frames)))
+
+    assert result.keys() == expected.keys()
+    for ticker, row in expected.items():
+        assert result[ticker] == pytest.approx(row), ticker
+
+
+def test_fast_movers_scanner_panel_matches_loop(ragged_frames):
+    # Big last-bar moves on the ragged tickers so they get selected
+    for ticker in ('ENDED-USD', 'GAPPY-USD'):
+        data = ragged_frames[ticker]
+        data.loc[data.index[-1], 'Close'] *= 1.15
+        data.loc[data.index[-1], 'Volume'] *= 4
+    expected = by_ticker(AdvancedAnalysisService.fast_movers_scanner(ragged_frames))
+    result = by_ticker(AdvancedAnalysisService.fast_movers_scanner_panel(UniversePanel.from_frames(ragged_frames)))
+
+    assert {'ENDED-USD', 'GAPPY-USD'} <= expected.keys()
+    assert result.keys() == expected.keys()
+    for ticker, row in expected.items():
+        assert result[ticker] == pytest.approx(row), ticker
+
+
+def test_compare_metrics_panel_matches_loop(ragged_frames):
+    expected = StockComparator.compare_metrics(ragged_frames).set_index('ticker')
+    result = StockComparator.compare_metrics_panel(UniversePanel.from_frames(ragged_frames)).set_index('ticker')
+
+    assert (result['current_price'] > 0).all()
+    pd.testing.assert_frame_equal(result.sort_index(), expected.sort_index(), check_exact=False)
+
+
+def test_sector_rotation_analysis_panel_matches_loop(ragged_frames):
+    expected = ProfessionalToolsService.sector_rotation_analysis(ragged_frames)
+    result = ProfessionalToolsService.sector_rotation_analysis_panel(UniversePanel.from_frames(ragged_frames))
+
+    assert result['sectors'].keys() == expected['sectors'].keys()
+    for sector, row in expected['sectors'].items():
+        assert result['sectors'][sector] == pytest.approx(row), sector
+    assert [row['sector'] for row in result['rankings']] == [row['sector'] for row in expected['rankings']]
+    assert (result['hot_sector'], result['cold_sector']) == (expected['hot_sector'], expected['cold_sector'])
+
+
+@pytest.mark.parametrize('conditions', [
+    {},
+    {'rsi_min': 40, 'volume_min': 0.5},
+    {'rsi_max': 55},
+])
+def test_custom_screener_panel_matches_loop(ragged_frames, conditions):
+    expected = ProfessionalToolsService.custom_screener(ragged_frames, conditions)
+    result = ProfessionalToolsService.custom_screener_panel(UniversePanel.from_frames(ragged_frames), conditions)
+
+    assert result['total'] == expected['total']
+    assert by_ticker(result['matches']).keys() == by_ticker(expected['matches']).keys()
+    for ticker, row in by_ticker(expected['matches']).items():
+        assert by_ticker(result['matches'])[ticker] == pytest.approx(row), ticker
+
+
+def test_top_movers_matrix_panel_matches_loop(ragged_frames):
+    expected = ProfessionalToolsService.top_movers_matrix(ragged_frames)
+    result = ProfessionalToolsService.top_movers_matrix_panel(UniversePanel.from_frames(ragged_frames))
+
+    assert result.keys() == expected.keys()
+    for board, rows in expected.items():
+        assert [row['ticker'] for row in result[board]] == [row['ticker'] for row in rows], board
+        for actual, row in zip(result[board], rows):
+            assert actual == pytest.approx(row), board